@@ -3,36 +3,178 @@ GitHub Plugin Installation routes
 Provides endpoints for fetching GitHub releases and installing plugins from them
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from dataclasses import dataclass
 import re
 import asyncio
+import hashlib
+import orjson
 import logging
-import tempfile
-import os
-import uuid
-import shutil
+import shlex
+import time
+import base64
+import posixpath
 
 from modules import (
     Server, get_db, User, get_current_active_user,
-    GitHubReleasesResponse, GitHubRelease, GitHubReleaseAsset,
+    GitHubReleasesResponse,
     ArchiveAnalysisResponse, ArchiveContentItem,
     GitHubPluginInstallRequest, GitHubPluginInstallResponse,
     PluginUninstallRequest, PluginUninstallResponse,
+    InstalledPluginBatchAnalysisRequest,
     ActionResponse
 )
 from modules.http_helper import http_helper
-from services import SSHManager
+from services import SSHManager, redis_manager
 
 router = APIRouter(prefix="/api/github-plugins", tags=["github-plugins"])
 
 logger = logging.getLogger(__name__)
 
-# Regex to validate GitHub repository URL
-GITHUB_REPO_PATTERN = re.compile(r'^https://github\.com/([a-zA-Z0-9_.-]+)/([a-zA-Z0-9_.-]+)(?:/.*)?$')
+# Regex to validate GitHub repository URL (GitHub names are ASCII-only, used with fullmatch)
+GITHUB_REPO_PATTERN = re.compile(r'https://github\.com/([\w.-]+)/([\w.-]+)(?:/.*)?', re.ASCII)
+
+# Supported archive extensions, mapped to archive type below
+ARCHIVE_EXTENSION_PATTERN = re.compile(r'\.(zip|tar\.gz|tgz|tar|7z)$', re.IGNORECASE)
+ARCHIVE_TYPES = {'zip': 'zip', 'tar.gz': 'tar.gz', 'tgz': 'tar.gz', 'tar': 'tar', '7z': '7z'}
+
+# Windows-specific release assets (e.g. plugin-windows.zip, plugin-win-x64.zip, plugin_win.zip)
+WINDOWS_ASSET_PATTERN = re.compile(r'windows|(?:^|[-_])win(?:[-_.]|$)', re.IGNORECASE)
+
+# Parses an `unzip -l` listing line: "size  date time  path"
+ZIP_LIST_LINE_PATTERN = re.compile(r'^\s*(\d+)\s+\S+\s+\S+\s+(.+)$')
+
+# curl --write-out format reporting the downloaded size and HTTP status of an install download
+CURL_WRITE_OUT = r'DL_SIZE=%{size_download}\nDL_CODE=%{http_code}\n'
+DOWNLOAD_SIZE_PATTERN = re.compile(r'^DL_SIZE=(\d+)', re.MULTILINE)
+DOWNLOAD_CODE_PATTERN = re.compile(r'^DL_CODE=(\d+)', re.MULTILINE)
 
 # Progress update interval (percent) for panel proxy downloads/uploads
 PROGRESS_UPDATE_INTERVAL = 10  # Update progress every 10%
+PROGRESS_MIN_SECONDS = 0.25  # Send at most one progress update per 250ms
+
+# Output section markers for the single round-trip archive analysis script
+SIZE_SENTINEL = "---SIZE---"
+TYPE_SENTINEL = "---TYPE---"
+LIST_SENTINEL = "---LIST---"
+# Follows the listing; the sha256 of the archive kept in the remote asset cache
+DIGEST_SENTINEL = "---DIGEST---"
+
+# Output markers of the single round-trip install copy and installed-plugin analysis scripts
+MISSING_SENTINEL = "---MISSING---"
+INSTALLED_COUNT_PATTERN = re.compile(r'^---INSTALLED---\s*(\d+)', re.MULTILINE)
+# Heredoc delimiter for exclude patterns passed to rsync/tar on stdin
+EXCLUDES_HEREDOC_DELIMITER = "CS2SM_EXCLUDES"
+# rsync --stats line ("regular" since rsync 3.1, which also adds thousands separators)
+RSYNC_TRANSFERRED_PATTERN = re.compile(r'^Number of (?:regular )?files transferred: ([\d,]+)', re.MULTILINE)
+
+# Archive analysis cache TTL (release assets are immutable): 7 days
+ARCHIVE_ANALYSIS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Detected addons/ layout per release asset (also caches "no addons/ found"): 7 days
+ARCHIVE_LAYOUT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Max chunks buffered between the panel-proxy download and the SFTP upload
+PROXY_STREAM_QUEUE_SIZE = 32
+
+# Remote directory where analyze-archive leaves downloaded assets for install to reuse.
+# Kept under the SSH user's home (mode 700) so no other account can plant files in it.
+REMOTE_ASSET_CACHE_DIR = "$HOME/.cache/cs2sm"
+REMOTE_ASSET_CACHE_MAX_AGE_MINUTES = 60
+# Printed by the install download command when it copied the archive from the cache
+ASSET_CACHE_HIT_MARKER = "CS2SM_CACHE_HIT"
+
+# Parallel mv processes used by uninstall (all deletions run in one SSH command)
+UNINSTALL_PARALLELISM = 8
+# Directory (relative to the game directory) where uninstalled paths are moved
+# before being deleted in the background
+UNINSTALL_TRASH_DIRNAME = ".cs2sm_trash"
+# Trash batches untouched for this long are left over from an interrupted background
+# rm and are removed by the next uninstall
+UNINSTALL_TRASH_MAX_AGE_MINUTES = 60
+
+# Remote tools probed once per server and cached for SERVER_CAPS_TTL seconds
+SERVER_CAPS_TOOLS = ("bsdtar", "rsync", "unzip", "7z", "7za", "7zr")
+SERVER_CAPS_TTL = 3600
+
+# server_id -> (expires_at, names of available tools)
+_SERVER_CAPS: dict[int, tuple[float, frozenset[str]]] = {}
+
+# Max install progress messages buffered for the WebSocket writer (oldest dropped when full)
+PROGRESS_QUEUE_SIZE = 256
+
+# Releases cache: served directly within the TTL, revalidated with If-None-Match after it
+RELEASES_CACHE_TTL = 60  # seconds
+RELEASES_CACHE_MAX_ENTRIES = 256
+
+# (owner, repo, count, token_owner_id) -> (etag, expires_at, serialized GitHubReleasesResponse)
+_RELEASES_CACHE: dict[tuple, tuple[Optional[str], float, bytes]] = {}
+
+# In-flight releases fetches keyed like _RELEASES_CACHE, so concurrent identical
+# requests share one GitHub API call
+_RELEASES_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+
+def _store_releases_cache(key: tuple, etag: Optional[str], body: bytes) -> None:
+    """Store a serialized releases response, evicting the oldest entry when full"""
+    if key not in _RELEASES_CACHE and len(_RELEASES_CACHE) >= RELEASES_CACHE_MAX_ENTRIES:
+        _RELEASES_CACHE.pop(next(iter(_RELEASES_CACHE)))
+    _RELEASES_CACHE[key] = (etag, time.monotonic() + RELEASES_CACHE_TTL, body)
+
+
+async def get_server_capabilities(ssh_manager: SSHManager, server_id: int) -> frozenset[str]:
+    """
+    Return which of SERVER_CAPS_TOOLS are installed on the server, probing all of
+    them in one command on first use and caching the result per server.
+    
+    Args:
+        ssh_manager: Connected SSH manager for the server
+        server_id: Server ID
+    
+    Returns:
+        Names of the available tools (empty if the probe failed; failures are not cached)
+    """
+    cached = _SERVER_CAPS.get(server_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    probe_cmd = (
+        f"for tool in {' '.join(SERVER_CAPS_TOOLS)}; do "
+        f"command -v $tool >/dev/null 2>&1 && echo $tool; done; exit 0"
+    )
+    success, output, _ = await ssh_manager.execute_command(probe_cmd, combine_stderr=True)
+    if not success:
+        return frozenset()
+    
+    caps = frozenset(line.strip() for line in output.splitlines() if line.strip() in SERVER_CAPS_TOOLS)
+    _SERVER_CAPS[server_id] = (time.monotonic() + SERVER_CAPS_TTL, caps)
+    return caps
+
+
+def _json_body_response(body: bytes) -> Response:
+    """Wrap an already serialized JSON body in a response"""
+    return Response(content=body, media_type="application/json")
+
+
+def safe_relative_path(path: str) -> Optional[str]:
+    """
+    Normalize a user-supplied path relative to a base directory.
+    
+    Leading/trailing slashes are ignored and '.'/'..' components are resolved, so
+    'foo/../bar' becomes 'bar' while anything escaping the base is rejected.
+    
+    Args:
+        path: User-supplied relative path
+    
+    Returns:
+        Normalized relative path ('' for the base itself), or None if it escapes the base
+    """
+    relative = posixpath.normpath(path.strip().strip('/') or '.')
+    if relative == '..' or relative.startswith('../'):
+        return None
+    return '' if relative == '.' else relative
 
 
 def parse_github_url(url: str) -> tuple[str, str]:
@@ -48,10 +190,335 @@ def parse_github_url(url: str) -> tuple[str, str]:
     Raises:
         ValueError: If URL is invalid
     """
-    match = GITHUB_REPO_PATTERN.match(url)
+    match = GITHUB_REPO_PATTERN.fullmatch(url)
     if not match:
         raise ValueError("Invalid GitHub repository URL format")
-    return match.group(1), match.group(2)
+    # Accept clone URLs pasted with a trailing .git suffix
+    repo = match.group(2).removesuffix('.git')
+    if not repo:
+        raise ValueError("Invalid GitHub repository URL format")
+    return match.group(1), repo
+
+
+class ProgressThrottle:
+    """
+    Coalesces transfer progress updates before they are sent over WebSocket.
+    An update passes once the percentage has advanced by PROGRESS_UPDATE_INTERVAL
+    and PROGRESS_MIN_SECONDS have elapsed since the last one; 100% always passes.
+    """
+    
+    def __init__(self):
+        self.last_ts = 0.0
+        self.last_percent = 0
+    
+    def should_emit(self, percent: int) -> bool:
+        """Return True (and record the update) if an update for this percentage should be sent"""
+        if percent != 100:
+            if percent < self.last_percent + PROGRESS_UPDATE_INTERVAL:
+                return False
+            if time.monotonic() - self.last_ts < PROGRESS_MIN_SECONDS:
+                return False
+        elif self.last_percent == 100:
+            return False
+        
+        self.last_ts = time.monotonic()
+        self.last_percent = percent
+        return True
+
+
+def detect_archive_type(url: str) -> Optional[str]:
+    """
+    Detect the archive type from a file name or URL extension.
+    
+    Args:
+        url: Download URL or asset file name
+    
+    Returns:
+        Archive type ('tar.gz', 'tar', 'zip' or '7z'), or None if not a supported archive
+    """
+    match = ARCHIVE_EXTENSION_PATTERN.search(url)
+    return ARCHIVE_TYPES[match.group(1).lower()] if match else None
+
+
+def build_exclude_patterns(exclude_files: list[str], exclude_dirs: list[str]) -> list[str]:
+    """
+    Build the unique, sanitized exclude patterns for an install.
+    
+    Directories (kept for backward compatibility) need no 'dir/' or 'dir/*' variants:
+    excluding a directory with rsync or tar also excludes everything below it.
+    
+    Args:
+        exclude_files: Files to exclude (relative to the archive root)
+        exclude_dirs: Directories to exclude (relative to the archive root)
+    
+    Returns:
+        Patterns in request order, without duplicates or unsafe paths
+    """
+    patterns = dict.fromkeys(
+        safe_path for safe_path in map(safe_relative_path, [*exclude_files, *exclude_dirs])
+        if safe_path
+    )
+    return list(patterns)
+
+
+def build_copy_script(
+    source_dir: str,
+    target_dir: str,
+    exclude_raw_patterns: list[str],
+    cleanup_dir: str
+) -> str:
+    """
+    Build one shell script that copies extracted plugin files into place, so the
+    install's copy phase takes a single SSH round-trip.
+    
+    The script copies with rsync --stats (falling back to tar/cp), removes
+    cleanup_dir, and exits with the copy's status. The number of files installed
+    is reported by rsync's stats, or as "---INSTALLED---N" by the fallback; the
+    game directory itself is never walked. Use parse_installed_count() on the output.
+    
+    Args:
+        source_dir: Directory whose contents are installed
+        target_dir: Installation directory
+        exclude_raw_patterns: Paths/patterns to exclude from the copy
+        cleanup_dir: Temporary directory removed after the copy
+    
+    Returns:
+        Shell script
+    """
+    if exclude_raw_patterns:
+        # Patterns are fed to rsync/tar on stdin through a quoted heredoc: no argv growth
+        # and no shell quoting or expansion of the patterns
+        patterns = '\n'.join(
+            pattern for pattern in exclude_raw_patterns
+            if '\n' not in pattern and pattern != EXCLUDES_HEREDOC_DELIMITER
+        )
+        excludes_heredoc = f" <<'{EXCLUDES_HEREDOC_DELIMITER}'\n{patterns}\n{EXCLUDES_HEREDOC_DELIMITER}"
+        rsync_cmd = f'rsync -a --stats --exclude-from=- "{source_dir}/" "{target_dir}/"{excludes_heredoc}'
+        # Fallback to tar for exclusions; its verbose listing (non-directory lines) is the count
+        copied_list = f"{cleanup_dir}/copied.list"
+        fallback_cmd = (
+            f'(cd "{source_dir}" && tar --exclude-from=/dev/stdin -cvf - . 2>"{copied_list}" '
+            f'| tar -xf - -C "{target_dir}"){excludes_heredoc}\n'
+            f"  rc=$?\n"
+            f'  echo "---INSTALLED---$(grep -vc \'/$\' "{copied_list}")"'
+        )
+    else:
+        rsync_cmd = f'rsync -a --stats "{source_dir}/" "{target_dir}/"'
+        fallback_cmd = (
+            f'cp -r "{source_dir}"/* "{target_dir}/"\n'
+            f"  rc=$?\n"
+            f'  echo "---INSTALLED---$(find "{source_dir}" -type f | wc -l)"'
+        )
+    return (
+        f'mkdir -p "{target_dir}"\n'
+        f"if command -v rsync >/dev/null 2>&1; then\n"
+        f"  {rsync_cmd}\n"
+        f"  rc=$?\n"
+        f"else\n"
+        f"  {fallback_cmd}\n"
+        f"fi\n"
+        f"rm -rf {cleanup_dir}\n"
+        f"exit $rc"
+    )
+
+
+def parse_installed_count(copy_output: str) -> int:
+    """Number of files installed, as reported by a build_copy_script() run"""
+    match = RSYNC_TRANSFERRED_PATTERN.search(copy_output) or INSTALLED_COUNT_PATTERN.search(copy_output)
+    return int(match.group(1).replace(',', '')) if match else 0
+
+
+def build_archive_list_command(archive_type: str, archive_file: str, include_sizes: bool = False) -> str:
+    """
+    Build the shell command that lists the contents of an archive on the remote server.
+    
+    Args:
+        archive_type: Archive type ('zip', 'tar.gz', 'tar' or '7z')
+        archive_file: Remote archive path
+        include_sizes: For zip archives, list "size date time path" instead of bare paths
+    
+    Returns:
+        Shell command printing one entry per line
+    """
+    if archive_type == 'zip':
+        if include_sizes:
+            return f"unzip -l {archive_file} | tail -n +4 | head -n -2"
+        # Path-only listing: no header/footer trimming or column parsing needed
+        return f"unzip -Z1 {archive_file}"
+    if archive_type == '7z':
+        return f"7z l {archive_file} | grep -E '^[0-9]{{4}}-' | awk '{{print $NF}}' 2>/dev/null || 7za l {archive_file} | grep -E '^[0-9]{{4}}-' | awk '{{print $NF}}'"
+    return f"tar -tzf {archive_file} 2>/dev/null || tar -tf {archive_file}"
+
+
+def remote_asset_cache_path(download_url: str) -> str:
+    """Path of the cached copy of a release asset on the remote server"""
+    return f"{REMOTE_ASSET_CACHE_DIR}/{hashlib.sha256(download_url.encode()).hexdigest()[:32]}.bin"
+
+
+def remote_asset_digest_key(server_id: int, download_url: str) -> str:
+    """Redis key holding the sha256 of a release asset cached on the given server"""
+    return f"remote_asset_digest:{server_id}:{hashlib.sha256(download_url.encode()).hexdigest()}"
+
+
+def build_cache_and_cleanup_command(archive_file: str, download_url: str, temp_dir: str) -> str:
+    """
+    Build the shell tail of an analysis script: keep the archive in the remote asset
+    cache if listing succeeded ($rc) and print its sha256 after DIGEST_SENTINEL,
+    expire stale cache entries and remove temp_dir.
+    """
+    cache_path = remote_asset_cache_path(download_url)
+    return (
+        f"[ $rc -eq 0 ] && mkdir -p -m 700 {REMOTE_ASSET_CACHE_DIR} && [ -O {REMOTE_ASSET_CACHE_DIR} ] && "
+        f"mv -f {archive_file} {cache_path} && "
+        f"echo '{DIGEST_SENTINEL}' && sha256sum {cache_path} | cut -c1-64\n"
+        f"find {REMOTE_ASSET_CACHE_DIR} -type f -mmin +{REMOTE_ASSET_CACHE_MAX_AGE_MINUTES} -delete 2>/dev/null\n"
+        f"rm -rf {temp_dir}\nexit $rc"
+    )
+
+
+def build_cached_download_command(download_cmd: str, download_url: str, archive_file: str, digest: str) -> str:
+    """
+    Wrap an install download command so it copies the archive from the remote asset
+    cache instead when the cached file is still there with the sha256 recorded by
+    analyze-archive. A cache hit prints ASSET_CACHE_HIT_MARKER and the DL_SIZE line.
+    """
+    cache_path = remote_asset_cache_path(download_url)
+    return (
+        f"if [ -O {REMOTE_ASSET_CACHE_DIR} ] && [ \"$(sha256sum {cache_path} 2>/dev/null | cut -c1-64)\" = '{digest}' ] && "
+        f"cp -f {cache_path} {archive_file}; then "
+        f"echo '{ASSET_CACHE_HIT_MARKER}'; "
+        f"echo \"DL_SIZE=$(stat -c%s {archive_file} 2>/dev/null || stat -f%z {archive_file} 2>/dev/null)\"; "
+        f"else {download_cmd}; fi"
+    )
+
+
+@dataclass(slots=True)
+class ArchiveEntry:
+    """Single normalized entry of an archive listing"""
+    path: str
+    size: int
+    explicit_dir: bool
+
+
+def parse_archive_list_line(line: str, sized: bool) -> Optional[ArchiveEntry]:
+    """
+    Parse one line of archive listing output.
+    
+    Args:
+        line: Listing line
+        sized: Whether the line is in unzip -l "size date time path" format
+    
+    Returns:
+        Normalized entry, or None for lines that are not entries
+    """
+    if sized:
+        match = ZIP_LIST_LINE_PATTERN.match(line)
+        if not match:
+            return None
+        size = int(match.group(1))
+        raw_path = match.group(2).strip()
+    else:
+        # unzip -Z1/tar/7z output is just paths, no size info
+        size = 0
+        raw_path = line.strip()
+    
+    path = raw_path.strip('/')
+    if not path:
+        return None
+    return ArchiveEntry(path, size, raw_path.endswith('/'))
+
+
+class QueuedProgress:
+    """
+    Fire-and-forget deployment progress reporter. Messages are queued and sent to the
+    WebSocket by a single writer task, so slow clients never block the caller; the
+    oldest message is dropped when the queue is full. Call flush() before returning.
+    """
+    
+    def __init__(self, server_id: int, send_update, maxsize: int = PROGRESS_QUEUE_SIZE):
+        self.server_id = server_id
+        self._send_update = send_update
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._writer = asyncio.create_task(self._drain())
+    
+    async def _drain(self) -> None:
+        """Send queued (msg_type, message) tuples one at a time"""
+        while True:
+            msg_type, message = await self._queue.get()
+            try:
+                await self._send_update(self.server_id, msg_type, message)
+            except Exception as e:
+                logger.debug(f"Failed to send progress update for server {self.server_id}: {e}")
+            finally:
+                self._queue.task_done()
+    
+    async def __call__(self, msg: str, msg_type: str = "status"):
+        """Queue a progress update (never blocks on the network)"""
+        try:
+            self._queue.put_nowait((msg_type, msg))
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._queue.put_nowait((msg_type, msg))
+    
+    async def flush(self):
+        """Wait for queued updates to be sent, then stop the writer"""
+        await self._queue.join()
+        self._writer.cancel()
+
+
+async def stream_proxy_transfer(
+    url: str,
+    remote_path: str,
+    ssh_manager: SSHManager,
+    server: Server,
+    progress_callback=None
+) -> tuple[bool, Optional[str], int]:
+    """
+    Relay a download through the panel server straight into an SFTP upload.
+    The download and the upload run concurrently through a bounded queue,
+    so no temp file is written on the panel and total time approaches the
+    slower of the two transfers instead of their sum.
+    
+    Args:
+        url: Download URL
+        remote_path: Destination path on the game server
+        ssh_manager: Connected SSH manager
+        server: Server instance
+        progress_callback: Optional async callback called with (bytes_transferred, total_bytes)
+    
+    Returns:
+        Tuple of (success, error_message, bytes_transferred)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PROXY_STREAM_QUEUE_SIZE)
+    total_bytes = 0
+    
+    async def on_chunk(chunk: bytes, content_length: int):
+        nonlocal total_bytes
+        total_bytes = content_length
+        await queue.put(chunk)
+    
+    async def produce() -> tuple[bool, Optional[str]]:
+        try:
+            return await http_helper.stream_download(url, on_chunk, timeout=600)
+        finally:
+            # End marker; the consumer keeps draining on failure so this never blocks forever
+            await queue.put(None)
+    
+    async def on_upload(bytes_uploaded: int):
+        if progress_callback:
+            await progress_callback(bytes_uploaded, total_bytes)
+    
+    (download_ok, download_error), (upload_ok, upload_error, bytes_uploaded) = await asyncio.gather(
+        produce(),
+        ssh_manager.upload_from_queue(queue, remote_path, server, progress_callback=on_upload)
+    )
+    
+    if not download_ok:
+        return False, f"Failed to download to panel server: {download_error}", bytes_uploaded
+    if not upload_ok:
+        return False, f"Failed to upload to server: {upload_error}", bytes_uploaded
+    return True, None, bytes_uploaded
 
 
 async def get_server_and_verify_ownership(
@@ -75,7 +542,7 @@ async def get_server_and_verify_ownership(
     return server
 
 
-@router.get("/releases")
+@router.get("/releases", response_model=GitHubReleasesResponse)
 async def get_github_releases(
     repo_url: str,
     count: int = 5,
@@ -112,18 +579,61 @@ async def get_github_releases(
     # Limit count to prevent abuse
     count = min(count, 10)
     
-    # Fetch releases from GitHub API
+    # Use user's GitHub token for authentication if available
+    github_token = current_user.github_token if current_user.has_github_token else None
+    
+    # Authenticated responses may include private repositories, so namespace them per user.
+    # The proxy is not part of the key: it is never applied to api.github.com requests.
+    cache_key = (owner.lower(), repo.lower(), count, current_user.id if github_token else None)
+    cached = _RELEASES_CACHE.get(cache_key)
+    if cached and cached[1] > time.monotonic():
+        logger.info(f"X-Cache: HIT releases {owner}/{repo}")
+        return _json_body_response(cached[2])
+    
+    # Coalesce with an identical fetch already in progress. The fetch runs as its own
+    # task so a caller disconnecting does not cancel it for the others.
+    task = _RELEASES_INFLIGHT.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _fetch_releases(cache_key, cached, owner, repo, count, github_proxy, github_token)
+        )
+        _RELEASES_INFLIGHT[cache_key] = task
+        task.add_done_callback(lambda _: _RELEASES_INFLIGHT.pop(cache_key, None))
+    else:
+        logger.info(f"Joining in-flight releases fetch for {owner}/{repo}")
+    
+    result = await asyncio.shield(task)
+    if isinstance(result, bytes):
+        return _json_body_response(result)
+    return result
+
+
+async def _fetch_releases(
+    cache_key: tuple,
+    cached: Optional[tuple[Optional[str], float, bytes]],
+    owner: str,
+    repo: str,
+    count: int,
+    github_proxy: Optional[str],
+    github_token: Optional[str]
+):
+    """
+    Fetch releases from the GitHub API and serialize them, updating the releases cache.
+    
+    Returns:
+        Serialized GitHubReleasesResponse body on success, otherwise an error response
+    """
+    # Fetch releases from GitHub API, revalidating the cached copy via its ETag
     api_url = f"https://api.github.com/repos/{owner}/{repo}/releases"
     headers = {
         "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip, deflate",  # httpx decompresses transparently
         "User-Agent": "CS2-ServerManager"
     }
     
-    # Use user's GitHub token for authentication if available
-    github_token = current_user.github_token if current_user.has_github_token else None
-    
-    success, data, error = await http_helper.get(
+    success, data, error, etag = await http_helper.get_conditional(
         api_url,
+        etag=cached[0] if cached else None,
         headers=headers,
         params={"per_page": count},
         timeout=30,
@@ -131,6 +641,11 @@ async def get_github_releases(
         github_token=github_token
     )
     
+    if success and data is None and cached:
+        logger.info(f"X-Cache: HIT (304 Not Modified) releases {owner}/{repo}")
+        _store_releases_cache(cache_key, etag, cached[2])
+        return cached[2]
+    
     if not success:
         return GitHubReleasesResponse(
             success=False,
@@ -149,49 +664,57 @@ async def get_github_releases(
             repo_name=repo
         )
     
-    # Parse releases
+    # Parse releases into plain dicts shaped like GitHubRelease / GitHubReleaseAsset and
+    # serialize them with orjson; the fields used are read with .get() defaults, so
+    # per-asset model validation would only add cost
     releases = []
     for release_data in data[:count]:
         assets = []
         for asset_data in release_data.get("assets", []):
             asset_name = asset_data.get("name", "")
-            asset_name_lower = asset_name.lower()
+            
+            # Only include archive files that could be plugins (including 7z);
+            # most non-plugin assets (.deb, .exe, checksums) are rejected here first
+            if not ARCHIVE_EXTENSION_PATTERN.search(asset_name):
+                continue
             
             # Skip Windows-specific archives (filename contains 'windows' or 'win')
-            if 'windows' in asset_name_lower or '-win-' in asset_name_lower or '_win_' in asset_name_lower or asset_name_lower.endswith('-win.zip'):
+            if WINDOWS_ASSET_PATTERN.search(asset_name):
                 continue
             
-            # Only include archive files that could be plugins (including 7z)
-            if any(asset_name_lower.endswith(ext) for ext in [".zip", ".tar.gz", ".tgz", ".tar", ".7z"]):
-                assets.append(GitHubReleaseAsset(
-                    name=asset_name,
-                    browser_download_url=asset_data.get("browser_download_url", ""),
-                    size=asset_data.get("size", 0),
-                    content_type=asset_data.get("content_type")
-                ))
+            assets.append({
+                "name": asset_name,
+                "browser_download_url": asset_data.get("browser_download_url", ""),
+                "size": asset_data.get("size", 0),
+                "content_type": asset_data.get("content_type")
+            })
         
         # Only include releases that have downloadable assets
         if assets:
-            releases.append(GitHubRelease(
-                tag_name=release_data.get("tag_name", ""),
-                name=release_data.get("name"),
-                published_at=release_data.get("published_at"),
-                prerelease=release_data.get("prerelease", False),
-                assets=assets
-            ))
+            releases.append({
+                "tag_name": release_data.get("tag_name", ""),
+                "name": release_data.get("name"),
+                "published_at": release_data.get("published_at"),
+                "prerelease": release_data.get("prerelease", False),
+                "assets": assets
+            })
     
-    return GitHubReleasesResponse(
-        success=True,
-        releases=releases,
-        repo_owner=owner,
-        repo_name=repo
-    )
+    body = orjson.dumps({
+        "success": True,
+        "releases": releases,
+        "error": None,
+        "repo_owner": owner,
+        "repo_name": repo
+    })
+    _store_releases_cache(cache_key, etag, body)
+    return body
 
 
 @router.get("/servers/{server_id}/analyze-archive")
 async def analyze_archive(
     server_id: int,
     download_url: str,
+    include_sizes: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> ArchiveAnalysisResponse:
@@ -206,6 +729,7 @@ async def analyze_archive(
     Args:
         server_id: Server ID for SSH connection
         download_url: Direct download URL for the archive
+        include_sizes: Report per-file sizes (zip only, slower listing)
     
     Returns:
         Analysis of archive contents
@@ -220,6 +744,14 @@ async def analyze_archive(
     # Get server
     server = await get_server_and_verify_ownership(db, server_id, current_user)
     
+    # Return a cached analysis of the same release asset if available
+    cache_key = f"archive_analysis:{hashlib.sha256(download_url.encode()).hexdigest()}"
+    if include_sizes:
+        cache_key += ":sizes"
+    cached_analysis = await redis_manager.get(cache_key)
+    if cached_analysis and isinstance(cached_analysis, dict):
+        return ArchiveAnalysisResponse(**cached_analysis)
+    
     ssh_manager = SSHManager()
     success, msg = await ssh_manager.connect(server)
     if not success:
@@ -229,24 +761,12 @@ async def analyze_archive(
         )
     
     try:
-        # Create temp directory
         temp_dir = f"/tmp/archive_analysis_{server_id}"
-        await ssh_manager.execute_command(f"rm -rf {temp_dir} && mkdir -p {temp_dir}")
         
         # Detect archive type from URL (including 7z)
-        url_lower = download_url.lower()
-        if url_lower.endswith('.zip'):
-            archive_type = 'zip'
-            archive_file = f"{temp_dir}/archive.zip"
-        elif url_lower.endswith('.tar.gz') or url_lower.endswith('.tgz'):
-            archive_type = 'tar.gz'
-            archive_file = f"{temp_dir}/archive.tar.gz"
-        elif url_lower.endswith('.tar'):
-            archive_type = 'tar'
-            archive_file = f"{temp_dir}/archive.tar"
-        elif url_lower.endswith('.7z'):
-            archive_type = '7z'
-            archive_file = f"{temp_dir}/archive.7z"
+        archive_type = detect_archive_type(download_url)
+        if archive_type:
+            archive_file = f"{temp_dir}/archive.{archive_type}"
         else:
             # Try to detect from content-type after download
             archive_type = 'unknown'
@@ -259,47 +779,74 @@ async def analyze_archive(
             proxy_base = server.github_proxy.strip().rstrip('/')
             actual_download_url = f"{proxy_base}/{download_url}"
         
-        download_cmd = f"curl -fsSL -o {archive_file} '{actual_download_url}'"
-        success, _, stderr = await ssh_manager.execute_command(download_cmd, timeout=120)
+        # Download, stat and list (or detect the type of) the archive in a single SSH round-trip.
+        # Sections of the output are separated by sentinel lines.
+        analysis_script = (
+            f"rm -rf {temp_dir} && mkdir -p {temp_dir} && "
+            f"curl -fsSL --compressed -o {archive_file} '{actual_download_url}' || {{ rm -rf {temp_dir}; exit 1; }}\n"
+            f"echo '{SIZE_SENTINEL}'\n"
+            f"stat -c%s {archive_file} 2>/dev/null || stat -f%z {archive_file} 2>/dev/null\n"
+        )
+        if archive_type == 'unknown':
+            # The listing command depends on the detected type, keep the archive for a second call
+            analysis_script += f"echo '{TYPE_SENTINEL}'\nfile {archive_file}\n"
+        else:
+            analysis_script += (
+                f"echo '{LIST_SENTINEL}'\n"
+                f"{build_archive_list_command(archive_type, archive_file, include_sizes)}\n"
+                f"rc=$?\n{build_cache_and_cleanup_command(archive_file, download_url, temp_dir)}\n"
+            )
         
-        if not success:
-            await ssh_manager.execute_command(f"rm -rf {temp_dir}")
+        success, script_output, stderr = await ssh_manager.execute_command(analysis_script, timeout=150)
+        
+        if SIZE_SENTINEL not in script_output:
             return ArchiveAnalysisResponse(
                 success=False,
                 error=f"Failed to download archive: {stderr}"
             )
         
-        # List archive contents (including 7z)
-        if archive_type == 'zip':
-            list_cmd = f"unzip -l {archive_file} | tail -n +4 | head -n -2"
-        elif archive_type in ['tar.gz', 'tar']:
-            list_cmd = f"tar -tzf {archive_file} 2>/dev/null || tar -tf {archive_file}"
-        elif archive_type == '7z':
-            list_cmd = f"7z l {archive_file} | grep -E '^[0-9]{{4}}-' | awk '{{print $NF}}' 2>/dev/null || 7za l {archive_file} | grep -E '^[0-9]{{4}}-' | awk '{{print $NF}}'"
-        else:
-            # Try to detect type
-            type_cmd = f"file {archive_file}"
-            _, type_output, _ = await ssh_manager.execute_command(type_cmd)
+        size_output = script_output.split(SIZE_SENTINEL, 1)[1]
+        size_output = size_output.split(TYPE_SENTINEL if archive_type == 'unknown' else LIST_SENTINEL, 1)[0].strip()
+        if not size_output.isdigit() or int(size_output) == 0:
+            await ssh_manager.execute_command(f"rm -rf {temp_dir}")
+            return ArchiveAnalysisResponse(
+                success=False,
+                error="Downloaded archive is empty or invalid"
+            )
+        
+        if archive_type == 'unknown':
+            # Detect the type, then list and clean up in a second call
+            type_output = script_output.split(TYPE_SENTINEL, 1)[1].strip() if TYPE_SENTINEL in script_output else ''
             if 'Zip' in type_output:
                 archive_type = 'zip'
-                list_cmd = f"unzip -l {archive_file} | tail -n +4 | head -n -2"
             elif 'gzip' in type_output.lower() or 'tar' in type_output.lower():
                 archive_type = 'tar.gz'
-                list_cmd = f"tar -tzf {archive_file} 2>/dev/null || tar -tf {archive_file}"
             elif '7-zip' in type_output.lower():
                 archive_type = '7z'
-                list_cmd = f"7z l {archive_file} | grep -E '^[0-9]{{4}}-' | awk '{{print $NF}}'"
             else:
                 await ssh_manager.execute_command(f"rm -rf {temp_dir}")
                 return ArchiveAnalysisResponse(
                     success=False,
                     error=f"Unsupported archive type: {type_output}"
                 )
+            
+            list_cmd = (
+                f"{build_archive_list_command(archive_type, archive_file, include_sizes)}\n"
+                f"rc=$?\n{build_cache_and_cleanup_command(archive_file, download_url, temp_dir)}"
+            )
+            success, list_output, stderr = await ssh_manager.execute_command(list_cmd, timeout=30)
+        else:
+            list_output = script_output.split(LIST_SENTINEL, 1)[1] if LIST_SENTINEL in script_output else ''
         
-        success, list_output, stderr = await ssh_manager.execute_command(list_cmd, timeout=30)
-        
-        # Cleanup
-        await ssh_manager.execute_command(f"rm -rf {temp_dir}")
+        # The cache step prints the archive's sha256 after the listing
+        list_output, _, asset_digest = list_output.partition(DIGEST_SENTINEL)
+        asset_digest = asset_digest.strip()
+        if success and len(asset_digest) == 64:
+            await redis_manager.set(
+                remote_asset_digest_key(server_id, download_url),
+                {"sha256": asset_digest},
+                expire=REMOTE_ASSET_CACHE_MAX_AGE_MINUTES * 60
+            )
         
         if not success:
             return ArchiveAnalysisResponse(
@@ -308,130 +855,56 @@ async def analyze_archive(
                 archive_type=archive_type
             )
         
-        # Parse archive contents
+        # Parse each listing line exactly once into normalized entries
+        sized = archive_type == 'zip' and include_sizes
+        entries = [
+            entry for entry in (parse_archive_list_line(line, sized) for line in list_output.splitlines())
+            if entry
+        ]
+        
+        # Every parent component of an entry (and every explicit directory entry) is a directory
+        all_dirs = set()
+        for entry in entries:
+            path = entry.path
+            if entry.explicit_dir:
+                all_dirs.add(path)
+            slash = path.find('/')
+            while slash != -1:
+                all_dirs.add(path[:slash])
+                slash = path.find('/', slash + 1)
+        
         has_addons_dir = False
         root_dirs = set()
         top_level_items = []
+        seen_top_level = set()
+        all_files = []
         
-        lines = list_output.strip().split('\n') if list_output.strip() else []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Parse based on archive type
-            if archive_type == 'zip':
-                # unzip -l output format: "size  date time  path"
-                parts = line.split()
-                if len(parts) >= 4:
-                    path = ' '.join(parts[3:])
-                else:
-                    continue
-            else:
-                # tar output is just paths
-                path = line
-            
-            # Normalize path
-            path = path.strip('/')
-            if not path:
-                continue
-            
-            # Get top-level component
-            top_level = path.split('/')[0]
-            
+        for entry in entries:
+            path = entry.path
             # Check for addons directory
             if path == 'addons' or path.startswith('addons/'):
                 has_addons_dir = True
             
-            # Track root directories
             if '/' in path:
-                root_dirs.add(top_level)
-            
-            # Add to top-level items (only first level)
-            if '/' not in path or path.endswith('/'):
-                is_dir = path.endswith('/') or any(
-                    other_path.startswith(path.rstrip('/') + '/') 
-                    for other_path in [l.strip().split()[-1] if archive_type == 'zip' else l for l in lines]
-                    if other_path != path
-                )
-                if not any(item.path == path.rstrip('/') for item in top_level_items):
-                    top_level_items.append(ArchiveContentItem(
-                        path=path.rstrip('/'),
-                        is_dir=is_dir
-                    ))
-        
-        # Collect all directories and files from the archive for exclusion selection
-        all_dirs = set()
-        all_files = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Parse path and size based on archive type
-            if archive_type == 'zip':
-                parts = line.split()
-                if len(parts) >= 4:
-                    path = ' '.join(parts[3:])
-                    # Try to extract size (first column)
-                    try:
-                        size = int(parts[0])
-                    except (ValueError, IndexError):
-                        size = 0
-                else:
-                    continue
-            else:
-                # tar output is just paths, no size info
-                path = line
-                size = 0
-            
-            path = path.strip('/')
-            if not path:
-                continue
-            
-            # Determine if this is a file or directory
-            is_dir = False
-            
-            # If path ends with / it's definitely a directory
-            if path.endswith('/'):
-                all_dirs.add(path.rstrip('/'))
-                is_dir = True
-            else:
-                # Check if it's a directory by seeing if any other path starts with it
-                for other_line in lines:
-                    other_line = other_line.strip()
-                    if archive_type == 'zip':
-                        parts = other_line.split()
-                        if len(parts) >= 4:
-                            other_path = ' '.join(parts[3:]).strip('/')
-                        else:
-                            continue
-                    else:
-                        other_path = other_line.strip('/')
-                    
-                    if other_path.startswith(path + '/'):
-                        all_dirs.add(path)
-                        is_dir = True
-                        break
-                
-                # If not a directory, it's a file
-                if not is_dir:
-                    all_files.append(ArchiveContentItem(
-                        path=path,
-                        is_dir=False,
-                        size=size
-                    ))
+                # Track root directories
+                root_dirs.add(path.partition('/')[0])
+            elif path not in seen_top_level:
+                # Add to top-level items (only first level)
+                seen_top_level.add(path)
+                top_level_items.append(ArchiveContentItem(
+                    path=path,
+                    is_dir=path in all_dirs
+                ))
             
-            # Also add parent directories
-            parts = path.split('/')
-            for i in range(1, len(parts)):
-                parent = '/'.join(parts[:i])
-                if parent:
-                    all_dirs.add(parent)
+            # Collect files for exclusion selection
+            if path not in all_dirs:
+                all_files.append(ArchiveContentItem(
+                    path=path,
+                    is_dir=False,
+                    size=entry.size
+                ))
         
-        return ArchiveAnalysisResponse(
+        result = ArchiveAnalysisResponse(
             success=True,
             has_addons_dir=has_addons_dir,
             root_dirs=sorted(list(root_dirs)),
@@ -440,6 +913,11 @@ async def analyze_archive(
             top_level_items=top_level_items,
             archive_type=archive_type
         )
+        
+        # Release assets are immutable, so the analysis can be reused for the same URL
+        await redis_manager.set(cache_key, result.model_dump(), expire=ARCHIVE_ANALYSIS_CACHE_TTL)
+        
+        return result
     
     except Exception as e:
         logger.error(f"Error analyzing archive: {e}")
@@ -474,18 +952,39 @@ async def install_github_plugin(
     Returns:
         Installation result
     """
-    from api.routes.actions import send_deployment_update
-    
     server = await get_server_and_verify_ownership(db, server_id, current_user)
+    return await run_github_plugin_install(server, request)
+
+
+async def run_github_plugin_install(
+    server: Server,
+    request: GitHubPluginInstallRequest,
+    ssh_manager: Optional[SSHManager] = None
+) -> GitHubPluginInstallResponse:
+    """
+    Install a GitHub release asset on an already authorized server.
     
-    async def progress(msg: str, msg_type: str = "status"):
-        """Send progress update via WebSocket"""
-        await send_deployment_update(server_id, msg_type, msg)
+    Args:
+        server: Server to install on (ownership must already be verified)
+        request: Installation request with download URL and options
+        ssh_manager: Optional SSH manager to reuse across several installs; it is
+            connected if needed and left open for the caller to release
     
-    ssh_manager = SSHManager()
-    success, msg = await ssh_manager.connect(server)
+    Returns:
+        Installation result
+    """
+    from api.routes.actions import send_deployment_update
+    
+    server_id = server.id
+    progress = QueuedProgress(server_id, send_deployment_update)
+    
+    owns_connection = ssh_manager is None
+    if owns_connection:
+        ssh_manager = SSHManager()
+    success, msg = await ssh_manager.ensure_connected(server)
     if not success:
         await progress(f"SSH connection failed: {msg}", "error")
+        await progress.flush()
         return GitHubPluginInstallResponse(
             success=False,
             message=f"SSH connection failed: {msg}"
@@ -510,144 +1009,71 @@ async def install_github_plugin(
             )
         
         # Detect archive type (support zip, tar.gz, tgz, tar, 7z)
-        url_lower = request.download_url.lower()
-        if url_lower.endswith('.zip'):
-            archive_type = 'zip'
-            archive_filename = "plugin.zip"
-        elif url_lower.endswith('.tar.gz') or url_lower.endswith('.tgz'):
-            archive_type = 'tar.gz'
-            archive_filename = "plugin.tar.gz"
-        elif url_lower.endswith('.tar'):
-            archive_type = 'tar'
-            archive_filename = "plugin.tar"
-        elif url_lower.endswith('.7z'):
-            archive_type = '7z'
-            archive_filename = "plugin.7z"
-        else:
-            archive_type = 'zip'  # Default assumption
-            archive_filename = "plugin.zip"
+        archive_type = detect_archive_type(request.download_url) or 'zip'  # Default assumption
+        archive_filename = f"plugin.{archive_type}"
+        
+        # Set when the archive is piped straight into the extractor on the remote server
+        streamed_extract = False
         
         # Check if we should use panel proxy mode (server-level setting)
         if server.use_panel_proxy:
-            # Panel Proxy Mode: Download to panel server first, then SFTP upload
+            # Panel Proxy Mode: Relay the download through the panel server into an SFTP upload
             await progress("Using panel server proxy mode (github_proxy setting ignored)...")
             
-            # Create UID-isolated temp directory on panel server
-            panel_temp_dir = os.path.join(tempfile.gettempdir(), f"cs2_panel_proxy_{current_user.id}")
-            os.makedirs(panel_temp_dir, exist_ok=True)
+            remote_temp_dir = f"/tmp/github_plugin_{server_id}"
+            await ssh_manager.execute_command(f"rm -rf {remote_temp_dir} && mkdir -p {remote_temp_dir}")
+            remote_archive_path = f"{remote_temp_dir}/{archive_filename}"
             
-            # Create unique subdirectory for this download
-            download_id = str(uuid.uuid4())
-            download_dir = os.path.join(panel_temp_dir, download_id)
-            os.makedirs(download_dir, exist_ok=True)
+            await progress(f"Transferring {archive_type} archive to server via panel...")
+            logger.info(f"Panel proxy: Streaming {request.download_url} to {remote_archive_path}")
             
-            panel_archive_path = os.path.join(download_dir, archive_filename)
+            # Progress tracking for the combined download/upload
+            transfer_throttle = ProgressThrottle()
+            async def transfer_progress(bytes_transferred, total_bytes):
+                if total_bytes > 0:
+                    percent = bytes_transferred * 100 // total_bytes
+                    # Only update at configured interval and rate
+                    if transfer_throttle.should_emit(percent):
+                        size_mb = bytes_transferred / (1024 * 1024)
+                        total_mb = total_bytes / (1024 * 1024)
+                        await progress(f"Transfer progress: {percent}% ({size_mb:.1f}/{total_mb:.1f} MB)")
             
-            try:
-                # Download to panel server
-                await progress(f"Downloading {archive_type} archive to panel server...")
-                logger.info(f"Panel proxy: Downloading from {request.download_url} to {panel_archive_path}")
-                
-                from modules.http_helper import http_helper
-                
-                # Progress tracking for download
-                last_progress_percent = 0
-                async def download_progress(bytes_downloaded, total_bytes):
-                    nonlocal last_progress_percent
-                    if total_bytes > 0:
-                        percent = int((bytes_downloaded / total_bytes) * 100)
-                        # Only update at configured interval
-                        if percent >= last_progress_percent + PROGRESS_UPDATE_INTERVAL or percent == 100:
-                            last_progress_percent = percent
-                            size_mb = bytes_downloaded / (1024 * 1024)
-                            total_mb = total_bytes / (1024 * 1024)
-                            await progress(f"Download progress: {percent}% ({size_mb:.1f}/{total_mb:.1f} MB)")
-                
-                success, error = await http_helper.download_file(
-                    request.download_url,
-                    panel_archive_path,
-                    timeout=600,
-                    progress_callback=download_progress
+            success, error, file_size = await stream_proxy_transfer(
+                request.download_url,
+                remote_archive_path,
+                ssh_manager,
+                server,
+                progress_callback=transfer_progress
+            )
+            
+            if not success:
+                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
+                await progress(error, "error")
+                return GitHubPluginInstallResponse(
+                    success=False,
+                    message=error
                 )
-                
-                if not success:
-                    await progress(f"Failed to download to panel server: {error}", "error")
-                    return GitHubPluginInstallResponse(
-                        success=False,
-                        message=f"Failed to download to panel server: {error}"
-                    )
-                
-                # Verify download
-                if not os.path.exists(panel_archive_path):
-                    await progress("Downloaded file not found", "error")
-                    return GitHubPluginInstallResponse(
-                        success=False,
-                        message="Downloaded file not found"
-                    )
-                
-                file_size = os.path.getsize(panel_archive_path)
-                if file_size < 1000:
-                    await progress("Downloaded file is too small or empty", "error")
-                    return GitHubPluginInstallResponse(
-                        success=False,
-                        message="Downloaded file is too small or empty"
-                    )
-                
-                # Format file size for display
-                if file_size >= 1024 * 1024:
-                    size_str = f"{file_size / (1024 * 1024):.2f} MB"
-                elif file_size >= 1024:
-                    size_str = f"{file_size / 1024:.2f} KB"
-                else:
-                    size_str = f"{file_size} B"
-                
-                await progress(f"Download complete ({size_str}), uploading to server via SFTP...")
-                
-                # Upload to remote server via SFTP
-                remote_temp_dir = f"/tmp/github_plugin_{server_id}"
-                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir} && mkdir -p {remote_temp_dir}")
-                remote_archive_path = f"{remote_temp_dir}/{archive_filename}"
-                
-                # Progress tracking for upload
-                last_upload_percent = 0
-                async def upload_progress(bytes_uploaded, total_bytes):
-                    nonlocal last_upload_percent
-                    if total_bytes > 0:
-                        percent = int((bytes_uploaded / total_bytes) * 100)
-                        # Only update at configured interval
-                        if percent >= last_upload_percent + PROGRESS_UPDATE_INTERVAL or percent == 100:
-                            last_upload_percent = percent
-                            size_mb = bytes_uploaded / (1024 * 1024)
-                            total_mb = total_bytes / (1024 * 1024)
-                            await progress(f"Upload progress: {percent}% ({size_mb:.1f}/{total_mb:.1f} MB)")
-                
-                success, error = await ssh_manager.upload_file_with_progress(
-                    panel_archive_path,
-                    remote_archive_path,
-                    server,
-                    progress_callback=upload_progress
+            
+            if file_size < 1000:
+                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
+                await progress("Downloaded file is too small or empty", "error")
+                return GitHubPluginInstallResponse(
+                    success=False,
+                    message="Downloaded file is too small or empty"
                 )
-                
-                if not success:
-                    await progress(f"Failed to upload to server: {error}", "error")
-                    return GitHubPluginInstallResponse(
-                        success=False,
-                        message=f"Failed to upload to server: {error}"
-                    )
-                
-                await progress("Upload complete, proceeding with extraction...")
-                
-                # Set archive_file for extraction phase
-                archive_file = remote_archive_path
-                
-            finally:
-                # Clean up panel temp directory
-                try:
-                    if os.path.exists(download_dir):
-                        shutil.rmtree(download_dir)
-                        logger.info(f"Cleaned up panel temp directory: {download_dir}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up panel temp directory {download_dir}: {e}")
+            
+            # Format file size for display
+            if file_size >= 1024 * 1024:
+                size_str = f"{file_size / (1024 * 1024):.2f} MB"
+            elif file_size >= 1024:
+                size_str = f"{file_size / 1024:.2f} KB"
+            else:
+                size_str = f"{file_size} B"
+            
+            await progress(f"Transfer complete ({size_str}), proceeding with extraction...")
+            
+            # Set archive_file for extraction phase
+            archive_file = remote_archive_path
         else:
             # Original Mode: Download directly on remote server
             # Create temp directory
@@ -666,11 +1092,45 @@ async def install_github_plugin(
                 actual_download_url = f"{proxy_base}/{request.download_url}"
                 logger.info(f"Using GitHub proxy: {proxy_base}")
             
-            # Use curl with progress output
-            download_cmd = f"curl -fL --progress-bar -o {archive_file} '{actual_download_url}' 2>&1"
+            # Stream straight into bsdtar when available: libarchive reads zip/tar/tar.gz
+            # from stdin, so no intermediate archive is written. 7z is not streamable.
+            if archive_type != '7z':
+                streamed_extract = 'bsdtar' in await get_server_capabilities(ssh_manager, server_id)
+            
+            if streamed_extract:
+                stream_extract_dir = f"{temp_dir}/extracted"
+                pipeline = (
+                    f"set -o pipefail; mkdir -p {stream_extract_dir} && "
+                    f"curl -fsSL --compressed '{actual_download_url}' | bsdtar -xf - -C {stream_extract_dir} && "
+                    # Print the first extracted path so an empty extraction shows up in the output
+                    f"find {stream_extract_dir} -mindepth 1 -print -quit"
+                )
+                download_cmd = f"bash -c {shlex.quote(pipeline)}"
+            else:
+                # Download silently; curl reports the size and HTTP status itself.
+                # Progress is reported via the WebSocket status messages
+                download_cmd = (
+                    f"curl -fsSL --compressed -w '{CURL_WRITE_OUT}' "
+                    f"-o {archive_file} '{actual_download_url}'"
+                )
+            
+            # Reuse the copy left behind by analyze-archive if it is still cached; the check
+            # runs in the same command, so a cache miss costs no extra round trip
+            cached_digest = await redis_manager.get(remote_asset_digest_key(server_id, request.download_url))
+            if isinstance(cached_digest, dict) and cached_digest.get("sha256"):
+                download_cmd = build_cached_download_command(
+                    download_cmd, request.download_url, archive_file, cached_digest["sha256"]
+                )
+            
             success, download_output, stderr = await ssh_manager.execute_command(download_cmd, timeout=300)
+            if success and ASSET_CACHE_HIT_MARKER in download_output:
+                logger.info(f"Reusing cached archive for {request.download_url}")
+                streamed_extract = False
             
             if not success:
+                code_match = DOWNLOAD_CODE_PATTERN.search(download_output)
+                if code_match and code_match.group(1) != '000':
+                    stderr = f"HTTP {code_match.group(1)} {stderr}".strip()
                 await ssh_manager.execute_command(f"rm -rf {temp_dir}")
                 await progress(f"Failed to download plugin: {stderr}", "error")
                 return GitHubPluginInstallResponse(
@@ -685,12 +1145,27 @@ async def install_github_plugin(
         else:
             remote_temp_dir = temp_dir
         
+        # Create extraction directory
+        extract_dir = f"{remote_temp_dir}/extracted"
+        
+        if streamed_extract:
+            # No archive file to stat; the pipeline printed the first extracted path, so
+            # empty output means the download was empty or invalid
+            if not download_output.strip():
+                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
+                await progress("Downloaded archive is empty or invalid", "error")
+                return GitHubPluginInstallResponse(
+                    success=False,
+                    message="Downloaded archive is empty or invalid"
+                )
+            await progress("Download and extraction complete, analyzing archive structure...")
+        
         # Verify download and get file size (only needed for non-panel-proxy mode)
-        if not server.use_panel_proxy:
-            size_cmd = f"stat -c%s {archive_file} 2>/dev/null || stat -f%z {archive_file} 2>/dev/null"
-            success, size_output, _ = await ssh_manager.execute_command(size_cmd)
+        if not server.use_panel_proxy and not streamed_extract:
+            # The download command already printed the file size
+            size_match = DOWNLOAD_SIZE_PATTERN.search(download_output)
             
-            if not success or not size_output.strip():
+            if not size_match:
                 await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
                 await progress("Downloaded file is invalid", "error")
                 return GitHubPluginInstallResponse(
@@ -698,7 +1173,7 @@ async def install_github_plugin(
                     message="Downloaded file is invalid"
                 )
             
-            file_size = int(size_output.strip())
+            file_size = int(size_match.group(1))
             if file_size < 1000:
                 await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
                 await progress("Downloaded file is too small or empty", "error")
@@ -717,40 +1192,63 @@ async def install_github_plugin(
             
             await progress(f"Download complete ({size_str})")
         
-        # Create extraction directory
-        extract_dir = f"{remote_temp_dir}/extracted"
-        await ssh_manager.execute_command(f"mkdir -p {extract_dir}")
-        
-        # Extract archive (support zip, tar.gz, tar, 7z)
-        await progress(f"Extracting {archive_type} archive...")
-        if archive_type == 'zip':
-            extract_cmd = f"unzip -o {archive_file} -d {extract_dir}"
-        elif archive_type == '7z':
-            # Check if 7z is available
-            check_7z = "command -v 7z || command -v 7za"
-            success, seven_zip_path, _ = await ssh_manager.execute_command(check_7z)
-            if not seven_zip_path.strip():
-                extract_cmd = f"7za x -y -o{extract_dir} {archive_file} 2>/dev/null || 7zr x -y -o{extract_dir} {archive_file}"
+        if not streamed_extract:
+            # Extract archive (support zip, tar.gz, tar, 7z); directory creation and
+            # extractor detection run in the same command
+            await progress(f"Extracting {archive_type} archive...")
+            if archive_type == 'zip':
+                extract_cmd = f"unzip -o {archive_file} -d {extract_dir}"
+            elif archive_type == '7z':
+                extract_cmd = (
+                    f"if command -v 7z >/dev/null; then 7z x -y -o{extract_dir} {archive_file}; "
+                    f"else 7za x -y -o{extract_dir} {archive_file} 2>/dev/null || 7zr x -y -o{extract_dir} {archive_file}; fi"
+                )
             else:
-                extract_cmd = f"7z x -y -o{extract_dir} {archive_file}"
-        else:
-            extract_cmd = f"tar -xzf {archive_file} -C {extract_dir} 2>/dev/null || tar -xf {archive_file} -C {extract_dir}"
-        
-        success, _, stderr = await ssh_manager.execute_command(extract_cmd, timeout=120)
+                extract_cmd = f"tar -xzf {archive_file} -C {extract_dir} 2>/dev/null || tar -xf {archive_file} -C {extract_dir}"
+            extract_cmd = f"mkdir -p {extract_dir} && {{ {extract_cmd}; }}"
+            
+            success, _, stderr = await ssh_manager.execute_command(extract_cmd, timeout=120)
         
-        if not success:
-            await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
-            await progress(f"Failed to extract archive: {stderr}", "error")
-            return GitHubPluginInstallResponse(
-                success=False,
-                message=f"Failed to extract archive: {stderr}"
-            )
+            if not success:
+                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
+                await progress(f"Failed to extract archive: {stderr}", "error")
+                return GitHubPluginInstallResponse(
+                    success=False,
+                    message=f"Failed to extract archive: {stderr}"
+                )
         
-        await progress("Extraction complete, analyzing archive structure...")
+            await progress("Extraction complete, analyzing archive structure...")
         
-        # Check if addons directory exists in extracted content
-        addons_check = f"test -d {extract_dir}/addons && echo 'addons_found'"
-        success, addons_output, _ = await ssh_manager.execute_command(addons_check)
+        # Check if addons directory exists in extracted content, falling back to a
+        # subdirectory search in the same round-trip. The layout of a release asset
+        # never changes, so a previous detection lets us skip the remote check.
+        layout_cache_key = f"archive_layout:{hashlib.sha256(request.download_url.encode()).hexdigest()}"
+        cached_layout = await redis_manager.get(layout_cache_key)
+        if isinstance(cached_layout, dict) and "addons_subdir" in cached_layout:
+            addons_subdir = cached_layout["addons_subdir"]
+            logger.info(f"Using cached archive layout for {request.download_url}: {addons_subdir!r}")
+            if addons_subdir is None:
+                addons_output = ""
+            elif addons_subdir == "":
+                addons_output = "addons_found"
+            else:
+                addons_output = f"{extract_dir}/{addons_subdir}/addons"
+        else:
+            addons_check = (
+                f"if test -d {extract_dir}/addons; then echo 'addons_found'; "
+                f"else find {extract_dir} -maxdepth 2 -type d -name 'addons' 2>/dev/null | head -1; fi"
+            )
+            success, addons_output, _ = await ssh_manager.execute_command(addons_check, combine_stderr=True)
+            if success:
+                if 'addons_found' in addons_output:
+                    addons_subdir = ""
+                elif addons_output.strip().startswith(f"{extract_dir}/"):
+                    addons_subdir = addons_output.strip()[len(extract_dir) + 1:].rsplit('/addons', 1)[0]
+                else:
+                    addons_subdir = None
+                await redis_manager.set(
+                    layout_cache_key, {"addons_subdir": addons_subdir}, expire=ARCHIVE_LAYOUT_CACHE_TTL
+                )
         has_addons = 'addons_found' in addons_output
         
         # Determine source directory for copy
@@ -760,8 +1258,7 @@ async def install_github_plugin(
             await progress("Found addons/ directory at root level")
         else:
             # Check if there's a single subdirectory that contains addons
-            find_cmd = f"find {extract_dir} -maxdepth 2 -type d -name 'addons' | head -1"
-            success, find_output, _ = await ssh_manager.execute_command(find_cmd)
+            find_output = addons_output
             
             if find_output.strip():
                 # Found addons in subdirectory
@@ -771,10 +1268,9 @@ async def install_github_plugin(
             elif request.custom_install_path:
                 # No addons directory found, but custom install path is specified
                 # Extract to the custom path (e.g., 'addons')
-                safe_custom_path = request.custom_install_path.strip().strip('/')
-                
                 # Validate custom path to prevent path traversal
-                if '..' in safe_custom_path or safe_custom_path.startswith('/'):
+                safe_custom_path = safe_relative_path(request.custom_install_path)
+                if safe_custom_path is None:
                     await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
                     error_msg = "Invalid custom install path specified"
                     await progress(error_msg, "error")
@@ -784,59 +1280,20 @@ async def install_github_plugin(
                     )
                 
                 # Build exclusion patterns for files and directories
-                exclude_raw_patterns = []
-                
-                # Exclude specified files (new preferred method)
-                for exclude_file in request.exclude_files:
-                    # Sanitize file path
-                    safe_file = exclude_file.strip().strip('/')
-                    if safe_file and '..' not in safe_file:
-                        exclude_raw_patterns.append(safe_file)
-                
-                # Also support excluding directories for backward compatibility
-                for exclude_dir in request.exclude_dirs:
-                    # Sanitize directory name
-                    safe_dir = exclude_dir.strip().strip('/')
-                    if safe_dir and '..' not in safe_dir:
-                        exclude_raw_patterns.append(safe_dir)
-                        exclude_raw_patterns.append(f'{safe_dir}/')
-                        exclude_raw_patterns.append(f'{safe_dir}/*')
-                
+                exclude_raw_patterns = build_exclude_patterns(request.exclude_files, request.exclude_dirs)
                 if exclude_raw_patterns:
-                    exclude_count = len(request.exclude_files) + len(request.exclude_dirs)
-                    await progress(f"Excluding {exclude_count} item(s) from installation")
+                    await progress(f"Excluding {len(exclude_raw_patterns)} item(s) from installation")
                 
-                # Create the target directory structure
+                # Create the target directory, copy with exclusions and clean up in one call
                 target_custom_dir = f"{csgo_dir}/{safe_custom_path}"
-                mkdir_cmd = f"mkdir -p {target_custom_dir}"
-                await ssh_manager.execute_command(mkdir_cmd)
-                
-                # Copy with exclusions
-                rsync_check = "command -v rsync"
-                success_check, rsync_path, _ = await ssh_manager.execute_command(rsync_check)
-                
-                if rsync_path.strip():
-                    # Use rsync for better control
-                    rsync_excludes = ''
-                    if exclude_raw_patterns:
-                        for pattern in exclude_raw_patterns:
-                            rsync_excludes += f' --exclude="{pattern}"'
-                        await progress(f"Applying {len(exclude_raw_patterns)} exclusion pattern(s)")
-                    copy_cmd = f'rsync -av{rsync_excludes} "{extract_dir}/" "{target_custom_dir}/"'
-                else:
-                    # Fallback to cp with tar for exclusions
-                    if exclude_raw_patterns:
-                        tar_excludes = ' '.join([f'--exclude="{p}"' for p in exclude_raw_patterns])
-                        copy_cmd = f'cd "{extract_dir}" && tar {tar_excludes} -cf - . | tar -xf - -C "{target_custom_dir}"'
-                        await progress(f"Using tar with {len(exclude_raw_patterns)} exclusion pattern(s)")
-                    else:
-                        copy_cmd = f'cp -r "{extract_dir}"/* "{target_custom_dir}/"'
-                
-                logger.info(f"Custom path copy command: {copy_cmd}")
-                success, _, stderr = await ssh_manager.execute_command(copy_cmd)
+                copy_script = build_copy_script(
+                    extract_dir, target_custom_dir, exclude_raw_patterns,
+                    cleanup_dir=remote_temp_dir
+                )
+                logger.info(f"Custom path copy script: {copy_script}")
+                success, copy_output, stderr = await ssh_manager.execute_command(copy_script, timeout=120)
                 
                 if not success:
-                    await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
                     error_msg = f"Failed to copy files to custom path: {stderr}"
                     await progress(error_msg, "error")
                     return GitHubPluginInstallResponse(
@@ -846,13 +1303,8 @@ async def install_github_plugin(
                 
                 await progress(f"Extracted to custom path: {safe_custom_path}")
                 
-                # Cleanup and return success
-                await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
-                
-                # Count files after installation
-                count_after_cmd = f"find {csgo_dir}/addons -type f 2>/dev/null | wc -l"
-                _, count_after, _ = await ssh_manager.execute_command(count_after_cmd)
-                count_after = int(count_after.strip()) if count_after.strip().isdigit() else 0
+                # Files installed
+                count_after = parse_installed_count(copy_output)
                 
                 await progress(f"Installation complete! Custom path used: {safe_custom_path}", "success")
                 
@@ -872,69 +1324,21 @@ async def install_github_plugin(
                 )
         
         # Build exclusion patterns for files and directories
-        exclude_raw_patterns = []
-        
-        # Exclude specified files (new preferred method)
-        for exclude_file in request.exclude_files:
-            # Sanitize file path
-            safe_file = exclude_file.strip().strip('/')
-            if safe_file and '..' not in safe_file:
-                exclude_raw_patterns.append(safe_file)
-        
-        # Also support excluding directories for backward compatibility
-        for exclude_dir in request.exclude_dirs:
-            # Sanitize directory name
-            safe_dir = exclude_dir.strip().strip('/')
-            if safe_dir and '..' not in safe_dir:
-                exclude_raw_patterns.append(safe_dir)
-                exclude_raw_patterns.append(f'{safe_dir}/')
-                exclude_raw_patterns.append(f'{safe_dir}/*')
-        
+        exclude_raw_patterns = build_exclude_patterns(request.exclude_files, request.exclude_dirs)
         if exclude_raw_patterns:
-            exclude_count = len(request.exclude_files) + len(request.exclude_dirs)
-            await progress(f"Excluding {exclude_count} item(s) from installation")
-        
-        # Count files before copy
-        count_before_cmd = f"find {csgo_dir}/addons -type f 2>/dev/null | wc -l"
-        _, count_before, _ = await ssh_manager.execute_command(count_before_cmd)
-        count_before = int(count_before.strip()) if count_before.strip().isdigit() else 0
+            await progress(f"Excluding {len(exclude_raw_patterns)} item(s) from installation")
         
         await progress("Installing plugin files...")
         
-        # Copy files using rsync for better control
-        rsync_check = "command -v rsync"
-        success, rsync_path, _ = await ssh_manager.execute_command(rsync_check)
-        
-        if rsync_path.strip():
-            # Use rsync for better control
-            # Build exclude arguments properly for rsync
-            rsync_excludes = ''
-            if exclude_raw_patterns:
-                for pattern in exclude_raw_patterns:
-                    rsync_excludes += f' --exclude="{pattern}"'
-                await progress(f"Applying {len(exclude_raw_patterns)} exclusion pattern(s)")
-            copy_cmd = f'rsync -av{rsync_excludes} "{source_dir}/" "{csgo_dir}/"'
-        else:
-            # Fallback to cp with tar for exclusions
-            if exclude_raw_patterns:
-                tar_excludes = ' '.join([f'--exclude="{p}"' for p in exclude_raw_patterns])
-                copy_cmd = f'cd "{source_dir}" && tar {tar_excludes} -cf - . | tar -xf - -C "{csgo_dir}"'
-                await progress(f"Using tar with {len(exclude_raw_patterns)} exclusion pattern(s)")
-            else:
-                copy_cmd = f'cp -r "{source_dir}"/* "{csgo_dir}/"'
-        
-        logger.info(f"Copy command: {copy_cmd}")
-        success, copy_output, stderr = await ssh_manager.execute_command(copy_cmd, timeout=120)
-        
-        # Count files after copy
-        count_after_cmd = f"find {csgo_dir}/addons -type f 2>/dev/null | wc -l"
-        _, count_after, _ = await ssh_manager.execute_command(count_after_cmd)
-        count_after = int(count_after.strip()) if count_after.strip().isdigit() else 0
-        
-        installed_files = count_after - count_before if count_after > count_before else 0
+        # Copy (rsync or tar/cp fallback), count installed files and clean up in one round-trip
+        copy_script = build_copy_script(
+            source_dir, csgo_dir, exclude_raw_patterns,
+            cleanup_dir=remote_temp_dir
+        )
+        logger.info(f"Copy script: {copy_script}")
+        success, copy_output, stderr = await ssh_manager.execute_command(copy_script, timeout=120)
         
-        # Cleanup - use the correct temp directory
-        await ssh_manager.execute_command(f"rm -rf {remote_temp_dir}")
+        installed_files = parse_installed_count(copy_output)
         await progress("Cleanup complete")
         
         if not success:
@@ -962,7 +1366,91 @@ async def install_github_plugin(
             message=f"Installation error: {str(e)}"
         )
     finally:
-        await ssh_manager.disconnect()
+        if owns_connection:
+            await ssh_manager.disconnect()
+        await progress.flush()
+
+
+async def _analyze_installed_directory(ssh_manager: SSHManager, csgo_dir: str, directory: str):
+    """
+    List the files and directories below one directory of an installed server.
+    
+    Args:
+        ssh_manager: Connected SSH manager
+        csgo_dir: Absolute path of the server's csgo directory
+        directory: Directory to analyze, relative to csgo_dir
+    
+    Returns:
+        InstalledPluginAnalysisResponse for the directory
+    """
+    from modules import InstalledPluginAnalysisResponse, InstalledPluginFile
+    
+    # Sanitize directory input
+    safe_dir = safe_relative_path(directory)
+    if safe_dir is None:
+        return InstalledPluginAnalysisResponse(
+            success=False,
+            error="Invalid directory path"
+        )
+    
+    target_dir = f"{csgo_dir}/{safe_dir}"
+    
+    # Check the directory, then list every entry as "type<TAB>size<TAB>relative path"
+    # with a single find (no per-file ls fork), in one round-trip
+    analysis_script = (
+        f"test -d {target_dir} || {{ echo '{MISSING_SENTINEL}'; exit 0; }}\n"
+        f"find {target_dir} -mindepth 1 -printf '%y\\t%s\\t%P\\n' 2>/dev/null\n"
+        f"exit 0"
+    )
+    success, script_output, stderr = await ssh_manager.execute_command(analysis_script, timeout=30)
+    
+    if MISSING_SENTINEL in script_output:
+        return InstalledPluginAnalysisResponse(
+            success=False,
+            error=f"Directory {safe_dir} does not exist"
+        )
+    
+    if not success:
+        return InstalledPluginAnalysisResponse(
+            success=False,
+            error=f"Failed to list files: {stderr}"
+        )
+    
+    files = []
+    dirs = []
+    total_size = 0
+    
+    for line in script_output.splitlines():
+        entry_type, _, rest = line.partition('\t')
+        size, _, path = rest.partition('\t')
+        if not path:
+            continue
+        
+        # Make path relative to csgo directory
+        full_path = f"{safe_dir}/{path}"
+        if entry_type == 'f':
+            size = int(size) if size.isdigit() else 0
+            files.append(InstalledPluginFile(
+                path=full_path,
+                size=size,
+                is_dir=False
+            ))
+            total_size += size
+        elif entry_type == 'd':
+            dirs.append(InstalledPluginFile(
+                path=full_path,
+                size=0,
+                is_dir=True
+            ))
+    
+    # Files first, then directories
+    files.extend(dirs)
+    
+    return InstalledPluginAnalysisResponse(
+        success=True,
+        files=files,
+        total_size=total_size
+    )
 
 
 @router.get("/servers/{server_id}/analyze-installed-plugins")
@@ -982,7 +1470,7 @@ async def analyze_installed_plugins(
     Returns:
         List of installed files and directories
     """
-    from modules import InstalledPluginAnalysisResponse, InstalledPluginFile
+    from modules import InstalledPluginAnalysisResponse
     
     server = await get_server_and_verify_ownership(db, server_id, current_user)
     
@@ -995,93 +1483,78 @@ async def analyze_installed_plugins(
         )
     
     try:
-        # Sanitize directory input
-        safe_dir = directory.strip().strip('/')
-        if '..' in safe_dir or safe_dir.startswith('/'):
-            return InstalledPluginAnalysisResponse(
-                success=False,
-                error="Invalid directory path"
-            )
-        
         csgo_dir = f"{server.game_directory}/cs2/game/csgo"
-        target_dir = f"{csgo_dir}/{safe_dir}"
-        
-        # Check if directory exists
-        check_cmd = f"test -d {target_dir} && echo 'exists'"
-        success, output, _ = await ssh_manager.execute_command(check_cmd)
-        
-        if 'exists' not in output:
-            return InstalledPluginAnalysisResponse(
-                success=False,
-                error=f"Directory {safe_dir} does not exist"
-            )
-        
-        # List all files and directories with sizes
-        # Use find to get all files and directories recursively
-        list_cmd = f"cd {target_dir} && find . -type f -exec ls -l {{}} \\; 2>/dev/null | awk '{{print $5 \" \" $9}}' || find . -type f 2>/dev/null"
-        success, output, stderr = await ssh_manager.execute_command(list_cmd, timeout=30)
-        
-        if not success:
-            return InstalledPluginAnalysisResponse(
-                success=False,
-                error=f"Failed to list files: {stderr}"
-            )
-        
-        files = []
-        total_size = 0
-        
-        if output.strip():
-            for line in output.strip().split('\n'):
-                line = line.strip()
-                if not line or line == '.':
-                    continue
-                
-                # Try to parse size and path
-                parts = line.split(None, 1)
-                if len(parts) == 2 and parts[0].isdigit():
-                    size = int(parts[0])
-                    path = parts[1].strip().lstrip('./')
-                else:
-                    # Fallback if no size info
-                    size = 0
-                    path = line.lstrip('./')
-                
-                if path:
-                    # Make path relative to csgo directory
-                    full_path = f"{safe_dir}/{path}"
-                    files.append(InstalledPluginFile(
-                        path=full_path,
-                        size=size,
-                        is_dir=False
-                    ))
-                    total_size += size
+        return await _analyze_installed_directory(ssh_manager, csgo_dir, directory)
         
-        # Also get directories
-        dir_cmd = f"cd {target_dir} && find . -type d 2>/dev/null | grep -v '^\\.\\?$' || echo ''"
-        success, dir_output, _ = await ssh_manager.execute_command(dir_cmd, timeout=30)
+    except Exception as e:
+        logger.error(f"Error analyzing installed plugins: {e}")
+        return InstalledPluginAnalysisResponse(
+            success=False,
+            error=f"Error analyzing plugins: {str(e)}"
+        )
+    finally:
+        await ssh_manager.disconnect()
+
+
+@router.post("/servers/{server_id}/analyze-installed-plugins/batch")
+async def analyze_installed_plugins_batch(
+    server_id: int,
+    request: InstalledPluginBatchAnalysisRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Analyze several installed plugin directories in one request.
+    
+    The listings run concurrently as separate exec channels on the server's
+    pooled SSH connection, so the wall time is roughly that of the slowest
+    directory rather than the sum of all of them.
+    
+    Args:
+        server_id: Server ID
+        request: Directories to analyze (relative to csgo directory)
+    
+    Returns:
+        Per-directory analysis results keyed by the requested directory
+    """
+    from modules import InstalledPluginAnalysisResponse, InstalledPluginBatchAnalysisResponse
+    
+    server = await get_server_and_verify_ownership(db, server_id, current_user)
+    
+    ssh_manager = SSHManager()
+    success, msg = await ssh_manager.connect(server)
+    if not success:
+        return InstalledPluginBatchAnalysisResponse(
+            success=False,
+            error=f"SSH connection failed: {msg}"
+        )
+    
+    try:
+        csgo_dir = f"{server.game_directory}/cs2/game/csgo"
+        directories = list(dict.fromkeys(request.directories))
+        analyses = await asyncio.gather(
+            *(_analyze_installed_directory(ssh_manager, csgo_dir, d) for d in directories),
+            return_exceptions=True
+        )
         
-        if success and dir_output.strip():
-            for line in dir_output.strip().split('\n'):
-                path = line.strip().lstrip('./')
-                if path:
-                    full_path = f"{safe_dir}/{path}"
-                    # Only add if not already in files list
-                    if not any(f.path == full_path for f in files):
-                        files.append(InstalledPluginFile(
-                            path=full_path,
-                            size=0,
-                            is_dir=True
-                        ))
+        results = {}
+        for directory, analysis in zip(directories, analyses):
+            if isinstance(analysis, Exception):
+                logger.error(f"Error analyzing installed plugins in {directory}: {analysis}")
+                analysis = InstalledPluginAnalysisResponse(
+                    success=False,
+                    error=f"Error analyzing plugins: {str(analysis)}"
+                )
+            results[directory] = analysis
         
-        return InstalledPluginAnalysisResponse(
+        return InstalledPluginBatchAnalysisResponse(
             success=True,
-            files=files,
-            total_size=total_size
+            results=results
         )
         
     except Exception as e:
         logger.error(f"Error analyzing installed plugins: {e}")
-        return InstalledPluginAnalysisResponse(
+        return InstalledPluginBatchAnalysisResponse(
             success=False,
             error=f"Error analyzing plugins: {str(e)}"
         )
@@ -1110,14 +1583,13 @@ async def uninstall_plugin(
     
     server = await get_server_and_verify_ownership(db, server_id, current_user)
     
-    async def progress(msg: str, msg_type: str = "status"):
-        """Send progress update via WebSocket"""
-        await send_deployment_update(server_id, msg_type, msg)
+    progress = QueuedProgress(server_id, send_deployment_update)
     
     ssh_manager = SSHManager()
     success, msg = await ssh_manager.connect(server)
     if not success:
         await progress(f"SSH connection failed: {msg}", "error")
+        await progress.flush()
         return PluginUninstallResponse(
             success=False,
             message=f"SSH connection failed: {msg}"
@@ -1130,18 +1602,46 @@ async def uninstall_plugin(
         deleted_count = 0
         failed_files = []
         
-        for file_path in request.files_to_delete:
-            # Build absolute path
-            full_path = f"{csgo_dir}/{file_path}"
-            
-            # Delete file or directory
-            delete_cmd = f"rm -rf '{full_path}'"
-            success, _, stderr = await ssh_manager.execute_command(delete_cmd)
-            
-            if success:
+        # Delete everything in one round-trip: the NUL-separated path list is passed
+        # base64-encoded and fanned out to parallel processes, each reporting OK/FAIL.
+        # Paths are only renamed into a per-call trash directory (instant on the same
+        # filesystem); the actual rm -rf runs detached, so huge trees don't hold the
+        # exec open until the timeout. The same detached job also sweeps stale batches
+        # whose rm was interrupted (reboot, OOM, session teardown).
+        paths_b64 = base64.b64encode('\0'.join(request.files_to_delete).encode()).decode()
+        trash_root = shlex.quote(f"{server.game_directory}/{UNINSTALL_TRASH_DIRNAME}")
+        delete_script = (
+            f"cd {shlex.quote(csgo_dir)} || exit 1\n"
+            f"mkdir -p {trash_root} && batch=$(mktemp -d -p {trash_root}) || exit 1\n"
+            f"export batch\n"
+            f"echo '{paths_b64}' | base64 -d | xargs -0 -r -n1 -P{UNINSTALL_PARALLELISM} "
+            f"""sh -c 'if [ ! -e "$1" ] && [ ! -L "$1" ]; then echo "OK:$1"; """
+            f"""elif d=$(mktemp -d -p "$batch") && mv -- "$1" "$d/"; then echo "OK:$1"; """
+            # A parallel worker may already have moved a selected parent directory
+            f"""elif [ ! -e "$1" ] && [ ! -L "$1" ]; then echo "OK:$1"; """
+            f"""else echo "FAIL:$1"; fi' _\n"""
+            f"nohup sh -c 'rm -rf -- \"$1\"; "
+            f"""find "$2" -mindepth 1 -maxdepth 1 -mmin +{UNINSTALL_TRASH_MAX_AGE_MINUTES} -exec rm -rf -- {{}} +' """
+            f"_ \"$batch\" {trash_root} </dev/null >/dev/null 2>&1 &\n"
+            f"exit 0"
+        )
+        success, delete_output, stderr = await ssh_manager.execute_command(delete_script, timeout=120)
+        
+        reported = set()
+        for line in delete_output.splitlines():
+            status, _, file_path = line.partition(':')
+            if status == 'OK':
                 deleted_count += 1
+                reported.add(file_path)
                 await progress(f"Deleted: {file_path}")
-            else:
+            elif status == 'FAIL':
+                failed_files.append(file_path)
+                reported.add(file_path)
+                await progress(f"Failed to delete: {file_path}", "warning")
+        
+        # Paths without a result line were never processed (e.g. the command itself failed)
+        for file_path in request.files_to_delete:
+            if file_path not in reported:
                 failed_files.append(file_path)
                 await progress(f"Failed to delete: {file_path} - {stderr}", "warning")
         
@@ -1169,4 +1669,5 @@ async def uninstall_plugin(
         )
     finally:
         await ssh_manager.disconnect()
+        await progress.flush()
 
@@ -5,7 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+from functools import lru_cache
 import json
+import orjson
 import logging
 
 from modules import (
@@ -18,6 +20,31 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/gmail-oauth", tags=["gmail-oauth"])
 
 
+# (credentials_configured, token_configured), or None until first read / after a write
+_gmail_status_cache: Optional[tuple[bool, bool]] = None
+
+
+def invalidate_gmail_status_cache() -> None:
+    """Drop the cached OAuth status; call after writing Gmail credentials or token"""
+    global _gmail_status_cache
+    _gmail_status_cache = None
+
+
+@lru_cache(maxsize=4)
+def _load_credentials_info(credentials_json: str) -> dict:
+    """
+    Parse the stored Gmail client credentials JSON.
+    
+    Cached by content, so the authorize/callback pair parses it once and an
+    upload of new credentials is picked up automatically. Callers must not
+    mutate the returned dict.
+    
+    Raises:
+        json.JSONDecodeError: If the JSON is invalid
+    """
+    return orjson.loads(credentials_json)
+
+
 @router.get("/authorize")
 async def gmail_oauth_authorize(
     request: Request,
@@ -44,7 +71,7 @@ async def gmail_oauth_authorize(
         
         # Parse credentials JSON
         try:
-            credentials_info = json.loads(sys_settings.gmail_credentials_json)
+            credentials_info = _load_credentials_info(sys_settings.gmail_credentials_json)
         except json.JSONDecodeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -129,7 +156,7 @@ async def gmail_oauth_callback(
             )
         
         # Parse credentials JSON
-        credentials_info = json.loads(sys_settings.gmail_credentials_json)
+        credentials_info = _load_credentials_info(sys_settings.gmail_credentials_json)
         
         # Create OAuth flow
         flow = Flow.from_client_config(
@@ -155,9 +182,10 @@ async def gmail_oauth_callback(
         }
         
         # Save token to database
-        sys_settings.gmail_token_json = json.dumps(token_data)
+        sys_settings.gmail_token_json = orjson.dumps(token_data).decode()
         db.add(sys_settings)
         await db.commit()
+        invalidate_gmail_status_cache()
         
         logger.info("Gmail OAuth token saved successfully")
         
@@ -189,8 +217,8 @@ async def upload_gmail_credentials(
         request: Request body containing the credentials JSON
     """
     try:
-        # Validate JSON format
-        credentials_data = json.loads(request.credentials_json)
+        # Validate JSON format (orjson's decode error subclasses json.JSONDecodeError)
+        credentials_data = orjson.loads(request.credentials_json)
         
         # Verify it has the expected structure
         if 'web' not in credentials_data and 'installed' not in credentials_data:
@@ -206,6 +234,7 @@ async def upload_gmail_credentials(
         sys_settings.gmail_credentials_json = request.credentials_json
         db.add(sys_settings)
         await db.commit()
+        invalidate_gmail_status_cache()
         
         return {
             "success": True,
@@ -241,6 +270,7 @@ async def revoke_gmail_authorization(
         sys_settings.gmail_token_json = None
         db.add(sys_settings)
         await db.commit()
+        invalidate_gmail_status_cache()
         
         return {
             "success": True,
@@ -263,13 +293,21 @@ async def gmail_oauth_status(
     """
     Check Gmail OAuth configuration status (admin only)
     """
+    global _gmail_status_cache
     try:
-        sys_settings = await SystemSettings.get_or_create_settings(db)
+        # Settings UIs poll this; only hit the database after a write invalidated the cache
+        if _gmail_status_cache is None:
+            sys_settings = await SystemSettings.get_or_create_settings(db)
+            _gmail_status_cache = (
+                bool(sys_settings.gmail_credentials_json),
+                bool(sys_settings.gmail_token_json)
+            )
+        credentials_configured, token_configured = _gmail_status_cache
         
         return {
-            "credentials_configured": bool(sys_settings.gmail_credentials_json),
-            "token_configured": bool(sys_settings.gmail_token_json),
-            "ready": bool(sys_settings.gmail_credentials_json and sys_settings.gmail_token_json)
+            "credentials_configured": credentials_configured,
+            "token_configured": token_configured,
+            "ready": credentials_configured and token_configured
         }
         
     except Exception as e:
@@ -2,9 +2,12 @@
 Plugin Market routes
 Provides endpoints for browsing, searching, and installing plugins from the market
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+import asyncio
 import re
 import logging
 
@@ -15,9 +18,16 @@ from modules import (
     MarketPluginListResponse, GitHubRepoInfo, ActionResponse,
     Server, GitHubPluginInstallRequest, GitHubPluginInstallResponse,
     PluginUninstallRequest,
-    DependencyInfo
+    DependencyInfo,
+    MarketPluginBatchInstallRequest, MarketPluginBatchInstallResult, MarketPluginBatchInstallResponse
+)
+from modules.github_cache import github_api_cache
+from services import redis_manager
+from api.routes.github_plugins import (
+    ARCHIVE_EXTENSION_PATTERN, WINDOWS_ASSET_PATTERN,
+    get_github_releases, run_github_plugin_install, uninstall_plugin,
+    analyze_archive as analyze_github_archive
 )
-from modules.http_helper import http_helper
 
 router = APIRouter(prefix="/api/plugin-market", tags=["plugin-market"])
 
@@ -25,9 +35,76 @@ logger = logging.getLogger(__name__)
 
 # Regex to validate GitHub repository URL (supports both https and git formats)
 GITHUB_REPO_PATTERN = re.compile(
-    r'^(?:https://github\.com/|git@github\.com:)([a-zA-Z0-9_.-]+)/([a-zA-Z0-9_.-]+?)(?:\.git)?(?:/.*)?$'
+    r'^(?:https://github\.com/|git@github\.com:)([a-zA-Z0-9_.-]+)/([a-zA-Z0-9_.-]+?)(?:\.git)?(?:/.*)?$',
+    re.ASCII
 )
 
+# Request headers shared by all GitHub API calls (read-only; http_helper copies them)
+GITHUB_API_HEADERS = MappingProxyType({
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "CS2-ServerManager"
+})
+
+# Prefix handled by the parse_github_url fast path
+GITHUB_HTTPS_PREFIX = "https://github.com/"
+# Characters besides ASCII letters and digits allowed in owner/repo names
+GITHUB_NAME_EXTRA_CHARS = frozenset('_.-')
+
+# Comma-separated plugin IDs; whitespace and empty entries (e.g. a trailing comma) are allowed
+DEPENDENCY_IDS_PATTERN = re.compile(r'\s*(?:\d+\s*)?(?:,\s*(?:\d+\s*)?)*', re.ASCII)
+
+# README prefix decoded for the auto-filled description, and markdown header lines to drop
+README_WINDOW_BYTES = 4096
+MARKDOWN_HEADER_PATTERN = re.compile(r'^[ \t]*#.*$', re.MULTILINE)
+
+# Plugin categories, computed once: valid values, the error hint listing them,
+# and the /categories payload
+CATEGORY_VALUES = frozenset(c.value for c in PluginCategory)
+CATEGORY_VALUES_STR = ', '.join(c.value for c in PluginCategory)
+CATEGORY_LIST = [
+    {"value": c.value, "name": c.value.replace("_", " ").title()}
+    for c in PluginCategory
+]
+
+# Response cache for the market list/detail endpoints. Every key embeds the current
+# generation number, so bumping it on any market change invalidates all entries at once.
+MARKET_CACHE_GENERATION_KEY = "plugin_market:generation"
+MARKET_CACHE_TTL = 30  # seconds
+
+# Error returned by fetch_latest_asset_url when the latest release has no usable asset
+NO_SUITABLE_ASSET_ERROR = "No suitable release asset found for installation"
+
+
+def json_body_response(body: str) -> Response:
+    """Wrap an already serialized JSON body in a response"""
+    return Response(content=body, media_type="application/json")
+
+
+async def get_market_cache_key(*parts) -> str:
+    """Build a market response cache key for the current cache generation"""
+    generation = await redis_manager.get(MARKET_CACHE_GENERATION_KEY) or 0
+    return f"plugin_market:{generation}:" + ":".join(str(part) for part in parts)
+
+
+async def invalidate_market_cache() -> None:
+    """Invalidate all cached market list/detail responses"""
+    await redis_manager.incr(MARKET_CACHE_GENERATION_KEY)
+
+
+def parse_category(category: str) -> PluginCategory:
+    """
+    Convert a category value to PluginCategory.
+    
+    Raises:
+        HTTPException: If the category is not valid
+    """
+    if category not in CATEGORY_VALUES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid category. Valid categories: {CATEGORY_VALUES_STR}"
+        )
+    return PluginCategory(category)
+
 
 async def get_server_for_user(server_id: int, db: AsyncSession, current_user: User) -> Server:
     """Helper to get server and verify ownership - admins can access any server"""
@@ -44,10 +121,17 @@ async def get_server_for_user(server_id: int, db: AsyncSession, current_user: Us
     return server
 
 
+def _is_github_name(name: str) -> bool:
+    """Check that an owner/repo name only uses characters GITHUB_REPO_PATTERN accepts"""
+    return name.isascii() and all(c.isalnum() or c in GITHUB_NAME_EXTRA_CHARS for c in name)
+
+
+@lru_cache(maxsize=1024)
 def parse_github_url(url: str) -> tuple[str, str]:
     """
     Parse GitHub repository URL to extract owner and repo name.
-    Supports both https:// and git@ formats.
+    Supports both https:// and git@ formats. Results are memoized, since the same
+    market plugin URLs are parsed on every install and archive analysis.
     
     Args:
         url: GitHub repository URL
@@ -58,6 +142,16 @@ def parse_github_url(url: str) -> tuple[str, str]:
     Raises:
         ValueError: If URL is invalid
     """
+    # Fast path for the common https://github.com/owner/repo[.git][/...] form;
+    # anything else (git@ URLs, unusual names) goes through the regex
+    if url.startswith(GITHUB_HTTPS_PREFIX):
+        owner, _, rest = url[len(GITHUB_HTTPS_PREFIX):].partition('/')
+        repo = rest.partition('/')[0]
+        if repo.endswith('.git'):
+            repo = repo[:-4]
+        if owner and repo and _is_github_name(owner) and _is_github_name(repo):
+            return owner, repo
+    
     match = GITHUB_REPO_PATTERN.match(url)
     if not match:
         raise ValueError("Invalid GitHub repository URL format")
@@ -80,16 +174,15 @@ def parse_dependency_ids(dependencies: Optional[str]) -> list[int]:
     if not dependencies:
         return []
     
-    dep_ids = []
-    for dep in dependencies.split(','):
-        dep = dep.strip()
-        if not dep:
-            continue
-        if not dep.isdigit():
-            raise ValueError(f"Invalid dependency ID: {dep}")
-        dep_ids.append(int(dep))
+    if not DEPENDENCY_IDS_PATTERN.fullmatch(dependencies):
+        # Slow path only to name the offending entry in the error
+        for dep in dependencies.split(','):
+            dep = dep.strip()
+            if dep and not (dep.isascii() and dep.isdigit()):
+                raise ValueError(f"Invalid dependency ID: {dep}")
+        raise ValueError(f"Invalid dependency list: {dependencies}")
     
-    return dep_ids
+    return [int(dep) for dep in dependencies.split(',') if dep.strip()]
 
 
 async def validate_dependencies(db: AsyncSession, dependency_ids: list[int]) -> None:
@@ -103,15 +196,71 @@ async def validate_dependencies(db: AsyncSession, dependency_ids: list[int]) ->
     Raises:
         HTTPException: If any dependency plugin is not found
     """
+    existing = await MarketPlugin.get_titles_by_ids(db, dependency_ids)
     for dep_id in dependency_ids:
-        dep_plugin = await MarketPlugin.get_by_id(db, dep_id)
-        if not dep_plugin:
+        if dep_id not in existing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Dependency plugin with ID {dep_id} not found"
             )
 
 
+async def resolve_install_order(db: AsyncSession, roots: List[MarketPlugin]) -> List[MarketPlugin]:
+    """
+    Resolve the transitive dependencies of the given plugins into an install order.
+    
+    The dependency graph is loaded breadth-first with one query per level, then
+    sorted so every plugin comes after its dependencies. Each plugin appears once;
+    dependencies that no longer exist are skipped and cycles are broken (logged).
+    
+    Args:
+        db: Database session
+        roots: Plugins requested for installation
+    
+    Returns:
+        Roots and all their dependencies, dependencies first
+    """
+    plugins = {plugin.id: plugin for plugin in roots}
+    dependencies = {}
+    frontier = list(plugins.values())
+    while frontier:
+        next_ids = []
+        for plugin in frontier:
+            try:
+                dependencies[plugin.id] = parse_dependency_ids(plugin.dependencies)
+            except ValueError as e:
+                logger.error(f"Error parsing dependencies of plugin {plugin.id}: {e}")
+                dependencies[plugin.id] = []
+            next_ids.extend(dep_id for dep_id in dependencies[plugin.id] if dep_id not in plugins)
+        frontier = await MarketPlugin.get_by_ids(db, next_ids)
+        for plugin in frontier:
+            plugins[plugin.id] = plugin
+    
+    # Depth-first post-order: a plugin is emitted after all of its dependencies
+    order = []
+    visiting = set()
+    done = set()
+    
+    def visit(plugin_id: int) -> None:
+        visiting.add(plugin_id)
+        for dep_id in dependencies.get(plugin_id, []):
+            if dep_id not in plugins or dep_id in done:
+                continue
+            if dep_id in visiting:
+                logger.warning(f"Dependency cycle between plugins {plugin_id} and {dep_id}, ignoring")
+                continue
+            visit(dep_id)
+        visiting.discard(plugin_id)
+        done.add(plugin_id)
+        order.append(plugins[plugin_id])
+    
+    for root in roots:
+        if root.id not in done:
+            visit(root.id)
+    
+    return order
+
+
 async def fetch_github_repo_info(github_url: str, github_proxy: Optional[str] = None, github_token: Optional[str] = None) -> GitHubRepoInfo:
     """
     Fetch repository information from GitHub API.
@@ -132,19 +281,25 @@ async def fetch_github_repo_info(github_url: str, github_proxy: Optional[str] =
             error=str(e)
         )
     
-    # Fetch repo info from GitHub API
+    # Fetch repo info and README (for the first 200 characters) from GitHub API;
+    # the two requests are independent, so they run concurrently
     api_url = f"https://api.github.com/repos/{owner}/{repo}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "CS2-ServerManager"
-    }
-    
-    success, data, error = await http_helper.get(
-        api_url,
-        headers=headers,
-        timeout=30,
-        proxy=github_proxy,
-        github_token=github_token
+    readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+    (success, data, error), (readme_success, readme_data, _) = await asyncio.gather(
+        github_api_cache.get(
+            api_url,
+            headers=GITHUB_API_HEADERS,
+            timeout=30,
+            proxy=github_proxy,
+            github_token=github_token
+        ),
+        github_api_cache.get(
+            readme_url,
+            headers=GITHUB_API_HEADERS,
+            timeout=30,
+            proxy=github_proxy,
+            github_token=github_token
+        )
     )
     
     if not success:
@@ -157,27 +312,20 @@ async def fetch_github_repo_info(github_url: str, github_proxy: Optional[str] =
     repo_name = data.get("name", repo)
     description = data.get("description", "")
     
-    # Fetch README to get first 200 characters
-    readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-    readme_success, readme_data, _ = await http_helper.get(
-        readme_url,
-        headers=headers,
-        timeout=30,
-        proxy=github_proxy,
-        github_token=github_token
-    )
-    
     if readme_success and isinstance(readme_data, dict):
         # GitHub API returns base64-encoded content
         import base64
         content = readme_data.get("content", "")
         if content:
             try:
-                decoded = base64.b64decode(content).decode('utf-8')
+                # Only the start of the README is needed; decode a bounded window
+                # (base64 decodes in 4-character groups, each yielding 3 bytes)
+                encoded = content.replace('\n', '')[:README_WINDOW_BYTES // 3 * 4]
+                decoded = base64.b64decode(encoded).decode('utf-8', 'replace')
                 # Remove markdown headers and extract first 200 chars
-                lines = [line.strip() for line in decoded.split('\n') if line.strip() and not line.strip().startswith('#')]
-                if lines:
-                    description = ' '.join(lines)[:200]
+                text = ' '.join(MARKDOWN_HEADER_PATTERN.sub('', decoded).split())
+                if text:
+                    description = text[:200]
             except Exception as e:
                 logger.warning(f"Failed to decode README: {e}")
     
@@ -203,29 +351,32 @@ async def populate_dependency_details(
     Returns:
         List of MarketPluginResponse with dependency details populated
     """
-    responses = []
-    
+    # Parse every plugin's dependency IDs first so all titles load in one query
+    plugin_dep_ids = {}
     for plugin in plugins:
-        response = MarketPluginResponse.model_validate(plugin)
-        
-        # Populate dependency details if plugin has dependencies
         if plugin.dependencies:
             try:
-                dep_ids = parse_dependency_ids(plugin.dependencies)
-                dependency_details = []
-                
-                for dep_id in dep_ids:
-                    dep_plugin = await MarketPlugin.get_by_id(db, dep_id)
-                    if dep_plugin:
-                        dependency_details.append(DependencyInfo(
-                            id=dep_plugin.id,
-                            title=dep_plugin.title
-                        ))
-                
-                response.dependency_details = dependency_details if dependency_details else None
+                plugin_dep_ids[plugin.id] = parse_dependency_ids(plugin.dependencies)
             except ValueError:
                 # Invalid dependency format, skip
                 pass
+    
+    all_dep_ids = {dep_id for dep_ids in plugin_dep_ids.values() for dep_id in dep_ids}
+    dep_titles = await MarketPlugin.get_titles_by_ids(db, all_dep_ids)
+    
+    responses = []
+    
+    for plugin in plugins:
+        response = MarketPluginResponse.model_validate(plugin)
+        
+        # Populate dependency details if plugin has dependencies
+        dependency_details = [
+            DependencyInfo(id=dep_id, title=dep_titles[dep_id])
+            for dep_id in plugin_dep_ids.get(plugin.id, [])
+            if dep_id in dep_titles
+        ]
+        if dependency_details:
+            response.dependency_details = dependency_details
         
         responses.append(response)
     
@@ -238,6 +389,7 @@ async def list_plugins(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     category: Optional[str] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search query"),
+    include: list[str] = Query(default=[], description="Optional extra data to include (dependencies)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> MarketPluginListResponse:
@@ -249,20 +401,22 @@ async def list_plugins(
         page_size: Number of items per page
         category: Optional category filter
         search: Optional search query (searches in title, description, author)
+        include: Pass "dependencies" to populate dependency_details for each plugin
     
     Returns:
         List of plugins with pagination info
     """
     # Validate category if provided
-    category_enum = None
-    if category:
-        try:
-            category_enum = PluginCategory(category)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid category. Valid categories: {', '.join([c.value for c in PluginCategory])}"
-            )
+    category_enum = parse_category(category) if category else None
+    
+    # Serve an identical recent listing from the cache (results do not depend on the user)
+    include_dependencies = "dependencies" in include
+    cache_key = await get_market_cache_key(
+        "list", page, page_size, category or "", search or "", int(include_dependencies)
+    )
+    cached_body = await redis_manager.get_raw(cache_key)
+    if cached_body:
+        return json_body_response(cached_body)
     
     # Calculate skip
     skip = (page - 1) * page_size
@@ -279,10 +433,13 @@ async def list_plugins(
     # Calculate total pages
     total_pages = (total + page_size - 1) // page_size
     
-    # Populate dependency details for each plugin
-    plugin_responses = await populate_dependency_details(db, plugins)
+    # Populate dependency details for each plugin only when requested
+    if include_dependencies:
+        plugin_responses = await populate_dependency_details(db, plugins)
+    else:
+        plugin_responses = [MarketPluginResponse.model_validate(plugin) for plugin in plugins]
     
-    return MarketPluginListResponse(
+    response = MarketPluginListResponse(
         success=True,
         plugins=plugin_responses,
         total=total,
@@ -290,6 +447,10 @@ async def list_plugins(
         page_size=page_size,
         total_pages=total_pages
     )
+    # Serialize once with pydantic-core; the same JSON body is cached and returned
+    body = response.model_dump_json()
+    await redis_manager.set(cache_key, body, expire=MARKET_CACHE_TTL)
+    return json_body_response(body)
 
 
 @router.get("/plugins/{plugin_id}", response_model=MarketPluginResponse)
@@ -307,6 +468,11 @@ async def get_plugin(
     Returns:
         Plugin details
     """
+    cache_key = await get_market_cache_key("plugin", plugin_id)
+    cached_body = await redis_manager.get_raw(cache_key)
+    if cached_body:
+        return json_body_response(cached_body)
+    
     plugin = await MarketPlugin.get_by_id(db, plugin_id)
     if not plugin:
         raise HTTPException(
@@ -316,7 +482,9 @@ async def get_plugin(
     
     # Populate dependency details
     plugin_responses = await populate_dependency_details(db, [plugin])
-    return plugin_responses[0]
+    body = plugin_responses[0].model_dump_json()
+    await redis_manager.set(cache_key, body, expire=MARKET_CACHE_TTL)
+    return json_body_response(body)
 
 
 @router.post("/plugins", response_model=MarketPluginResponse)
@@ -344,6 +512,9 @@ async def create_plugin(
             detail="Plugin with this GitHub URL already exists"
         )
     
+    # Validate category before any GitHub lookups
+    category_enum = parse_category(request.category)
+    
     # Auto-fetch repo info if title or description not provided
     title = request.title
     description = request.description
@@ -361,15 +532,6 @@ async def create_plugin(
             if not author and repo_info.author:
                 author = repo_info.author
     
-    # Validate category
-    try:
-        category_enum = PluginCategory(request.category)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid category. Valid categories: {', '.join([c.value for c in PluginCategory])}"
-        )
-    
     # Validate dependencies if provided
     if request.dependencies:
         try:
@@ -400,6 +562,7 @@ async def create_plugin(
     await db.commit()
     await db.refresh(plugin)
     
+    await invalidate_market_cache()
     logger.info(f"Plugin '{plugin.title}' added to market by admin {current_user.username}")
     
     return MarketPluginResponse.model_validate(plugin)
@@ -439,13 +602,7 @@ async def update_plugin(
     if request.version is not None:
         plugin.version = request.version
     if request.category is not None:
-        try:
-            plugin.category = PluginCategory(request.category)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid category. Valid categories: {', '.join([c.value for c in PluginCategory])}"
-            )
+        plugin.category = parse_category(request.category)
     if request.tags is not None:
         plugin.tags = request.tags
     if request.is_recommended is not None:
@@ -471,6 +628,7 @@ async def update_plugin(
     await db.commit()
     await db.refresh(plugin)
     
+    await invalidate_market_cache()
     logger.info(f"Plugin '{plugin.title}' updated by admin {current_user.username}")
     
     return MarketPluginResponse.model_validate(plugin)
@@ -502,6 +660,7 @@ async def delete_plugin(
     await db.delete(plugin)
     await db.commit()
     
+    await invalidate_market_cache()
     logger.info(f"Plugin '{plugin_title}' deleted by admin {current_user.username}")
     
     return ActionResponse(
@@ -529,8 +688,6 @@ async def get_plugin_releases(
     Returns:
         List of releases with download URLs
     """
-    from api.routes.github_plugins import get_github_releases
-    
     # Get plugin
     plugin = await MarketPlugin.get_by_id(db, plugin_id)
     if not plugin:
@@ -549,6 +706,140 @@ async def get_plugin_releases(
     )
 
 
+def pick_release_asset(assets: list[dict]) -> Optional[str]:
+    """
+    Pick the first non-Windows archive from a GitHub release's assets.
+    Uses the same filters as the release list shown to users.
+    
+    Args:
+        assets: Release assets from the GitHub API
+    
+    Returns:
+        The asset's browser_download_url, or None if no suitable asset exists
+    """
+    for asset in assets:
+        asset_name = asset.get("name", "")
+        if ARCHIVE_EXTENSION_PATTERN.search(asset_name) and not WINDOWS_ASSET_PATTERN.search(asset_name):
+            return asset.get("browser_download_url")
+    return None
+
+
+def pick_latest_release_asset(release) -> Optional[str]:
+    """Pick the download URL from a releases/latest response (see pick_release_asset)"""
+    if not isinstance(release, dict):
+        return None
+    return pick_release_asset(release.get("assets") or [])
+
+
+async def fetch_latest_asset_url(
+    plugin: MarketPlugin,
+    github_proxy: Optional[str] = None,
+    github_token: Optional[str] = None
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Find the Linux archive asset of a plugin's latest GitHub release.
+    
+    Args:
+        plugin: Market plugin
+        github_proxy: Optional GitHub proxy URL
+        github_token: Optional GitHub personal access token for authentication
+    
+    Returns:
+        Tuple of (download_url, error); download_url is None if no asset was found
+    """
+    owner, repo = parse_github_url(plugin.github_url)
+    
+    # Get latest release
+    api_url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
+    # Only the picked asset URL is cached, not the whole release payload
+    success, download_url, error = await github_api_cache.get(
+        api_url,
+        headers=GITHUB_API_HEADERS,
+        timeout=30,
+        proxy=github_proxy,
+        github_token=github_token,
+        transform=pick_latest_release_asset
+    )
+    
+    if not success:
+        return None, f"Failed to fetch latest release: {error}"
+    
+    if not download_url:
+        return None, NO_SUITABLE_ASSET_ERROR
+    return download_url, None
+
+
+async def increment_plugin_counter(db: AsyncSession, plugin: MarketPlugin, counter: str) -> None:
+    """
+    Increment a plugin usage counter in its own short transaction.
+    Failures are logged but never fail the installation.
+    
+    The increment is a single atomic UPDATE ... SET counter = counter + 1, so
+    concurrent installs cannot lose updates and no refresh is needed.
+    
+    Args:
+        db: Database session
+        plugin: Market plugin
+        counter: Counter attribute name (download_count or install_count)
+    """
+    from sqlalchemy import update as sql_update
+    from sqlalchemy.orm.attributes import set_committed_value
+    
+    column = getattr(MarketPlugin, counter)
+    try:
+        await db.execute(
+            sql_update(MarketPlugin)
+            .where(MarketPlugin.id == plugin.id)
+            .values({column: column + 1})
+        )
+        await db.commit()
+        # Mirror the increment on the loaded object without marking it dirty
+        set_committed_value(plugin, counter, getattr(plugin, counter) + 1)
+    except Exception as e:
+        logger.error(f"Failed to update {counter}: {e}")
+        await db.rollback()
+
+
+async def install_one_plugin(
+    plugin: MarketPlugin,
+    server: Server,
+    ssh_manager,
+    download_url: str,
+    exclude_dirs: list[str],
+    exclude_files: list[str],
+    db: AsyncSession
+) -> GitHubPluginInstallResponse:
+    """
+    Install a single market plugin release on a server and update its install count.
+    
+    Args:
+        plugin: Market plugin
+        server: Server to install on (ownership already verified)
+        ssh_manager: Connected SSHManager shared by the whole install flow
+        download_url: Release asset download URL
+        exclude_dirs: Directories to exclude from installation
+        exclude_files: Files to exclude from installation
+        db: Database session
+    
+    Returns:
+        Installation result
+    """
+    install_request = GitHubPluginInstallRequest(
+        download_url=download_url,
+        exclude_dirs=exclude_dirs,
+        exclude_files=exclude_files,
+        custom_install_path=plugin.custom_install_path
+    )
+    
+    result = await run_github_plugin_install(server, install_request, ssh_manager=ssh_manager)
+    
+    # Increment install count if successful (separate transaction)
+    if result.success:
+        await increment_plugin_counter(db, plugin, "install_count")
+    
+    return result
+
+
 @router.post("/plugins/{plugin_id}/install", response_model=GitHubPluginInstallResponse)
 async def install_plugin(
     plugin_id: int,
@@ -566,7 +857,7 @@ async def install_plugin(
     This endpoint:
     1. Checks SSH connectivity to server first
     2. Fetches the plugin from market
-    3. Installs dependencies first (if any and install_dependencies=True)
+    3. Installs dependencies (including transitive ones) first (if any and install_dependencies=True)
     4. Gets the specified release or latest release from GitHub
     5. Installs using the existing GitHub plugin installation logic
     
@@ -601,155 +892,231 @@ async def install_plugin(
     # Verify server ownership
     server = await get_server_for_user(server_id, db, current_user)
     
-    # CRITICAL: Check SSH connectivity BEFORE any database modifications
-    # This prevents database locks when SSH connection hangs or fails
-    from services import SSHManager
-    ssh_manager = SSHManager()
-    ssh_success, ssh_msg = await ssh_manager.connect(server)
-    await ssh_manager.disconnect()
-    
-    if not ssh_success:
-        return GitHubPluginInstallResponse(
-            success=False,
-            message=f"Cannot connect to server via SSH: {ssh_msg}. Please check server connectivity before installing plugins."
-        )
+    # Use current user's GitHub token for authentication if available
+    github_token = current_user.github_token if current_user.has_github_token else None
     
-    # Install dependencies first if requested and present
-    installed_deps = []
+    # Resolve transitive dependencies up front (read-only, one query per level)
+    dep_plugins = []
     if install_dependencies and plugin.dependencies:
-        try:
-            dep_ids = parse_dependency_ids(plugin.dependencies)
-            for dep_id in dep_ids:
-                dep_plugin = await MarketPlugin.get_by_id(db, dep_id)
-                if dep_plugin:
-                    logger.info(f"Installing dependency: {dep_plugin.title}")
-                    # Recursively install dependency (without its own dependencies to avoid infinite loops)
-                    dep_result = await install_plugin(
-                        dep_id, 
-                        server_id,
-                        download_url=None,  # Always use latest version for dependencies to avoid version conflicts
-                        exclude_dirs=exclude_dirs,
-                        exclude_files=exclude_files,
-                        install_dependencies=False,  # Don't recursively install dependencies of dependencies
-                        db=db, 
-                        current_user=current_user
-                    )
-                    if dep_result.success:
-                        installed_deps.append(dep_plugin.title)
-                    else:
-                        logger.warning(f"Failed to install dependency {dep_plugin.title}: {dep_result.message}")
-        except ValueError as e:
-            logger.error(f"Error parsing dependencies: {e}")
+        dep_plugins = [dep for dep in await resolve_install_order(db, [plugin]) if dep.id != plugin.id]
     
-    # Increment download count in a separate short transaction to avoid locks
-    try:
-        plugin.download_count += 1
-        db.add(plugin)
-        await db.commit()
-    except Exception as e:
-        # Log but don't fail the installation if download count update fails
-        logger.error(f"Failed to update download count: {e}")
-        await db.rollback()
+    async def resolve_latest():
+        return None if download_url else await fetch_latest_asset_url(plugin, server.github_proxy, github_token)
     
-    # Refresh plugin to avoid stale data
-    await db.refresh(plugin)
+    from services import SSHManager
     
-    try:
-        # If download_url is not provided, fetch latest release from GitHub
-        if not download_url:
-            # Fetch releases from GitHub (use local parse_github_url function)
-            owner, repo = parse_github_url(plugin.github_url)
-            
-            # Get latest release
-            api_url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
-            headers = {
-                "Accept": "application/vnd.github+json",
-                "User-Agent": "CS2-ServerManager"
-            }
+    async with SSHManager() as ssh_manager:
+        # CRITICAL: Check SSH connectivity BEFORE any database modifications
+        # This prevents database locks when SSH connection hangs or fails.
+        # Opening the connection is the check itself; the same connection is then
+        # reused by every install below. The latest-release lookups (plugin and
+        # dependencies, always latest to avoid version conflicts) do not touch the
+        # database, so they run concurrently with the SSH handshake.
+        ssh_result, latest_asset, *dep_assets = await asyncio.gather(
+            ssh_manager.ensure_connected(server),
+            resolve_latest(),
+            *(fetch_latest_asset_url(dep, server.github_proxy, github_token) for dep in dep_plugins),
+            return_exceptions=True
+        )
+        if isinstance(ssh_result, BaseException):
+            raise ssh_result
+        ssh_success, ssh_msg = ssh_result
+        
+        if not ssh_success:
+            return GitHubPluginInstallResponse(
+                success=False,
+                message=f"Cannot connect to server via SSH: {ssh_msg}. Please check server connectivity before installing plugins."
+            )
+        
+        # Install dependencies first; the installs run one after another on the server
+        installed_deps = []
+        for dep_plugin, dep_asset in zip(dep_plugins, dep_assets):
+            if isinstance(dep_asset, Exception):
+                logger.warning(f"Failed to install dependency {dep_plugin.title}: {dep_asset}")
+                continue
+            dep_url, dep_error = dep_asset
             
-            # Use current user's GitHub token for authentication if available
-            github_token = current_user.github_token if current_user.has_github_token else None
+            await increment_plugin_counter(db, dep_plugin, "download_count")
+            if not dep_url:
+                logger.warning(f"Failed to install dependency {dep_plugin.title}: {dep_error}")
+                continue
             
-            success, data, error = await http_helper.get(
-                api_url,
-                headers=headers,
-                timeout=30,
-                proxy=server.github_proxy,
-                github_token=github_token
+            logger.info(f"Installing dependency: {dep_plugin.title}")
+            dep_result = await install_one_plugin(
+                dep_plugin, server, ssh_manager, dep_url, exclude_dirs, exclude_files, db
             )
+            if dep_result.success:
+                installed_deps.append(dep_plugin.title)
+            else:
+                logger.warning(f"Failed to install dependency {dep_plugin.title}: {dep_result.message}")
+        
+        # Increment download count in a separate short transaction to avoid locks
+        await increment_plugin_counter(db, plugin, "download_count")
+        
+        try:
+            # If download_url is not provided, use the latest release fetched from GitHub
+            if not download_url:
+                if isinstance(latest_asset, Exception):
+                    raise latest_asset
+                download_url, error = latest_asset
+                
+                if not download_url:
+                    message = error
+                    if installed_deps:
+                        message += f" (Dependencies installed: {', '.join(installed_deps)})"
+                    return GitHubPluginInstallResponse(
+                        success=False,
+                        message=message
+                    )
             
-            if not success:
-                message = f"Failed to fetch latest release: {error}"
-                if installed_deps:
-                    message += f" (Dependencies installed: {', '.join(installed_deps)})"
-                return GitHubPluginInstallResponse(
-                    success=False,
-                    message=message
-                )
-            
-            # Find suitable asset (exclude Windows, prefer Linux archives)
-            assets = data.get("assets", [])
-            download_url = None
+            # Use existing installation logic
+            result = await install_one_plugin(
+                plugin, server, ssh_manager, download_url, exclude_dirs, exclude_files, db
+            )
             
-            for asset in assets:
-                asset_name = asset.get("name", "").lower()
-                
-                # Skip Windows assets
-                if 'windows' in asset_name or '-win-' in asset_name or '_win_' in asset_name or asset_name.endswith('-win.zip'):
-                    continue
-                
-                # Check for archive files
-                if any(asset_name.endswith(ext) for ext in [".zip", ".tar.gz", ".tgz", ".tar", ".7z"]):
-                    download_url = asset.get("browser_download_url")
-                    break
+            # Add dependency info to success message
+            if result.success and installed_deps:
+                result.message += f" (Dependencies also installed: {', '.join(installed_deps)})"
             
-            if not download_url:
-                message = "No suitable release asset found for installation"
-                if installed_deps:
-                    message += f" (Dependencies installed: {', '.join(installed_deps)})"
-                return GitHubPluginInstallResponse(
-                    success=False,
-                    message=message
-                )
+            return result
         
-        # Use existing installation logic
-        from api.routes.github_plugins import install_github_plugin
-        
-        install_request = GitHubPluginInstallRequest(
-            download_url=download_url,
-            exclude_dirs=exclude_dirs,
-            exclude_files=exclude_files,
-            custom_install_path=plugin.custom_install_path
+        except Exception as e:
+            logger.error(f"Error installing plugin: {e}", exc_info=True)
+            message = f"Installation error: {str(e)}"
+            if installed_deps:
+                message += f" (Dependencies installed: {', '.join(installed_deps)})"
+            return GitHubPluginInstallResponse(
+                success=False,
+                message=message
+            )
+
+
+@router.post("/plugins/batch-install", response_model=MarketPluginBatchInstallResponse)
+async def batch_install_plugins(
+    request: MarketPluginBatchInstallRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> MarketPluginBatchInstallResponse:
+    """
+    Install several market plugins on one server in a single request.
+    
+    Transitive dependencies of all requested plugins are resolved once and every
+    plugin is installed after its dependencies, each only once. Latest
+    releases are resolved concurrently and every install shares one SSH connection.
+    
+    Args:
+        request: Server ID, ordered plugins to install and dependency option
+    
+    Returns:
+        Per-plugin installation results in installation order
+    """
+    for item in request.items:
+        if item.download_url and (
+            not item.download_url.startswith('https://github.com/') or '/releases/download/' not in item.download_url
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid download URL for plugin {item.plugin_id}. Must be a GitHub releases download URL."
+            )
+    
+    server = await get_server_for_user(request.server_id, db, current_user)
+    
+    plugins = {plugin.id: plugin for plugin in await MarketPlugin.get_by_ids(db, [item.plugin_id for item in request.items])}
+    missing_ids = [item.plugin_id for item in request.items if item.plugin_id not in plugins]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Plugin(s) not found: {', '.join(str(plugin_id) for plugin_id in missing_ids)}"
         )
+    
+    # Installation plan in dependency order: (plugin, download_url, exclude_files, is_dependency).
+    # Requested plugins keep their own options; other dependencies always use the
+    # latest version to avoid version conflicts.
+    items = {item.plugin_id: item for item in request.items}
+    plan = []
+    for plugin in await resolve_install_order(db, [plugins[plugin_id] for plugin_id in items]):
+        item = items.get(plugin.id)
+        if item:
+            plan.append((plugin, item.download_url, item.exclude_files, False))
+        elif request.install_dependencies:
+            plan.append((plugin, None, [], True))
+    
+    # Use current user's GitHub token for authentication if available
+    github_token = current_user.github_token if current_user.has_github_token else None
+    
+    from services import SSHManager
+    
+    async with SSHManager() as ssh_manager:
+        # Check SSH connectivity before any database modifications
+        ssh_success, ssh_msg = await ssh_manager.ensure_connected(server)
+        if not ssh_success:
+            return MarketPluginBatchInstallResponse(
+                success=False,
+                message=f"Cannot connect to server via SSH: {ssh_msg}. Please check server connectivity before installing plugins."
+            )
         
-        result = await install_github_plugin(server_id, install_request, db, current_user)
+        # Resolve every missing download URL concurrently
+        latest_assets = await asyncio.gather(
+            *(fetch_latest_asset_url(plugin, server.github_proxy, github_token)
+              for plugin, download_url, _, _ in plan if not download_url),
+            return_exceptions=True
+        )
+        latest_iter = iter(latest_assets)
         
-        # Increment install count if successful (separate transaction)
-        if result.success:
+        results = []
+        for plugin, download_url, exclude_files, is_dependency in plan:
+            error = None
+            if not download_url:
+                latest = next(latest_iter)
+                if isinstance(latest, Exception):
+                    download_url, error = None, f"Installation error: {str(latest)}"
+                else:
+                    download_url, error = latest
+            
+            await increment_plugin_counter(db, plugin, "download_count")
+            
+            if not download_url:
+                results.append(MarketPluginBatchInstallResult(
+                    plugin_id=plugin.id,
+                    title=plugin.title,
+                    is_dependency=is_dependency,
+                    success=False,
+                    message=error
+                ))
+                continue
+            
+            logger.info(f"Batch installing {'dependency ' if is_dependency else ''}{plugin.title}")
             try:
-                plugin.install_count += 1
-                db.add(plugin)
-                await db.commit()
+                result = await install_one_plugin(
+                    plugin, server, ssh_manager, download_url, [], exclude_files, db
+                )
             except Exception as e:
-                # Log but don't fail if install count update fails
-                logger.error(f"Failed to update install count: {e}")
-                await db.rollback()
+                logger.error(f"Error installing plugin {plugin.title}: {e}", exc_info=True)
+                result = GitHubPluginInstallResponse(
+                    success=False,
+                    message=f"Installation error: {str(e)}"
+                )
             
-            # Add dependency info to success message
-            if installed_deps:
-                result.message += f" (Dependencies also installed: {', '.join(installed_deps)})"
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error installing plugin: {e}", exc_info=True)
-        message = f"Installation error: {str(e)}"
-        if installed_deps:
-            message += f" (Dependencies installed: {', '.join(installed_deps)})"
-        return GitHubPluginInstallResponse(
-            success=False,
-            message=message
-        )
+            results.append(MarketPluginBatchInstallResult(
+                plugin_id=plugin.id,
+                title=plugin.title,
+                is_dependency=is_dependency,
+                success=result.success,
+                message=result.message,
+                installed_files=result.installed_files
+            ))
+    
+    failed = sum(1 for result in results if not result.success)
+    if failed:
+        message = f"Installed {len(results) - failed} of {len(results)} plugins, {failed} failed"
+    else:
+        message = f"Installed {len(results)} plugins successfully"
+    
+    return MarketPluginBatchInstallResponse(
+        success=failed == 0,
+        message=message,
+        results=results
+    )
 
 
 @router.get("/categories")
@@ -762,14 +1129,9 @@ async def list_categories(
     Returns:
         List of category values and names
     """
-    categories = [
-        {"value": c.value, "name": c.value.replace("_", " ").title()}
-        for c in PluginCategory
-    ]
-    
     return {
         "success": True,
-        "categories": categories
+        "categories": CATEGORY_LIST
     }
 
 
@@ -792,21 +1154,14 @@ async def list_plugins_for_dependencies(
     Returns:
         List of plugins with id and title only
     """
-    # Get plugins with optional search
-    plugins, _ = await MarketPlugin.search_plugins(
-        db, 
+    # Load only id/title with optional search; no full rows or total count needed
+    plugin_list = await MarketPlugin.search_titles(
+        db,
         search_query=search,
-        skip=0, 
+        exclude_id=exclude_id,
         limit=100  # Reduced limit since we now support search
     )
     
-    # Filter and map to minimal format
-    plugin_list = [
-        {"id": p.id, "title": p.title}
-        for p in plugins
-        if exclude_id is None or p.id != exclude_id
-    ]
-    
     return {
         "success": True,
         "plugins": plugin_list
@@ -818,6 +1173,7 @@ async def analyze_plugin_archive(
     plugin_id: int,
     server_id: int = Query(..., description="Server ID for analysis"),
     download_url: Optional[str] = Query(None, description="Specific release download URL (if not provided, uses latest)"),
+    include_sizes: bool = Query(False, description="Report per-file sizes (zip only, slower listing)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -829,12 +1185,11 @@ async def analyze_plugin_archive(
         plugin_id: Plugin ID from market
         server_id: Server ID for SSH connection
         download_url: Optional specific release download URL (if not provided, uses latest)
+        include_sizes: Report per-file sizes (zip only, slower listing)
     
     Returns:
         Archive analysis with directory structure
     """
-    from api.routes.github_plugins import analyze_archive as analyze_github_archive
-    
     # Get plugin
     plugin = await MarketPlugin.get_by_id(db, plugin_id)
     if not plugin:
@@ -848,62 +1203,33 @@ async def analyze_plugin_archive(
     
     # If download_url is not provided, fetch latest release
     if not download_url:
+        # Use current user's GitHub token for authentication if available
+        github_token = current_user.github_token if current_user.has_github_token else None
+        
         try:
-            owner, repo = parse_github_url(plugin.github_url)
-            
-            # Get latest release
-            api_url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
-            headers = {
-                "Accept": "application/vnd.github+json",
-                "User-Agent": "CS2-ServerManager"
-            }
-            
-            # Use current user's GitHub token for authentication if available
-            github_token = current_user.github_token if current_user.has_github_token else None
-            
-            success, data, error = await http_helper.get(
-                api_url,
-                headers=headers,
-                timeout=30,
-                proxy=server.github_proxy,
-                github_token=github_token
+            download_url, error = await fetch_latest_asset_url(plugin, server.github_proxy, github_token)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
             )
-            
-            if not success:
+        
+        if not download_url:
+            if error != NO_SUITABLE_ASSET_ERROR:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to fetch latest release: {error}"
-                )
-            
-            # Find suitable asset
-            assets = data.get("assets", [])
-            for asset in assets:
-                asset_name = asset.get("name", "").lower()
-                
-                # Skip Windows assets
-                if 'windows' in asset_name or '-win-' in asset_name or '_win_' in asset_name or asset_name.endswith('-win.zip'):
-                    continue
-                
-                # Check for archive files
-                if any(asset_name.endswith(ext) for ext in [".zip", ".tar.gz", ".tgz", ".tar", ".7z"]):
-                    download_url = asset.get("browser_download_url")
-                    break
-            
-            if not download_url:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No suitable release asset found"
+                    detail=error
                 )
-        except ValueError as e:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No suitable release asset found"
             )
     
     # Use the existing analyze_archive function
     return await analyze_github_archive(
         server_id=server_id,
         download_url=download_url,
+        include_sizes=include_sizes,
         db=db,
         current_user=current_user
     )
@@ -953,8 +1279,6 @@ async def uninstall_market_plugin(
     Returns:
         Uninstallation result
     """
-    from api.routes.github_plugins import uninstall_plugin
-    
     # Get plugin (just to verify it exists)
     plugin = await MarketPlugin.get_by_id(db, plugin_id)
     if not plugin:
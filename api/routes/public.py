@@ -2,10 +2,20 @@
 Routes for a2s-cache - requires authentication to filter by user
 Separate router to avoid /servers prefix issues
 """
-from fastapi import APIRouter, Depends
-from modules.models import User
+import asyncio
+import logging
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+from modules.models import User, Server
 from modules.auth import get_current_active_user
-from modules.utils import get_current_time
+from modules.database import get_db
+from modules.utils import get_current_time, conditional_json_response
+from services.a2s_cache_service import a2s_cache_service
+
+logger = logging.getLogger(__name__)
 
 # Create a router with NO prefix
 router = APIRouter(tags=["cache"])
@@ -34,28 +44,24 @@ async def test_a2s_cache():
 
 
 @router.get("/a2s-cache")
-async def get_user_servers_a2s_cache(current_user: User = Depends(get_current_active_user)):
+async def get_user_servers_a2s_cache(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get cached A2S information for current user's servers.
     
     Requires authentication to filter servers by user UID.
     Returns only the servers belonging to the authenticated user.
+    Responses carry an ETag, so polling clients get 304 Not Modified while the data is unchanged.
     """
-    import logging
-    
-    # Import dependencies inside function
-    from modules.models import Server
-    from modules.database import async_session_maker
-    from services.a2s_cache_service import a2s_cache_service
-    from sqlmodel import select
-    
-    logger = logging.getLogger(__name__)
-    logger.info(f"=== A2S-CACHE ENDPOINT CALLED for user {current_user.id} ===")
+    start_time = time.perf_counter()
     
     # Initialize response
     response = {
         "servers": {},
-        "timestamp": get_current_time().isoformat(),
+        "timestamp": get_current_time(),
         "debug": {
             "endpoint": "a2s-cache",
             "router": "cache",
@@ -66,40 +72,47 @@ async def get_user_servers_a2s_cache(current_user: User = Depends(get_current_ac
     }
     
     try:
-        # Use a separate session
-        async with async_session_maker() as session:
-            # Get servers for current user only
-            servers = await Server.get_all_by_user(session, current_user.id)
-            
-            logger.info(f"Found {len(servers)} servers for user {current_user.id}")
-            
-            # Get cached data for each server
-            for server in servers:
-                try:
-                    cached_info = await a2s_cache_service.get_cached_info(server.id)
-                    if cached_info:
-                        response["servers"][str(server.id)] = cached_info
-                        logger.debug(f"Retrieved cache for server {server.id}")
-                except Exception as e:
-                    logger.error(f"Error getting cache for server {server.id}: {e}")
-                    response["servers"][str(server.id)] = {
-                        "success": False,
-                        "error": "Cache unavailable"
-                    }
+        # Get server IDs for current user only, on the request's session (the same one
+        # authentication used) so no extra pool connection is checked out
+        # (capped at 100 like Server.get_all_by_user)
+        result = await db.execute(
+            select(Server.id).where(Server.user_id == current_user.id).limit(100)
+        )
+        server_ids = list(result.scalars().all())
         
-        # Add Steam latest version to response
-        try:
-            steam_version = await a2s_cache_service.get_latest_steam_version()
-            if steam_version:
-                response["steam_latest_version"] = steam_version
-        except Exception as e:
-            logger.error(f"Error getting Steam version: {e}")
+        # Get cached data for all servers in one MGET, together with the Steam latest version
+        cached_map, steam_version = await asyncio.gather(
+            a2s_cache_service.get_cached_info_bulk(server_ids),
+            a2s_cache_service.get_latest_steam_version(),
+            return_exceptions=True
+        )
         
-        logger.info(f"Successfully returning data for {len(response['servers'])} servers")
+        if isinstance(cached_map, Exception):
+            logger.error(f"Error getting cache for servers {server_ids}: {cached_map}")
+            response["servers"] = {
+                str(server_id): {"success": False, "error": "Cache unavailable"}
+                for server_id in server_ids
+            }
+        else:
+            response["servers"] = {str(server_id): info for server_id, info in cached_map.items()}
+        
+        # Add Steam latest version to response
+        if isinstance(steam_version, Exception):
+            logger.error(f"Error getting Steam version: {steam_version}")
+        elif steam_version:
+            response["steam_latest_version"] = steam_version
     except Exception as e:
         logger.error(f"Error in a2s-cache endpoint: {e}", exc_info=True)
         response["error"] = str(e)
     
-    logger.info("=== A2S-CACHE ENDPOINT COMPLETE ===")
-    return response
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        f"a2s-cache: user {current_user.id}, {len(response['servers'])} servers in {duration_ms:.1f}ms",
+        extra={
+            "user_id": current_user.id,
+            "server_count": len(response["servers"]),
+            "duration_ms": round(duration_ms, 1)
+        }
+    )
+    return conditional_json_response(response, if_none_match, etag_exclude=("timestamp",))
 
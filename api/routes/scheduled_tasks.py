@@ -1,10 +1,11 @@
 """
 API routes for scheduled tasks
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, delete
-from typing import List
+from typing import List, Optional
 
 from modules import (
     get_db, get_current_user, User,
@@ -15,17 +16,55 @@ from services.scheduled_task_service import scheduled_task_service
 
 router = APIRouter(prefix="/api/scheduled-tasks", tags=["scheduled-tasks"])
 
+# Compiled once; list_scheduled_tasks serializes the task list through it directly
+SCHEDULED_TASK_LIST_ADAPTER = TypeAdapter(List[ScheduledTaskResponse])
 
-async def get_server_for_user(server_id: int, db: AsyncSession, current_user: User) -> Server:
-    """Helper to get server and verify ownership - admins can access any server"""
-    if current_user.is_admin:
-        server = await Server.get_by_id(db, server_id)
-    else:
-        server = await Server.get_by_id_and_user(db, server_id, current_user.id)
+
+async def verify_server_access(server_id: int, db: AsyncSession, current_user: User) -> None:
+    """Verify the server exists and the user owns it - admins can access any server.
+    Only the primary key is selected, so no Server instance is loaded."""
+    query = select(Server.id).where(Server.id == server_id)
+    if not current_user.is_admin:
+        query = query.where(Server.user_id == current_user.id)
     
-    if not server:
+    result = await db.execute(query)
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Server not found")
-    return server
+
+
+async def _get_owned_task(db: AsyncSession, server_id: int, task_id: int, user_id: Optional[int]) -> ScheduledTask:
+    """
+    Fetch a task and verify server ownership in a single query
+    
+    Args:
+        db: Database session
+        server_id: Server the task must belong to
+        task_id: Scheduled task ID
+        user_id: Owner the server must belong to, or None for admins (any server)
+    
+    Returns:
+        ScheduledTask: The task
+    
+    Raises:
+        HTTPException: 404 if the task does not exist or the server is not accessible
+    """
+    query = select(ScheduledTask).where(
+        ScheduledTask.id == task_id,
+        ScheduledTask.server_id == server_id
+    )
+    if user_id is not None:
+        query = query.join(Server, ScheduledTask.server_id == Server.id).where(Server.user_id == user_id)
+    
+    result = await db.execute(query)
+    task = result.scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=404, detail="Scheduled task not found")
+    return task
+
+
+def _owner_filter(current_user: User) -> Optional[int]:
+    """User ID to restrict task lookups to, or None for admins"""
+    return None if current_user.is_admin else current_user.id
 
 
 @router.post("/{server_id}", response_model=ScheduledTaskResponse)
@@ -37,7 +76,7 @@ async def create_scheduled_task(
 ):
     """Create a new scheduled task for a server"""
     # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
+    await verify_server_access(server_id, db, current_user)
     
     # Create task
     task = ScheduledTask(
@@ -62,19 +101,37 @@ async def create_scheduled_task(
     return task
 
 
-@router.get("/{server_id}", response_model=List[ScheduledTaskResponse])
+@router.get("/{server_id}", responses={200: {"model": List[ScheduledTaskResponse]}})
 async def list_scheduled_tasks(
     server_id: int,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """List all scheduled tasks for a server"""
-    # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
+    # Verify ownership and load the tasks in one query: the outer join yields a single
+    # (server_id, None) row for an accessible server without tasks and no rows at all
+    # for a missing or foreign server
+    query = (
+        select(Server.id, ScheduledTask)
+        .outerjoin(ScheduledTask, ScheduledTask.server_id == Server.id)
+        .where(Server.id == server_id)
+        .order_by(ScheduledTask.id.desc())
+    )
+    user_id = _owner_filter(current_user)
+    if user_id is not None:
+        query = query.where(Server.user_id == user_id)
     
-    # Get tasks
-    tasks = await ScheduledTask.get_all_by_server(db, server_id)
-    return tasks
+    rows = (await db.execute(query)).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Server not found")
+    
+    tasks = [task for _, task in rows if task is not None]
+    
+    # Validate and serialize the whole list in one pass through the prebuilt adapter
+    body = SCHEDULED_TASK_LIST_ADAPTER.dump_json(
+        SCHEDULED_TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{server_id}/tasks/{task_id}", response_model=ScheduledTaskResponse)
@@ -85,13 +142,8 @@ async def get_scheduled_task(
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific scheduled task"""
-    # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
-    
-    # Get task
-    task = await ScheduledTask.get_by_id_and_server(db, task_id, server_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Scheduled task not found")
+    # Get task, verifying the server belongs to the user in the same query
+    task = await _get_owned_task(db, server_id, task_id, _owner_filter(current_user))
     
     return task
 
@@ -105,13 +157,8 @@ async def update_scheduled_task(
     current_user: User = Depends(get_current_user)
 ):
     """Update a scheduled task"""
-    # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
-    
-    # Get task
-    task = await ScheduledTask.get_by_id_and_server(db, task_id, server_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Scheduled task not found")
+    # Get task, verifying the server belongs to the user in the same query
+    task = await _get_owned_task(db, server_id, task_id, _owner_filter(current_user))
     
     # Update task fields
     update_data = task_data.model_dump(exclude_unset=True)
@@ -159,16 +206,20 @@ async def delete_scheduled_task(
     current_user: User = Depends(get_current_user)
 ):
     """Delete a scheduled task"""
-    # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
-    
-    # Delete task
-    result = await db.execute(
-        delete(ScheduledTask).where(
-            ScheduledTask.id == task_id,
-            ScheduledTask.server_id == server_id
-        )
+    # Delete task; restricting server_id to the user's servers makes this a single
+    # statement whose rowcount covers both the ownership and the existence check
+    statement = delete(ScheduledTask).where(
+        ScheduledTask.id == task_id,
+        ScheduledTask.server_id == server_id
     )
+    user_id = _owner_filter(current_user)
+    if user_id is not None:
+        statement = statement.where(
+            ScheduledTask.server_id.in_(
+                select(Server.id).where(Server.id == server_id, Server.user_id == user_id)
+            )
+        )
+    result = await db.execute(statement)
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
@@ -186,23 +237,19 @@ async def toggle_scheduled_task(
     current_user: User = Depends(get_current_user)
 ):
     """Toggle a scheduled task enabled/disabled"""
-    # Verify server exists and belongs to user
-    server = await get_server_for_user(server_id, db, current_user)
-    
-    # Get task
-    task = await ScheduledTask.get_by_id_and_server(db, task_id, server_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Scheduled task not found")
+    # Get task, verifying the server belongs to the user in the same query
+    task = await _get_owned_task(db, server_id, task_id, _owner_filter(current_user))
     
-    # Toggle enabled
+    # Toggle enabled, recalculating the next run in-process when enabling so both
+    # changes go out in a single UPDATE
     task.enabled = not task.enabled
+    if task.enabled:
+        next_run = scheduled_task_service._calculate_next_run(task)
+        if next_run:
+            task.next_run = next_run
     
     await db.commit()
-    await db.refresh(task)
-    
-    # Recalculate next run if enabled
-    if task.enabled:
-        await scheduled_task_service.recalculate_next_run(task.id)
-        await db.refresh(task)
+    # updated_at is set by the database; reload only that column
+    await db.refresh(task, ["updated_at"])
     
     return task
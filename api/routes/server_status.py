@@ -5,57 +5,121 @@ Authentication is done via API key rather than JWT
 """
 from fastapi import APIRouter, Header, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, SQLModel
+from sqlmodel import select, update, insert, SQLModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Tuple, Callable, Literal
+import hashlib
+import time
 
-from modules import Server, DeploymentLog, ServerStatus, get_db
+from modules import Server, DeploymentLog, ServerStatus, get_db, conditional_json_response
 
 router = APIRouter(prefix="/api/server-status", tags=["server-status"])
 
+# Seconds a verified API key -> server ID mapping is trusted without querying the database
+SERVER_API_KEY_CACHE_TTL = 60
+
+# Maximum cached API keys; the oldest entry is evicted first
+SERVER_API_KEY_CACHE_MAX_ENTRIES = 10000
+
+# sha256(api_key) -> (server_id, expires_at). Keys are hashed so raw API keys are not kept in memory.
+_server_api_key_cache: Dict[str, Tuple[int, float]] = {}
+
+
+def _hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def invalidate_server_api_key_cache(api_key: Optional[str] = None) -> None:
+    """
+    Forget a cached server API key, e.g. when the server is deleted or its key changes
+    
+    Args:
+        api_key: The API key to evict, or None to clear the whole cache
+    """
+    if api_key is None:
+        _server_api_key_cache.clear()
+    else:
+        _server_api_key_cache.pop(_hash_api_key(api_key), None)
+
+ServerEventType = Literal["restart", "crash", "startup", "shutdown", "crash_limit_reached"]
+
 
 class ServerStatusReport(SQLModel):
     """Schema for server status reports from CS2 servers"""
-    event_type: str  # "restart", "crash", "startup", "shutdown", "crash_limit_reached"
+    event_type: ServerEventType
     message: Optional[str] = None
     exit_code: Optional[int] = None
     restart_count: Optional[int] = None
     crash_details: Optional[str] = None
 
 
+def _crash_limit_error(report: ServerStatusReport) -> str:
+    return (
+        f"Server stopped due to excessive crashes. "
+        f"Restart count: {report.restart_count}. "
+        f"{report.message or 'Automatic restart disabled.'}"
+    )
+
+
+# Event type -> (new server status, deployment log status, error message builder).
+# Without a builder the log's error message is the reported crash_details.
+EVENT_MAP: Dict[str, Tuple[ServerStatus, str, Optional[Callable[[ServerStatusReport], str]]]] = {
+    "crash": (ServerStatus.ERROR, "failed", None),
+    "restart": (ServerStatus.RUNNING, "success", None),
+    "startup": (ServerStatus.RUNNING, "success", None),
+    "shutdown": (ServerStatus.STOPPED, "success", None),
+    "crash_limit_reached": (ServerStatus.STOPPED, "failed", _crash_limit_error),
+}
+
+
 async def verify_server_api_key(
     x_api_key: str = Header(..., description="Server API key for authentication"),
     db: AsyncSession = Depends(get_db)
-) -> Server:
+) -> int:
     """
-    Verify server API key and return the server instance.
+    Verify server API key and return the ID of the server it belongs to.
+    
+    Verified keys are cached in-process for SERVER_API_KEY_CACHE_TTL seconds, so
+    frequent status reports usually authenticate without a database query.
     
     Args:
         x_api_key: API key from request header
         db: Database session
     
     Returns:
-        Server instance if API key is valid
+        Server ID if API key is valid
     
     Raises:
         HTTPException: If API key is invalid
     """
-    server = await Server.get_by_api_key(db, x_api_key)
+    key_hash = _hash_api_key(x_api_key)
+    cached = _server_api_key_cache.get(key_hash)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
     
-    if not server:
+    # Only the ID is needed here; endpoints load further columns themselves
+    result = await db.execute(select(Server.id).where(Server.api_key == x_api_key))
+    server_id = result.scalar_one_or_none()
+    
+    if server_id is None:
+        _server_api_key_cache.pop(key_hash, None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key"
         )
     
-    return server
+    if key_hash not in _server_api_key_cache and len(_server_api_key_cache) >= SERVER_API_KEY_CACHE_MAX_ENTRIES:
+        _server_api_key_cache.pop(next(iter(_server_api_key_cache)))
+    _server_api_key_cache[key_hash] = (server_id, time.monotonic() + SERVER_API_KEY_CACHE_TTL)
+    
+    return server_id
 
 
 @router.post("/{server_id}/report")
 async def report_server_status(
     server_id: int,
     report: ServerStatusReport,
-    server: Server = Depends(verify_server_api_key),
+    authenticated_server_id: int = Depends(verify_server_api_key),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -70,54 +134,45 @@ async def report_server_status(
     Args:
         server_id: ID of the reporting server
         report: Status report data
-        server: Authenticated server instance (from API key)
+        authenticated_server_id: ID of the server the API key belongs to
         db: Database session
     
     Returns:
         Success response
     """
     # Verify that the server_id matches the authenticated server
-    if server.id != server_id:
+    if authenticated_server_id != server_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Server ID mismatch - cannot report for another server"
         )
     
-    # Create deployment log entry
-    log = DeploymentLog(
-        server_id=server_id,
-        action=f"auto_{report.event_type}",
-        status="in_progress" if report.event_type in ["restart", "startup"] else "completed",
-        output=report.message or f"Server reported {report.event_type} event"
-    )
+    # event_type is validated against EVENT_MAP's keys by the request schema
+    new_status, log_status, build_error = EVENT_MAP[report.event_type]
+    error_message = build_error(report) if build_error else report.crash_details
     
-    if report.crash_details:
-        log.error_message = report.crash_details
-    
-    db.add(log)
-    
-    # Update server status based on event type
-    if report.event_type == "crash":
-        server.status = ServerStatus.ERROR
-        log.status = "failed"
-    elif report.event_type == "restart":
-        server.status = ServerStatus.RUNNING
-        log.status = "success"
-    elif report.event_type == "startup":
-        server.status = ServerStatus.RUNNING
-        log.status = "success"
-    elif report.event_type == "shutdown":
-        server.status = ServerStatus.STOPPED
-        log.status = "success"
-    elif report.event_type == "crash_limit_reached":
-        server.status = ServerStatus.STOPPED
-        log.status = "failed"
-        log.error_message = (
-            f"Server stopped due to excessive crashes. "
-            f"Restart count: {report.restart_count}. "
-            f"{report.message or 'Automatic restart disabled.'}"
+    # Update the server status and insert the log entry as plain statements in one
+    # transaction; the response only needs the new status, so nothing is loaded back
+    result = await db.execute(
+        update(Server).where(Server.id == server_id).values(status=new_status)
+    )
+    if result.rowcount == 0:
+        # Server was deleted while its API key was still cached
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key"
         )
     
+    await db.execute(
+        insert(DeploymentLog).values(
+            server_id=server_id,
+            action=f"auto_{report.event_type}",
+            status=log_status,
+            output=report.message or f"Server reported {report.event_type} event",
+            error_message=error_message
+        )
+    )
     await db.commit()
     
     return {
@@ -125,15 +180,16 @@ async def report_server_status(
         "message": "Status report received",
         "server_id": server_id,
         "event_type": report.event_type,
-        "current_status": server.status.value
+        "current_status": new_status.value
     }
 
 
 @router.get("/{server_id}/config")
 async def get_server_config(
     server_id: int,
-    server: Server = Depends(verify_server_api_key),
-    db: AsyncSession = Depends(get_db)
+    authenticated_server_id: int = Depends(verify_server_api_key),
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get server configuration for the startup script.
@@ -143,20 +199,35 @@ async def get_server_config(
     
     Args:
         server_id: ID of the server requesting config
-        server: Authenticated server instance (from API key)
+        authenticated_server_id: ID of the server the API key belongs to
         db: Database session
+        if_none_match: ETag of a previously fetched configuration
     
     Returns:
-        Server configuration data
+        Server configuration data (304 Not Modified if unchanged)
     """
     # Verify that the server_id matches the authenticated server
-    if server.id != server_id:
+    if authenticated_server_id != server_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Server ID mismatch - cannot access another server's config"
         )
     
-    return {
+    result = await db.execute(
+        select(
+            Server.id, Server.name, Server.game_port, Server.default_map,
+            Server.max_players, Server.tickrate, Server.game_mode, Server.game_type
+        ).where(Server.id == server_id)
+    )
+    server = result.one_or_none()
+    if not server:
+        # Server was deleted while its API key was still cached
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key"
+        )
+    
+    return conditional_json_response({
         "server_id": server.id,
         "name": server.name,
         "game_port": server.game_port,
@@ -165,7 +236,7 @@ async def get_server_config(
         "tickrate": server.tickrate,
         "game_mode": server.game_mode,
         "game_type": server.game_type
-    }
+    }, if_none_match)
 
 
 @router.get("/pool/stats")
@@ -1,12 +1,16 @@
 """
 Server management routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, or_, and_
 from typing import List, Dict, Any
 import asyncio
 import asyncssh
+import logging
+import orjson
 import shlex
 
 from modules import (
@@ -14,12 +18,33 @@ from modules import (
     get_db, User, UserResponse, get_current_active_user, get_current_admin_user, get_optional_current_user, generate_api_key,
     get_current_time, SystemSettings
 )
+from modules.database import async_session_maker
 from services import redis_manager
+from services.a2s_cache_service import a2s_cache_service
+from services.a2s_query import a2s_service
 from services.captcha_service import captcha_service
+from services.server_monitor import server_monitor
+from services.ssh_health_monitor import ssh_health_monitor
 from services.ssh_manager import SSHManager
+from services.ssh_connection_pool import ssh_connection_pool, SSH_KEEPALIVE_INTERVAL
+from services.system_info_helper import system_info_helper
+from api.routes.server_status import invalidate_server_api_key_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/servers", tags=["servers"])
 
+# Seconds to wait for the SSH port to accept a TCP connection before attempting the
+# full SSH handshake when adding a server
+SSH_PREFLIGHT_TIMEOUT = 3
+
+# Compiled once; read endpoints serialize servers through it directly instead of
+# going through response_model validation and jsonable_encoder on every request
+SERVER_LIST_ADAPTER = TypeAdapter(List[ServerResponse])
+
+# Server columns backing ServerResponse, for list reads that skip ORM hydration
+SERVER_RESPONSE_COLUMNS = [getattr(Server, field) for field in ServerResponse.model_fields]
+
 
 async def get_server_with_permission(
     server_id: int,
@@ -44,6 +69,45 @@ async def get_server_with_permission(
     return server
 
 
+async def get_server_access_with_permission(
+    server_id: int,
+    current_user: User,
+    db: AsyncSession
+) -> Dict[str, Any]:
+    """
+    Check server permissions without loading the full server row.
+    
+    The owner and A2S query target are cached in Redis for a short time, so polling
+    endpoints that only need these skip the database. Update and delete clear the entry
+    through redis_manager.clear_server_cache.
+    
+    Returns:
+        Dict with user_id, host, game_port, a2s_query_host and a2s_query_port
+    """
+    access = await redis_manager.get_server_access(server_id)
+    if access is None:
+        # lambda_stmt caches the constructed statement by the lambda's code location;
+        # server_id is extracted as a bound parameter on each call
+        result = await db.execute(lambda_stmt(
+            lambda: select(
+                Server.user_id, Server.host, Server.game_port,
+                Server.a2s_query_host, Server.a2s_query_port
+            ).where(Server.id == server_id)
+        ))
+        row = result.one_or_none()
+        if row is not None:
+            access = dict(row._mapping)
+            await redis_manager.set_server_access(server_id, access)
+    
+    if access is None or (not current_user.is_admin and access["user_id"] != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Server not found"
+        )
+    
+    return access
+
+
 @router.post("", response_model=ServerResponse, status_code=status.HTTP_201_CREATED)
 async def create_server(
     server_data: ServerCreate,
@@ -51,35 +115,58 @@ async def create_server(
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new CS2 server"""
-    # Validate CAPTCHA first
-    is_valid = await captcha_service.validate_captcha(server_data.captcha_token, server_data.captcha_code)
+    # Validate the CAPTCHA (Redis) and look for duplicate servers (MySQL) concurrently.
+    # Check in one query whether this user already has a server with the same name,
+    # or with the same host and game_directory. The SSH checks below stay behind the
+    # CAPTCHA so it keeps gating outbound connections to user-supplied hosts.
+    # Errors are collected rather than propagated, so the query on the request's
+    # session has always finished before either one is raised.
+    is_valid, conflicts_result = await asyncio.gather(
+        captcha_service.validate_captcha(server_data.captcha_token, server_data.captcha_code),
+        db.execute(
+            select((Server.name == server_data.name).label("name_conflict")).where(
+                Server.user_id == current_user.id,
+                or_(
+                    Server.name == server_data.name,
+                    and_(
+                        Server.host == server_data.host,
+                        Server.game_directory == server_data.game_directory
+                    )
+                )
+            ).limit(2)
+        ),
+        return_exceptions=True
+    )
+    if isinstance(is_valid, BaseException):
+        raise is_valid
+    if isinstance(conflicts_result, BaseException):
+        raise conflicts_result
     if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired CAPTCHA code"
         )
     
-    # Check if server name already exists for this user
-    existing = await Server.get_by_name_and_user(db, server_data.name, current_user.id)
-    if existing:
+    conflicts = conflicts_result.all()
+    
+    # name_conflict is evaluated by the database so its collation rules apply
+    if any(row.name_conflict for row in conflicts):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Server with name '{server_data.name}' already exists"
         )
     
-    # Check if server with same host and game_directory already exists for this user
-    duplicate_server = await Server.get_by_host_directory_and_user(
-        db, server_data.host, server_data.game_directory, current_user.id
-    )
-    if duplicate_server:
+    if conflicts:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"A server with the same host ({server_data.host}) and game directory ({server_data.game_directory}) already exists. "
                    f"If you want to add a new server on this host, please use a different game directory or manually delete the existing directory on the server first."
         )
     
-    # Validate SSH connection before creating server (password authentication only)
+    # Validate SSH connection before creating server (password authentication only).
+    # On success the connection is kept and handed to the SSH pool once the server exists.
     conn = None
+    validated = False
     try:
         if not server_data.ssh_password:
             raise HTTPException(
@@ -87,7 +174,27 @@ async def create_server(
                 detail="SSH password is required"
             )
         
-        # Step 1: Attempt SSH connection
+        # Step 1: Check that the SSH port accepts TCP connections at all, so unreachable
+        # hosts fail within seconds instead of holding the request for the full SSH timeout
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(server_data.host, server_data.ssh_port),
+                timeout=SSH_PREFLIGHT_TIMEOUT
+            )
+            writer.close()
+            await writer.wait_closed()
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Host {server_data.host}:{server_data.ssh_port} is unreachable (no response within {SSH_PREFLIGHT_TIMEOUT}s). Please check the host, port and firewall settings."
+            )
+        except OSError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Host {server_data.host}:{server_data.ssh_port} is unreachable: {str(e)}. Please check the host, port and firewall settings."
+            )
+        
+        # Step 2: Attempt SSH connection
         try:
             conn = await asyncssh.connect(
                 server_data.host,
@@ -95,7 +202,8 @@ async def create_server(
                 username=server_data.ssh_user,
                 password=server_data.ssh_password,
                 known_hosts=None,
-                connect_timeout=15
+                connect_timeout=15,
+                keepalive_interval=SSH_KEEPALIVE_INTERVAL
             )
         except asyncssh.PermissionDenied:
             raise HTTPException(
@@ -118,7 +226,7 @@ async def create_server(
                 detail=f"SSH connection to {server_data.host}:{server_data.ssh_port} failed: {str(e)}. Please verify the host and port."
             )
         
-        # Step 2: Test command execution
+        # Step 3: Test command execution
         result = await conn.run("echo 'SSH connection successful'", check=False)
         
         if result.exit_status != 0:
@@ -127,7 +235,7 @@ async def create_server(
                 detail=f"SSH connection succeeded but command execution failed. Please verify that user {server_data.ssh_user} has proper shell access and permissions."
             )
         
-        # Step 3: Create game directory with proper permissions
+        # Step 4: Create game directory with proper permissions
         # Use shlex.quote to safely escape the directory path
         game_dir_quoted = shlex.quote(server_data.game_directory)
         mkdir_cmd = f"mkdir -p {game_dir_quoted}"
@@ -147,6 +255,8 @@ async def create_server(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to set permissions on game directory {server_data.game_directory}. Please check user permissions."
             )
+        
+        validated = True
             
     except HTTPException:
         raise
@@ -156,38 +266,46 @@ async def create_server(
             detail=f"Failed to validate server connection: {str(e)}"
         )
     finally:
-        # Ensure connection is always closed
-        if conn:
+        # Close the connection unless validation succeeded and it will be pooled
+        if conn and not validated:
             conn.close()
     
-    # Create server with user_id, auto-generated API key, and password auth
-    # Exclude captcha fields from server creation
-    server_dict = server_data.model_dump(exclude={'captcha_token', 'captcha_code'})
-    server_dict['auth_type'] = AuthType.PASSWORD  # Always use password authentication
+    try:
+        # Create server with user_id, auto-generated API key, and password auth
+        # Exclude captcha fields from server creation
+        server_dict = server_data.model_dump(exclude={'captcha_token', 'captcha_code'})
+        server_dict['auth_type'] = AuthType.PASSWORD  # Always use password authentication
+        
+        # Apply system default proxy settings if not explicitly set by user
+        system_settings = await SystemSettings.get_settings(db)
+        if system_settings:
+            # If user hasn't explicitly set proxy mode, apply system defaults
+            # Check if both proxy fields are in their default state (None/False)
+            if not server_dict.get('use_panel_proxy') and not server_dict.get('github_proxy'):
+                if system_settings.default_proxy_mode == 'panel':
+                    server_dict['use_panel_proxy'] = True
+                    server_dict['github_proxy'] = None
+                elif system_settings.default_proxy_mode == 'github_url' and system_settings.github_proxy_url:
+                    server_dict['use_panel_proxy'] = False
+                    server_dict['github_proxy'] = system_settings.github_proxy_url
+                # else: default_proxy_mode is 'direct', keep both as None/False
+        
+        server = Server(**server_dict, user_id=current_user.id, api_key=generate_api_key())
+        db.add(server)
+        await db.commit()
+        await db.refresh(server)
+    except BaseException:
+        conn.close()
+        raise
     
-    # Apply system default proxy settings if not explicitly set by user
-    system_settings = await SystemSettings.get_settings(db)
-    if system_settings:
-        # If user hasn't explicitly set proxy mode, apply system defaults
-        # Check if both proxy fields are in their default state (None/False)
-        if not server_dict.get('use_panel_proxy') and not server_dict.get('github_proxy'):
-            if system_settings.default_proxy_mode == 'panel':
-                server_dict['use_panel_proxy'] = True
-                server_dict['github_proxy'] = None
-            elif system_settings.default_proxy_mode == 'github_url' and system_settings.github_proxy_url:
-                server_dict['use_panel_proxy'] = False
-                server_dict['github_proxy'] = system_settings.github_proxy_url
-            # else: default_proxy_mode is 'direct', keep both as None/False
-    
-    server = Server(**server_dict, user_id=current_user.id, api_key=generate_api_key())
-    db.add(server)
-    await db.commit()
-    await db.refresh(server)
+    # Keep the validated connection: the first operations on a new server (deploy, status)
+    # then reuse it from the pool instead of paying a second SSH handshake
+    await ssh_connection_pool.add_connection(server, conn)
     
     return server
 
 
-@router.get("", response_model=List[ServerResponse])
+@router.get("", responses={200: {"model": List[ServerResponse]}})
 async def list_servers(
     skip: int = 0,
     limit: int = 100,
@@ -195,8 +313,18 @@ async def list_servers(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all servers owned by current user"""
-    servers = await Server.get_all_by_user(db, current_user.id, skip, limit)
-    return servers
+    # Select only the columns ServerResponse serializes; credentials are never read
+    result = await db.execute(
+        select(*SERVER_RESPONSE_COLUMNS)
+        .where(Server.user_id == current_user.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = [dict(row._mapping) for row in result]
+    
+    # Validate and serialize the whole list in one pass through the prebuilt adapter
+    body = SERVER_LIST_ADAPTER.dump_json(SERVER_LIST_ADAPTER.validate_python(rows))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/admin/all", response_model=List[ServerResponseWithUser])
@@ -244,8 +372,6 @@ async def get_all_servers_disk_space(
     NOTE: This route MUST be defined before /{server_id} routes
     to avoid path parameter matching conflicts.
     """
-    from services.system_info_helper import system_info_helper
-    
     # Get all servers for current user
     servers = await Server.get_all_by_user(db, current_user.id)
     
@@ -261,7 +387,7 @@ async def get_all_servers_disk_space(
     }
 
 
-@router.get("/{server_id}", response_model=ServerResponse)
+@router.get("/{server_id}", responses={200: {"model": ServerResponse}})
 async def get_server(
     server_id: int,
     db: AsyncSession = Depends(get_db),
@@ -269,13 +395,15 @@ async def get_server(
 ):
     """Get server by ID - admins can access any server, users can only access their own"""
     server = await get_server_with_permission(server_id, current_user, db)
-    return server
+    body = ServerResponse.model_validate(server, from_attributes=True).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 
 @router.put("/{server_id}", response_model=ServerResponse)
 async def update_server(
     server_id: int,
     server_data: ServerUpdate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -294,9 +422,6 @@ async def update_server(
     await db.refresh(server)
     
     # Handle monitoring status change
-    from services.server_monitor import server_monitor
-    from services.ssh_manager import SSHManager
-    
     new_monitoring_enabled = server.enable_panel_monitoring
     
     if new_monitoring_enabled and not old_monitoring_enabled:
@@ -307,8 +432,8 @@ async def update_server(
         # Monitoring was disabled - stop monitoring
         server_monitor.stop_monitoring(server_id)
     
-    # Clear cache
-    await redis_manager.clear_server_cache(server_id)
+    # Clear cache after the response is sent; the update is already committed
+    background_tasks.add_task(redis_manager.clear_server_cache, server_id)
     
     return server
 
@@ -353,17 +478,22 @@ async def apply_system_defaults_to_server(
 @router.delete("/{server_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_server(
     server_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete server - admins can delete any server, users can only delete their own"""
     server = await get_server_with_permission(server_id, current_user, db)
+    api_key = server.api_key
     
     await db.delete(server)
     await db.commit()
     
-    # Clear cache
-    await redis_manager.clear_server_cache(server_id)
+    # Clear cache after the response is sent; the in-process API key cache is
+    # dropped right away so the deleted server's key stops authenticating
+    background_tasks.add_task(redis_manager.clear_server_cache, server_id)
+    if api_key:
+        invalidate_server_api_key_cache(api_key)
     
     return None
 
@@ -377,12 +507,8 @@ async def get_monitoring_logs(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get monitoring logs for a server from Redis"""
-    from services.redis_manager import redis_manager
-    import logging
-    logger = logging.getLogger(__name__)
-    
     # Verify server exists and user has access
-    server = await get_server_with_permission(server_id, current_user, db)
+    await get_server_access_with_permission(server_id, current_user, db)
     
     # Get logs from Redis
     try:
@@ -392,10 +518,12 @@ async def get_monitoring_logs(
             limit=limit
         )
         logger.info(f"Retrieved {len(logs)} monitoring logs from Redis for server {server_id}")
-        return logs
     except Exception as e:
         logger.error(f"Failed to get monitoring logs from Redis: {e}")
-        return []
+        logs = []
+    
+    # Log entries are plain dicts from Redis; encode them directly with orjson
+    return Response(content=orjson.dumps(logs), media_type="application/json")
 
 
 @router.get("/ping", dependencies=[])
@@ -435,9 +563,6 @@ async def get_all_servers_a2s_cache():
     IMPORTANT: This route MUST be defined before /{server_id}/a2s-info
     to avoid path parameter matching conflicts.
     """
-    import logging
-    
-    logger = logging.getLogger(__name__)
     logger.info("=== A2S-CACHE ENDPOINT CALLED ===")
     logger.info(f"Function signature has {len(get_all_servers_a2s_cache.__code__.co_varnames)} parameters")
     
@@ -453,34 +578,25 @@ async def get_all_servers_a2s_cache():
     }
     
     try:
-        # Import services only when needed to avoid circular dependencies
-        from services.a2s_cache_service import a2s_cache_service
-        from modules.database import async_session_maker
-        from modules.models import Server
-        from sqlmodel import select
-        
         logger.info("Starting database query...")
         # Use a separate session to avoid dependency injection issues
         async with async_session_maker() as session:
-            # Get all servers from database
-            result = await session.execute(select(Server))
-            servers = result.scalars().all()
-            logger.info(f"Found {len(servers)} servers in database")
-            
-            # Get cached data for each server
-            for server in servers:
-                try:
-                    cached_info = await a2s_cache_service.get_cached_info(server.id)
-                    if cached_info:
-                        response["servers"][str(server.id)] = cached_info
-                        logger.debug(f"Retrieved cache for server {server.id}")
-                except Exception as e:
-                    logger.error(f"Error getting cache for server {server.id}: {e}")
-                    # Add minimal error info
-                    response["servers"][str(server.id)] = {
-                        "success": False,
-                        "error": "Cache unavailable"
-                    }
+            # Get all server IDs from database (only the ID is needed for the cache keys)
+            result = await session.execute(select(Server.id))
+            server_ids = list(result.scalars().all())
+            logger.info(f"Found {len(server_ids)} servers in database")
+        
+        # Get cached data for all servers with a single Redis MGET
+        try:
+            cached_map = await a2s_cache_service.get_cached_info_bulk(server_ids)
+            response["servers"] = {str(server_id): info for server_id, info in cached_map.items()}
+        except Exception as e:
+            logger.error(f"Error getting cache for servers: {e}")
+            # Add minimal error info
+            response["servers"] = {
+                str(server_id): {"success": False, "error": "Cache unavailable"}
+                for server_id in server_ids
+            }
         
         logger.info(f"Successfully returning data for {len(response['servers'])} servers")
     except Exception as e:
@@ -500,30 +616,26 @@ async def get_server_a2s_info(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get A2S query information for a server"""
-    from services.a2s_query import a2s_service
-    
     # Verify server exists and user has access
-    server = await get_server_with_permission(server_id, current_user, db)
+    access = await get_server_access_with_permission(server_id, current_user, db)
     
     # Use configured A2S host/port or fall back to server host/game_port
-    query_host = server.a2s_query_host or server.host
-    query_port = server.a2s_query_port or server.game_port
-    
-    # Query server info
-    info_success, server_info = await a2s_service.query_server_info(query_host, query_port)
+    query_host = access["a2s_query_host"] or access["host"]
+    query_port = access["a2s_query_port"] or access["game_port"]
     
-    # Query players if server info was successful
-    players_success = False
-    player_list = None
-    if info_success:
-        players_success, player_list = await a2s_service.query_players(query_host, query_port)
+    # Query server info and players concurrently; both catch their own errors
+    (info_success, server_info), (players_success, player_list) = await asyncio.gather(
+        a2s_service.query_server_info(query_host, query_port),
+        a2s_service.query_players(query_host, query_port)
+    )
     
     response = {
         "query_host": query_host,
         "query_port": query_port,
         "success": info_success,
         "server_info": server_info,
-        "players": player_list if players_success else [],
+        # Players are only reported when the server info query succeeded as well
+        "players": player_list if info_success and players_success else [],
         "timestamp": get_current_time().isoformat()
     }
     
@@ -537,8 +649,6 @@ async def get_server_cpu_count(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get CPU core count from the remote server"""
-    from services.ssh_manager import SSHManager
-    
     # Verify server exists and user has access
     server = await get_server_with_permission(server_id, current_user, db)
     
@@ -603,8 +713,6 @@ async def get_server_disk_space(
     Args:
         force_refresh: If True, bypass cache and read from system
     """
-    from services.system_info_helper import system_info_helper
-    
     # Verify server exists and user has access
     server = await get_server_with_permission(server_id, current_user, db)
     
@@ -708,8 +816,6 @@ async def manual_ssh_reconnect(
         )
     
     # Use SSH health monitor to perform manual reconnection
-    from services.ssh_health_monitor import ssh_health_monitor
-    
     success, message = await ssh_health_monitor.manual_reconnect(server_id)
     
     if success:
@@ -16,6 +16,7 @@ from datetime import datetime
 
 from services.captcha_service import captcha_service
 from services.redis_manager import redis_manager
+from services.ssh_manager import SSHManager
 from modules import get_current_active_user, User, SSHServerSudo, get_db
 
 router = APIRouter(prefix="/api/setup", tags=["setup"])
@@ -384,7 +385,11 @@ async def auto_setup_server(
                     
                     # Use SFTP to upload the file
                     async with conn.start_sftp_client() as sftp:
-                        await sftp.put(local_deb_path, remote_deb_path)
+                        await sftp.put(
+                            local_deb_path, remote_deb_path,
+                            block_size=SSHManager.SFTP_BLOCK_SIZE,
+                            max_requests=SSHManager.SFTP_MAX_REQUESTS
+                        )
                     
                     await add_log(f"✓ 文件上传完成: {remote_deb_path}")
                     
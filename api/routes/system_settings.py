@@ -4,6 +4,7 @@ System settings routes (admin only)
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.email_service import email_service
+from api.routes.gmail_oauth import invalidate_gmail_status_cache
 
 from modules import (
     get_db, User, get_current_admin_user,
@@ -41,6 +42,8 @@ async def update_system_settings(
     db.add(settings)
     await db.commit()
     await db.refresh(settings)
+    if 'gmail_credentials_json' in update_data:
+        invalidate_gmail_status_cache()
     
     return settings
 
@@ -164,6 +164,10 @@ async def shutdown_event():
         for server_id in list(server_monitor.monitoring_tasks.keys()):
             server_monitor.stop_monitoring(server_id)
     
+    # Close the shared HTTP client
+    from modules.http_helper import http_helper
+    await http_helper.close()
+    
     await redis_manager.close()
     print("CS2 Server Manager shutdown complete!")
 
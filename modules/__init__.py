@@ -20,8 +20,11 @@ from .schemas import (
     GitHubPluginInstallRequest, GitHubPluginInstallResponse,
     MarketPluginCreate, MarketPluginUpdate, MarketPluginResponse, MarketPluginListResponse,
     MarketPluginInstallRequest, GitHubRepoInfo, DependencyInfo,
+    MarketPluginBatchInstallItem, MarketPluginBatchInstallRequest,
+    MarketPluginBatchInstallResult, MarketPluginBatchInstallResponse,
     PluginUninstallRequest, PluginUninstallResponse,
     InstalledPluginFile, InstalledPluginAnalysisResponse,
+    InstalledPluginBatchAnalysisRequest, InstalledPluginBatchAnalysisResponse,
     MetamodStatusResponse,
     SystemSettingsResponse, SystemSettingsUpdate,
     ForgotPasswordRequest, ResetPasswordRequest,
@@ -34,7 +37,7 @@ from .auth import (
     get_current_user, get_current_active_user, get_current_admin_user,
     get_optional_current_user, get_user_from_api_key, get_current_user_flexible
 )
-from .utils import generate_api_key, verify_api_key_format, get_current_time
+from .utils import generate_api_key, verify_api_key_format, get_current_time, conditional_json_response
 from .logging_config import setup_logging, _get_log_level
 
 __all__ = [
@@ -102,10 +105,16 @@ __all__ = [
     'MarketPluginInstallRequest',
     'GitHubRepoInfo',
     'DependencyInfo',
+    'MarketPluginBatchInstallItem',
+    'MarketPluginBatchInstallRequest',
+    'MarketPluginBatchInstallResult',
+    'MarketPluginBatchInstallResponse',
     'PluginUninstallRequest',
     'PluginUninstallResponse',
     'InstalledPluginFile',
     'InstalledPluginAnalysisResponse',
+    'InstalledPluginBatchAnalysisRequest',
+    'InstalledPluginBatchAnalysisResponse',
     'MetamodStatusResponse',
     'SystemSettingsResponse',
     'SystemSettingsUpdate',
@@ -130,6 +139,7 @@ __all__ = [
     'get_current_user_flexible',
     'generate_api_key',
     'verify_api_key_format',
+    'conditional_json_response',
     'get_current_time',
     'setup_logging',
     '_get_log_level',
@@ -19,7 +19,7 @@ class Settings(BaseSettings):
     
     # MySQL Connection Pool Configuration
     # These settings optimize database connection management for better performance
-    MYSQL_POOL_SIZE: int = 5  # Number of connections to keep open in the pool
+    MYSQL_POOL_SIZE: int = 20  # Number of connections to keep open in the pool
     MYSQL_MAX_OVERFLOW: int = 10  # Maximum overflow connections when pool is full
     MYSQL_POOL_TIMEOUT: int = 30  # Seconds to wait for a connection from the pool
     MYSQL_POOL_RECYCLE: int = 3600  # Seconds before a connection is recycled (1 hour)
@@ -725,6 +725,31 @@ async def migrate_db():
         else:
             print("✓ update_check_interval_hours column type is already FLOAT or does not exist")
         
+        # Ensure the columns used by per-request server lookups are indexed. Tables created by
+        # create_all already have these, but on older deployments the api_key index creation
+        # above may have failed silently, leaving API key authentication as a full table scan.
+        server_lookup_indexes = [
+            ('user_id', 'CREATE INDEX idx_server_user_id ON servers(user_id)'),
+            ('api_key', 'CREATE UNIQUE INDEX idx_server_api_key ON servers(api_key)'),
+        ]
+        for column, create_index_sql in server_lookup_indexes:
+            result = await conn.execute(
+                text(f"""
+                    SELECT INDEX_NAME 
+                    FROM INFORMATION_SCHEMA.STATISTICS 
+                    WHERE TABLE_SCHEMA = DATABASE() 
+                    AND TABLE_NAME = 'servers' 
+                    AND COLUMN_NAME = '{column}' 
+                    AND SEQ_IN_INDEX = 1
+                """)
+            )
+            if result.fetchone() is None:
+                print(f"Adding index on servers.{column}...")
+                await conn.execute(text(create_index_sql))
+                print(f"✓ Migration completed: servers.{column} index added")
+            else:
+                print(f"✓ servers.{column} index exists")
+        
         print("✓ Database schema migration completed")
 
 
@@ -732,9 +757,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for FastAPI routes to get async database session.
     Uses SQLModel with async SQLAlchemy session.
+    
+    The session (and its pooled connection) is closed by the context manager when the
+    request finishes, including when it is cancelled because the client disconnected.
     """
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
@@ -0,0 +1,93 @@
+"""
+GitHub API response cache
+Short-lived in-process cache for GitHub API GET requests that revalidates stale
+entries with If-None-Match, so repeated lookups of the same repository cost either
+nothing or a 304 Not Modified (which GitHub does not count against the rate limit)
+"""
+import logging
+import time
+from typing import Optional, Dict, Any, Tuple, Callable
+
+from modules.http_helper import http_helper
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is served without contacting GitHub
+GITHUB_API_CACHE_TTL = 60
+
+# Maximum cached responses; the oldest entry is evicted first
+GITHUB_API_CACHE_MAX_ENTRIES = 512
+
+
+class GitHubAPICache:
+    """ETag-aware TTL cache in front of http_helper GET requests to api.github.com"""
+
+    def __init__(self):
+        # (url, token, transform) -> (etag, expires_at, data). Authenticated responses may
+        # include private repositories, so entries are kept per token.
+        self._entries: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[Optional[str], float, Any]] = {}
+
+    def _store(self, key: Tuple[str, Optional[str], Optional[str]], etag: Optional[str], data: Any) -> None:
+        if key not in self._entries and len(self._entries) >= GITHUB_API_CACHE_MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (etag, time.monotonic() + GITHUB_API_CACHE_TTL, data)
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: int = 30,
+        proxy: Optional[str] = None,
+        github_token: Optional[str] = None,
+        transform: Optional[Callable[[Any], Any]] = None
+    ) -> Tuple[bool, Optional[Any], Optional[str]]:
+        """
+        Cached equivalent of http_helper.get for GitHub API URLs
+
+        Args:
+            url: GitHub API URL
+            headers: Optional HTTP headers
+            timeout: Request timeout in seconds
+            proxy: Optional proxy URL to use for this request
+            github_token: Optional GitHub personal access token for authentication
+            transform: Optional function applied to a fresh response before caching;
+                only its result is kept, so large payloads are reduced once instead of
+                being stored and re-scanned on every hit
+
+        Returns:
+            Tuple[bool, Optional[Any], Optional[str]]: (success, response_data, error_message)
+        """
+        key = (url, github_token, transform.__qualname__ if transform else None)
+        cached = self._entries.get(key)
+        if cached and cached[1] > time.monotonic():
+            logger.debug(f"X-Cache: HIT {url}")
+            return True, cached[2], None
+
+        success, data, error, etag = await http_helper.get_conditional(
+            url,
+            etag=cached[0] if cached else None,
+            headers=headers,
+            timeout=timeout,
+            proxy=proxy,
+            github_token=github_token
+        )
+
+        if success and data is None and cached:
+            logger.debug(f"X-Cache: HIT (304 Not Modified) {url}")
+            self._store(key, etag, cached[2])
+            return True, cached[2], None
+
+        # Only successful responses are cached; errors are retried on the next call
+        if success:
+            if transform:
+                data = transform(data)
+            self._store(key, etag, data)
+        return success, data, error
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._entries.clear()
+
+
+# Global instance
+github_api_cache = GitHubAPICache()
@@ -0,0 +1,142 @@
+"""
+GitHub API rate limiter
+Coordinates concurrent api.github.com requests and backs off based on the
+X-RateLimit-Remaining / X-RateLimit-Reset / Retry-After response headers
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of concurrent requests to api.github.com
+GITHUB_MAX_CONCURRENT_REQUESTS = 8
+
+# Start waiting for the reset once fewer requests than this remain in the window
+GITHUB_MIN_REMAINING = 2
+
+# Longest wait (seconds) acceptable inside a request; longer waits fail fast instead
+GITHUB_MAX_WAIT_SECONDS = 30
+
+
+class GitHubRateLimitExceeded(Exception):
+    """Raised when the GitHub rate limit would require waiting longer than GITHUB_MAX_WAIT_SECONDS"""
+
+    def __init__(self, wait_seconds: float):
+        self.wait_seconds = wait_seconds
+        super().__init__(f"GitHub API rate limit exceeded, retry in {int(wait_seconds) + 1}s")
+
+
+class _RateLimitState:
+    """Rate limit state reported by GitHub for a single credential"""
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0  # Unix timestamp
+        self.secondary_until: float = 0.0  # Unix timestamp
+
+
+class GitHubRateLimiter:
+    """Concurrency gate and header-driven back-off for GitHub API requests"""
+
+    def __init__(self):
+        self._semaphore = asyncio.Semaphore(GITHUB_MAX_CONCURRENT_REQUESTS)
+        # Limits are tracked per token; None is the unauthenticated (per-IP) quota
+        self._states: Dict[Optional[str], _RateLimitState] = {}
+
+    def _get_state(self, token: Optional[str]) -> _RateLimitState:
+        state = self._states.get(token)
+        if state is None:
+            state = _RateLimitState()
+            self._states[token] = state
+        return state
+
+    def get_wait_time(self, token: Optional[str] = None) -> float:
+        """Seconds to wait before the next request with this token may be sent"""
+        state = self._get_state(token)
+        now = time.time()
+        wait = max(0.0, state.secondary_until - now)
+        if state.remaining is not None and state.remaining < GITHUB_MIN_REMAINING and state.reset_at > now:
+            wait = max(wait, state.reset_at - now)
+        return wait
+
+    @asynccontextmanager
+    async def gate(self, token: Optional[str] = None):
+        """
+        Wait out any known rate limit, then hold one of the concurrent request slots
+
+        Raises:
+            GitHubRateLimitExceeded: If the required wait exceeds GITHUB_MAX_WAIT_SECONDS
+        """
+        wait = self.get_wait_time(token)
+        if wait > GITHUB_MAX_WAIT_SECONDS:
+            raise GitHubRateLimitExceeded(wait)
+        if wait > 0:
+            logger.warning(f"GitHub API rate limit reached, waiting {wait:.1f}s before next request")
+            await asyncio.sleep(wait)
+
+        async with self._semaphore:
+            yield
+
+    def update_from_headers(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        token: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Record the rate limit state reported by a GitHub API response
+
+        Args:
+            status_code: HTTP status code of the response
+            headers: Response headers
+            token: Token the request was authenticated with (None if anonymous)
+
+        Returns:
+            Optional[float]: Seconds to back off if the response was rate limited, otherwise None
+        """
+        state = self._get_state(token)
+        now = time.time()
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                state.remaining = int(remaining)
+                state.reset_at = float(reset)
+            except ValueError:
+                logger.debug(f"Ignoring malformed GitHub rate limit headers: {remaining}/{reset}")
+
+        if status_code not in (403, 429):
+            return None
+
+        # Secondary rate limits report how long to back off via Retry-After
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                backoff = float(retry_after)
+            except ValueError:
+                backoff = None
+            if backoff is not None:
+                state.secondary_until = now + backoff
+                logger.warning(f"GitHub API secondary rate limit hit, backing off {backoff:.0f}s")
+                return backoff
+
+        # Primary rate limit exhausted
+        if state.remaining == 0:
+            backoff = max(0.0, state.reset_at - now)
+            logger.warning(f"GitHub API rate limit exhausted, resets in {backoff:.0f}s")
+            return backoff
+
+        return None
+
+
+# Global instance
+github_rate_limiter = GitHubRateLimiter()
+
+
+def github_gate(token: Optional[str] = None):
+    """Shortcut for `async with github_rate_limiter.gate(token):`"""
+    return github_rate_limiter.gate(token)
@@ -3,11 +3,14 @@ HTTP Helper module for common HTTP request handling
 Provides a centralized utility for making HTTP requests with error handling
 """
 import httpx
+import orjson
 import logging
 import os
 import asyncio
 from typing import Optional, Dict, Any, Tuple
 
+from modules.github_rate_limiter import github_rate_limiter, GitHubRateLimitExceeded
+
 logger = logging.getLogger(__name__)
 
 # GitHub URL patterns for proxy detection
@@ -17,9 +20,21 @@ GITHUB_API_PREFIX = "https://api.github.com/"
 GITHUB_PREFIX = "https://github.com/"
 GITHUB_DOWNLOAD_PATTERN = "/releases/download/"  # Pattern for release downloads
 
+# GitHub API media type; responses requested with it are parsed via orjson
+GITHUB_JSON_ACCEPT = "application/vnd.github+json"
+
 # Download chunk size for streaming downloads (8KB)
 DOWNLOAD_CHUNK_SIZE = 8192
 
+# Chunk size for downloads relayed to another consumer without touching disk (256KB)
+STREAM_CHUNK_SIZE = 262144
+
+# Connection pool configuration for the shared client
+# HTTP/2 lets concurrent GitHub API calls multiplex over a single connection
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0  # Initial delay in seconds
@@ -36,8 +51,13 @@ class HTTPHelper:
         """Get or create the httpx client with connection pooling"""
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
+                http2=True,
                 timeout=httpx.Timeout(10.0),
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+                limits=httpx.Limits(
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                ),
                 follow_redirects=True  # Enable automatic redirect following
             )
         return self._client
@@ -48,7 +68,7 @@ class HTTPHelper:
             await self._client.aclose()
             self._client = None
     
-    async def make_request(
+    async def _request_with_meta(
         self,
         method: str,
         url: str,
@@ -59,9 +79,9 @@ class HTTPHelper:
         timeout: int = 10,
         proxy: Optional[str] = None,
         github_token: Optional[str] = None
-    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str], Optional[int], Optional[httpx.Headers]]:
         """
-        Make an HTTP request with error handling, retry logic, and connection pooling
+        Make an HTTP request and also return the response status code and headers
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -75,10 +95,12 @@ class HTTPHelper:
             github_token: Optional GitHub personal access token for authentication
             
         Returns:
-            Tuple[bool, Optional[Dict], Optional[str]]:
-                - success: Whether the request was successful
-                - response_data: Response JSON data if successful
+            Tuple[bool, Optional[Dict], Optional[str], Optional[int], Optional[httpx.Headers]]:
+                - success: Whether the request was successful (304 Not Modified counts as success)
+                - response_data: Response JSON data if successful (None for 304)
                 - error_message: Error message if failed
+                - status_code: HTTP status code of the last response, if any
+                - headers: Headers of the last response, if any
         """
         last_error = None
         
@@ -90,8 +112,9 @@ class HTTPHelper:
                     await asyncio.sleep(delay)
                 
                 # Add GitHub token to headers if provided and URL is a GitHub API request
+                is_github_api = url.startswith(GITHUB_API_PREFIX)
                 request_headers = headers.copy() if headers else {}
-                if github_token and github_token.strip() and url.startswith(GITHUB_API_PREFIX):
+                if github_token and github_token.strip() and is_github_api:
                     request_headers["Authorization"] = f"Bearer {github_token.strip()}"
                     logger.debug("Added GitHub token to request headers for authentication")
                 
@@ -112,37 +135,74 @@ class HTTPHelper:
                 logger.debug(f"Making {method} request to {request_url} (attempt {attempt + 1}/{MAX_RETRIES})")
                 
                 client = await self._get_client()
-                response = await client.request(
-                    method=method,
-                    url=request_url,
-                    headers=request_headers,
-                    params=params,
-                    data=data,
-                    json=json,
-                    timeout=timeout,
-                    follow_redirects=True  # Enable redirect following
-                )
+                if is_github_api:
+                    # Coordinate with other GitHub API calls and respect reported rate limits
+                    rate_limit_key = github_token.strip() if github_token and github_token.strip() else None
+                    async with github_rate_limiter.gate(rate_limit_key):
+                        response = await client.request(
+                            method=method,
+                            url=request_url,
+                            headers=request_headers,
+                            params=params,
+                            data=data,
+                            json=json,
+                            timeout=timeout,
+                            follow_redirects=True  # Enable redirect following
+                        )
+                    rate_limit_backoff = github_rate_limiter.update_from_headers(
+                        response.status_code, response.headers, rate_limit_key
+                    )
+                else:
+                    rate_limit_backoff = None
+                    response = await client.request(
+                        method=method,
+                        url=request_url,
+                        headers=request_headers,
+                        params=params,
+                        data=data,
+                        json=json,
+                        timeout=timeout,
+                        follow_redirects=True  # Enable redirect following
+                    )
+                
+                # Conditional request hit: the caller's cached copy is still valid
+                if response.status_code == 304:
+                    logger.debug("Request not modified: 304")
+                    return True, None, None, response.status_code, response.headers
                 
                 # Check if response is successful
                 if response.status_code >= 200 and response.status_code < 300:
                     try:
-                        response_data = response.json()
+                        # GitHub API payloads (e.g. /releases) can be hundreds of KB,
+                        # orjson parses them considerably faster than stdlib json
+                        if request_headers.get("Accept") == GITHUB_JSON_ACCEPT:
+                            response_data = orjson.loads(response.content)
+                        else:
+                            response_data = response.json()
                         logger.debug(f"Request successful: {response.status_code}")
-                        return True, response_data, None
+                        return True, response_data, None, response.status_code, response.headers
                     except Exception as e:
                         # If JSON parsing fails, return the text response
                         logger.warning(f"Failed to parse JSON response: {e}")
-                        return True, {"text": response.text}, None
+                        return True, {"text": response.text}, None, response.status_code, response.headers
                 else:
                     error_msg = f"HTTP {response.status_code}: {response.text}"
                     logger.error(f"Request failed: {error_msg}")
                     last_error = error_msg
+                    # Retry GitHub rate limit responses; the gate waits out the back-off
+                    if rate_limit_backoff is not None:
+                        continue
                     # Don't retry on 4xx errors (client errors)
                     if 400 <= response.status_code < 500:
-                        return False, None, error_msg
+                        return False, None, error_msg, response.status_code, response.headers
                     # Retry on 5xx errors (server errors)
                     continue
                     
+            except GitHubRateLimitExceeded as e:
+                # Waiting for the reset would take too long, fail fast
+                logger.error(str(e))
+                return False, None, str(e), None, None
+                
             except httpx.TimeoutException as e:
                 error_msg = f"Request timeout: {str(e)}"
                 logger.error(error_msg)
@@ -167,7 +227,45 @@ class HTTPHelper:
         # All retries failed
         final_error = f"Request failed after {MAX_RETRIES} attempts. Last error: {last_error}"
         logger.error(final_error)
-        return False, None, final_error
+        return False, None, final_error, None, None
+    
+    async def make_request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        timeout: int = 10,
+        proxy: Optional[str] = None,
+        github_token: Optional[str] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Make an HTTP request with error handling, retry logic, and connection pooling
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            headers: Optional HTTP headers
+            params: Optional query parameters
+            data: Optional form data
+            json: Optional JSON data
+            timeout: Request timeout in seconds (default: 10)
+            proxy: Optional proxy URL to use for this request
+            github_token: Optional GitHub personal access token for authentication
+            
+        Returns:
+            Tuple[bool, Optional[Dict], Optional[str]]:
+                - success: Whether the request was successful
+                - response_data: Response JSON data if successful
+                - error_message: Error message if failed
+        """
+        success, response_data, error_message, _, _ = await self._request_with_meta(
+            method, url, headers=headers, params=params, data=data, json=json,
+            timeout=timeout, proxy=proxy, github_token=github_token
+        )
+        return success, response_data, error_message
     
     async def get(
         self,
@@ -194,6 +292,48 @@ class HTTPHelper:
         """
         return await self.make_request("GET", url, headers=headers, params=params, timeout=timeout, proxy=proxy, github_token=github_token)
     
+    async def get_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: int = 10,
+        proxy: Optional[str] = None,
+        github_token: Optional[str] = None
+    ) -> Tuple[bool, Optional[Any], Optional[str], Optional[str]]:
+        """
+        Make a conditional GET request using an ETag from a previous response.
+        GitHub does not count 304 Not Modified responses against the rate limit.
+        
+        Args:
+            url: Request URL
+            etag: ETag of the cached response, sent as If-None-Match
+            headers: Optional HTTP headers
+            params: Optional query parameters
+            timeout: Request timeout in seconds
+            proxy: Optional proxy URL to use for this request
+            github_token: Optional GitHub personal access token for authentication
+            
+        Returns:
+            Tuple[bool, Optional[Any], Optional[str], Optional[str]]:
+                (success, response_data, error_message, etag)
+                response_data is None when the server answered 304 Not Modified
+        """
+        request_headers = headers.copy() if headers else {}
+        if etag:
+            request_headers["If-None-Match"] = etag
+        
+        success, response_data, error_message, status_code, response_headers = await self._request_with_meta(
+            "GET", url, headers=request_headers, params=params, timeout=timeout, proxy=proxy, github_token=github_token
+        )
+        
+        if status_code == 304:
+            return True, None, None, etag
+        
+        new_etag = response_headers.get("ETag") if response_headers is not None else None
+        return success, response_data, error_message, new_etag
+    
     async def post(
         self,
         url: str,
@@ -265,7 +405,7 @@ class HTTPHelper:
                         bytes_downloaded = 0
                         
                         # Ensure parent directory exists
-                        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                        await asyncio.to_thread(os.makedirs, os.path.dirname(local_path), exist_ok=True)
                         
                         # Download file in chunks
                         with open(local_path, "wb") as f:
@@ -321,6 +461,61 @@ class HTTPHelper:
         logger.error(final_error)
         return False, final_error
 
+    
+    async def stream_download(
+        self,
+        url: str,
+        chunk_callback,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: int = 300,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Stream a download to a callback without writing it to disk.
+        Not retried: chunks already handed to the callback cannot be taken back.
+        
+        Args:
+            url: Download URL
+            chunk_callback: Async callback called with (chunk, total_bytes) for each chunk;
+                            total_bytes is 0 when the server sends no Content-Length
+            headers: Optional HTTP headers
+            timeout: Request timeout in seconds (default: 300 for large files)
+            chunk_size: Size of the chunks passed to the callback
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (success, error_message)
+        """
+        try:
+            client = await self._get_client()
+            
+            async with client.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as response:
+                if not (200 <= response.status_code < 300):
+                    error_body = await response.aread()
+                    error_text = error_body.decode('utf-8', errors='ignore')[:500]  # Limit to 500 chars
+                    error_msg = f"HTTP {response.status_code}: {error_text}"
+                    logger.error(f"Streaming download failed: {error_msg}")
+                    return False, error_msg
+                
+                total_bytes = int(response.headers.get("Content-Length", 0))
+                async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                    await chunk_callback(chunk, total_bytes)
+                
+                return True, None
+                
+        except httpx.TimeoutException as e:
+            error_msg = f"Download timeout: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+            
+        except httpx.RequestError as e:
+            error_msg = f"Download error: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+            
+        except Exception as e:
+            error_msg = f"Unexpected download error: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
 
 # Global instance
 http_helper = HTTPHelper()
@@ -262,10 +262,12 @@ class Server(SQLModel, table=True):
     @classmethod
     async def get_by_id_and_user(cls, session: AsyncSession, server_id: int, user_id: int) -> Optional["Server"]:
         """Get server by ID and user ID - common pattern in this application"""
-        result = await session.execute(
-            select(cls).where(cls.id == server_id, cls.user_id == user_id)
-        )
-        return result.scalar_one_or_none()
+        # Primary key lookup through the identity map: a server already loaded in this
+        # session is returned without another query, ownership is checked in Python
+        server = await session.get(cls, server_id)
+        if server is None or server.user_id != user_id:
+            return None
+        return server
     
     @classmethod
     async def get_by_name_and_user(cls, session: AsyncSession, name: str, user_id: int) -> Optional["Server"]:
@@ -320,8 +322,7 @@ class Server(SQLModel, table=True):
         It MUST only be used in conjunction with admin permission validation.
         Use get_by_id_and_user for regular user access.
         """
-        result = await session.execute(select(cls).where(cls.id == server_id))
-        return result.scalar_one_or_none()
+        return await session.get(cls, server_id)
     
     @classmethod
     async def get_by_api_key(cls, session: AsyncSession, api_key: str) -> Optional["Server"]:
@@ -518,6 +519,27 @@ class MarketPlugin(SQLModel, table=True):
         result = await session.execute(select(cls).where(cls.id == plugin_id))
         return result.scalar_one_or_none()
     
+    @classmethod
+    async def get_by_ids(cls, session: AsyncSession, plugin_ids) -> List["MarketPlugin"]:
+        """Get plugins by IDs in one query, in the order the IDs were given (missing IDs are skipped)"""
+        plugin_ids = list(plugin_ids)
+        if not plugin_ids:
+            return []
+        result = await session.execute(select(cls).where(cls.id.in_(set(plugin_ids))))
+        plugins_by_id = {plugin.id: plugin for plugin in result.scalars().all()}
+        return [plugins_by_id[plugin_id] for plugin_id in dict.fromkeys(plugin_ids) if plugin_id in plugins_by_id]
+    
+    @classmethod
+    async def get_titles_by_ids(cls, session: AsyncSession, plugin_ids) -> dict[int, str]:
+        """Get {id: title} for the given plugin IDs in one query (missing IDs are omitted)"""
+        plugin_ids = set(plugin_ids)
+        if not plugin_ids:
+            return {}
+        result = await session.execute(
+            select(cls.id, cls.title).where(cls.id.in_(plugin_ids))
+        )
+        return {plugin_id: title for plugin_id, title in result.all()}
+    
     @classmethod
     async def get_by_github_url(cls, session: AsyncSession, github_url: str) -> Optional["MarketPlugin"]:
         """Get plugin by GitHub URL"""
@@ -573,6 +595,40 @@ class MarketPlugin(SQLModel, table=True):
         plugins = result.scalars().all()
         
         return plugins, total_count
+    
+    @classmethod
+    async def search_titles(
+        cls,
+        session: AsyncSession,
+        search_query: Optional[str] = None,
+        exclude_id: Optional[int] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """
+        Search plugins like search_plugins, but load only (id, title) and skip the count query.
+        Returns list of {"id": ..., "title": ...} in search_plugins order
+        """
+        from sqlalchemy import or_
+        
+        query = select(cls.id, cls.title)
+        
+        if exclude_id is not None:
+            query = query.where(cls.id != exclude_id)
+        
+        # Same search columns as search_plugins (title, description, author)
+        if search_query and search_query.strip():
+            search_pattern = f"%{search_query.strip()}%"
+            query = query.where(or_(
+                cls.title.like(search_pattern),
+                cls.description.like(search_pattern),
+                cls.author.like(search_pattern)
+            ))
+        
+        query = query.order_by(cls.is_recommended.desc(), cls.install_count.desc(), cls.created_at.desc())
+        query = query.limit(limit)
+        
+        result = await session.execute(query)
+        return [{"id": plugin_id, "title": title} for plugin_id, title in result.all()]
 
 
 class SSHServerSudo(SQLModel, table=True):
@@ -916,6 +916,37 @@ class MarketPluginInstallRequest(SQLModel):
     exclude_dirs: List[str] = Field(default=[], description="Directories to exclude from installation")
 
 
+class MarketPluginBatchInstallItem(SQLModel):
+    """Schema for one plugin in a batch market install"""
+    plugin_id: int = Field(..., description="Market plugin ID to install")
+    download_url: Optional[str] = Field(default=None, description="Specific release download URL (latest if omitted)")
+    exclude_files: List[str] = Field(default=[], description="Files to exclude from installation")
+
+
+class MarketPluginBatchInstallRequest(SQLModel):
+    """Schema for installing several market plugins on one server"""
+    server_id: int = Field(..., description="Server ID to install plugins on")
+    items: List[MarketPluginBatchInstallItem] = Field(..., min_length=1, max_length=50)
+    install_dependencies: bool = Field(default=True, description="Whether to install dependencies first")
+
+
+class MarketPluginBatchInstallResult(SQLModel):
+    """Schema for the result of one plugin in a batch market install"""
+    plugin_id: int
+    title: Optional[str] = None
+    is_dependency: bool = False
+    success: bool
+    message: str
+    installed_files: int = 0
+
+
+class MarketPluginBatchInstallResponse(SQLModel):
+    """Schema for batch market install response"""
+    success: bool
+    message: str
+    results: List[MarketPluginBatchInstallResult] = []
+
+
 class GitHubRepoInfo(SQLModel):
     """Schema for GitHub repository information"""
     success: bool
@@ -990,6 +1021,18 @@ class InstalledPluginAnalysisResponse(SQLModel):
     error: Optional[str] = None
 
 
+class InstalledPluginBatchAnalysisRequest(SQLModel):
+    """Schema for analyzing several installed plugin directories at once"""
+    directories: List[str] = Field(..., min_length=1, max_length=32)
+
+
+class InstalledPluginBatchAnalysisResponse(SQLModel):
+    """Schema for batch installed plugin analysis, keyed by requested directory"""
+    success: bool
+    results: Dict[str, InstalledPluginAnalysisResponse] = {}
+    error: Optional[str] = None
+
+
 # Metamod Detection schemas
 class MetamodStatusResponse(SQLModel):
     """Schema for metamod installation status"""
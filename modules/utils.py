@@ -4,8 +4,12 @@ Utility functions for the CS2 Server Manager
 import secrets
 import string
 import os
+import hashlib
+import orjson
 from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
 from zoneinfo import ZoneInfo
+from fastapi import Response
 
 
 def generate_api_key(length: int = 64) -> str:
@@ -67,3 +71,43 @@ def get_current_time() -> datetime:
     # datetime.now() without arguments uses local timezone
     # We make it timezone-aware by using astimezone()
     return datetime.now().astimezone()
+
+
+def conditional_json_response(
+    payload: Dict[str, Any],
+    if_none_match: Optional[str] = None,
+    max_age: int = 5,
+    etag_exclude: Iterable[str] = ()
+) -> Response:
+    """
+    Build a JSON response with an ETag, answering 304 Not Modified if the client already has it.
+    
+    Args:
+        payload: Response data; datetimes are serialized natively by orjson
+        if_none_match: Value of the request's If-None-Match header
+        max_age: Seconds the client may reuse the response without revalidating
+        etag_exclude: Top-level keys left out of the ETag (e.g. a generation timestamp
+            that changes on every request although the data does not)
+    
+    Returns:
+        200 response with the JSON body, or an empty 304 response
+    """
+    excluded = set(etag_exclude)
+    etag_source = {key: value for key, value in payload.items() if key not in excluded}
+    digest = hashlib.blake2b(
+        orjson.dumps(etag_source, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16
+    ).hexdigest()
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+    
+    if if_none_match:
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
+    
+    return Response(
+        content=orjson.dumps(payload, default=str),
+        media_type="application/json",
+        headers=headers
+    )
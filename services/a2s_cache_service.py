@@ -4,7 +4,7 @@ Periodically queries all servers using A2S protocol and caches results in Redis
 """
 import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from services.a2s_query import a2s_service
 from services.redis_manager import redis_manager
@@ -229,29 +229,49 @@ class A2SCacheService:
             except Exception:
                 pass
     
+    @staticmethod
+    def _parse_cached_info(server_id: int, cached) -> Optional[Dict]:
+        """Validate a cached A2S entry, returning it as a dict or None"""
+        if cached:
+            # Ensure we return a dict, not a string (in case of corrupted data)
+            if isinstance(cached, dict):
+                return cached
+            elif isinstance(cached, str):
+                # Try to parse string as JSON (corrupted data from old bug)
+                import json
+                try:
+                    parsed = json.loads(cached)
+                    if isinstance(parsed, dict):
+                        return parsed
+                except:
+                    pass
+            logger.warning(f"Invalid cached data type for server {server_id}: {type(cached)}")
+        return None
+    
     async def get_cached_info(self, server_id: int) -> Optional[Dict]:
         """Get cached A2S info for a server"""
         cache_key = f"a2s:server:{server_id}"
         try:
             cached = await redis_manager.get(cache_key)
-            if cached:
-                # Ensure we return a dict, not a string (in case of corrupted data)
-                if isinstance(cached, dict):
-                    return cached
-                elif isinstance(cached, str):
-                    # Try to parse string as JSON (corrupted data from old bug)
-                    import json
-                    try:
-                        parsed = json.loads(cached)
-                        if isinstance(parsed, dict):
-                            return parsed
-                    except:
-                        pass
-                logger.warning(f"Invalid cached data type for server {server_id}: {type(cached)}")
-            return None
+            return self._parse_cached_info(server_id, cached)
         except Exception as e:
             logger.error(f"Error getting cached A2S info for server {server_id}: {e}")
             return None
+    
+    async def get_cached_info_bulk(self, server_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Get cached A2S info for several servers with a single Redis MGET
+        
+        Returns:
+            Dict mapping server ID to its cached info (servers without cache are omitted)
+        """
+        cached_values = await redis_manager.mget([f"a2s:server:{server_id}" for server_id in server_ids])
+        results = {}
+        for server_id, cached in zip(server_ids, cached_values):
+            info = self._parse_cached_info(server_id, cached)
+            if info is not None:
+                results[server_id] = info
+        return results
 
 
 # Global instance
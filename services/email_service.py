@@ -4,6 +4,7 @@ Email service for sending emails via Gmail API or SMTP
 import smtplib
 import logging
 import json
+import orjson
 import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -127,7 +128,7 @@ class EmailService:
             
             # Load credentials from stored token
             try:
-                token_data = json.loads(settings.gmail_token_json)
+                token_data = orjson.loads(settings.gmail_token_json)
                 creds = Credentials(
                     token=token_data.get('token'),
                     refresh_token=token_data.get('refresh_token'),
@@ -3,6 +3,7 @@ Redis connection and caching utilities (Async)
 """
 import redis.asyncio as aioredis
 import json
+import orjson
 import time
 import logging
 from typing import Optional, Any
@@ -57,6 +58,34 @@ class RedisManager:
             print(f"Redis get error: {e}")
             return None
     
+    async def mget(self, keys: list) -> list:
+        """Get several values from Redis in one round-trip (None for missing keys)"""
+        if not keys:
+            return []
+        try:
+            values = await self.client.mget(keys)
+        except Exception as e:
+            print(f"Redis mget error: {e}")
+            return [None] * len(keys)
+        
+        results = []
+        for value in values:
+            if value:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass
+            results.append(value or None)
+        return results
+    
+    async def get_raw(self, key: str) -> Optional[str]:
+        """Get a value from Redis as stored, without JSON decoding"""
+        try:
+            return await self.client.get(key)
+        except Exception as e:
+            print(f"Redis get error: {e}")
+            return None
+    
     async def delete(self, key: str) -> bool:
         """Delete a key from Redis"""
         try:
@@ -65,6 +94,14 @@ class RedisManager:
             print(f"Redis delete error: {e}")
             return False
     
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer key (created as 0 if missing)"""
+        try:
+            return await self.client.incr(key)
+        except Exception as e:
+            print(f"Redis incr error: {e}")
+            return None
+    
     async def set_server_status(self, server_id: int, status: str, expire: int = 60) -> bool:
         """Cache server status"""
         key = f"server:{server_id}:status"
@@ -75,6 +112,21 @@ class RedisManager:
         key = f"server:{server_id}:status"
         return await self.get(key)
     
+    async def set_server_access(self, server_id: int, access: dict, expire: int = 30) -> bool:
+        """Cache a server's owner and A2S query target for permission checks"""
+        key = f"server:{server_id}:access"
+        return await self.set(key, access, expire)
+    
+    async def get_server_access(self, server_id: int) -> Optional[dict]:
+        """Get a server's cached owner and A2S query target"""
+        key = f"server:{server_id}:access"
+        access = await self.get(key)
+        return access if isinstance(access, dict) else None
+    
+    async def delete_server_access(self, server_id: int) -> bool:
+        """Invalidate a server's cached owner and A2S query target"""
+        return await self.delete(f"server:{server_id}:access")
+    
     async def clear_server_cache(self, server_id: int) -> bool:
         """Clear all cache for a server"""
         pattern = f"server:{server_id}:*"
@@ -340,17 +392,19 @@ class RedisManager:
                 key = f"monitoring_logs:{server_id}:{event_type}"
                 log_entries = await self.client.lrange(key, 0, limit - 1)
                 logger.debug(f"Retrieved {len(log_entries)} logs for server={server_id}, type={event_type}")
-                return [json.loads(entry) for entry in log_entries]
+                return [orjson.loads(entry) for entry in log_entries]
             else:
-                # Get all event types and merge
+                # Get all event types in one round-trip and merge
                 event_types = ['status_check', 'auto_restart', 'monitoring_start', 'monitoring_stop', 'a2s_check']
-                all_logs = []
-                
+                pipe = self.client.pipeline(transaction=False)
                 for etype in event_types:
-                    key = f"monitoring_logs:{server_id}:{etype}"
-                    log_entries = await self.client.lrange(key, 0, limit - 1)
-                    for entry in log_entries:
-                        all_logs.append(json.loads(entry))
+                    pipe.lrange(f"monitoring_logs:{server_id}:{etype}", 0, limit - 1)
+                
+                all_logs = [
+                    orjson.loads(entry)
+                    for log_entries in await pipe.execute()
+                    for entry in log_entries
+                ]
                 
                 # Sort by created_at descending
                 all_logs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
@@ -12,6 +12,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Keepalive interval (seconds) for pooled connections, so idle transports held for
+# reuse are not dropped by NAT/firewalls and dead peers are detected early
+SSH_KEEPALIVE_INTERVAL = 30
+
 
 class ConnectionKey:
     """Unique key for identifying SSH connections"""
@@ -134,6 +138,9 @@ class SSHConnectionPool:
         # Connection storage: ConnectionKey -> PooledConnection
         self.connections: Dict[ConnectionKey, PooledConnection] = {}
         self.pool_lock = asyncio.Lock()
+        # Per-key locks serialize connection creation for one host without holding
+        # pool_lock (and blocking every other host) during the SSH handshake
+        self.key_locks: Dict[ConnectionKey, asyncio.Lock] = {}
         
         # Cleanup task
         self.cleanup_task: Optional[asyncio.Task] = None
@@ -218,6 +225,38 @@ class SSHConnectionPool:
                     f"Active: {len(self.connections)}"
                 )
     
+    async def _open_connection(self, server: Server) -> Optional[asyncssh.SSHClientConnection]:
+        """
+        Open a new SSH connection for the server
+        
+        Returns:
+            Connection, or None if the server's auth type is unsupported
+        
+        Raises:
+            asyncssh.Error, asyncio.TimeoutError, OSError: If connecting fails
+        """
+        if server.is_password_auth:
+            return await asyncssh.connect(
+                host=server.host,
+                port=server.ssh_port,
+                username=server.ssh_user,
+                password=server.ssh_password,
+                known_hosts=None,
+                connect_timeout=15,
+                keepalive_interval=SSH_KEEPALIVE_INTERVAL
+            )
+        if server.is_key_auth:
+            return await asyncssh.connect(
+                host=server.host,
+                port=server.ssh_port,
+                username=server.ssh_user,
+                client_keys=[server.ssh_key_path],
+                known_hosts=None,
+                connect_timeout=15,
+                keepalive_interval=SSH_KEEPALIVE_INTERVAL
+            )
+        return None
+    
     def _create_connection_key(self, server: Server) -> ConnectionKey:
         """Create a connection key from server configuration"""
         return ConnectionKey(
@@ -297,62 +336,64 @@ class SSHConnectionPool:
             )
         
         key = self._create_connection_key(server)
-        
-        async with self.pool_lock:
-            # Check if we have an existing connection
-            if key in self.connections:
-                pooled_conn = self.connections[key]
-                
-                # Check if connection has exceeded max lifetime
-                # This is critical for avoiding long-running connection bugs
-                now = time.time()
-                connection_age = now - pooled_conn.created_at
-                
-                if connection_age > self.max_lifetime:
-                    # Connection is too old, proactively reconnect
-                    logger.info(
-                        f"[SSH Pool] Connection exceeded max lifetime ({connection_age:.1f}s > {self.max_lifetime}s), "
-                        f"reconnecting: {key}"
-                    )
-                    await pooled_conn.close()
-                    del self.connections[key]
-                    # Fall through to create new connection below
-                elif pooled_conn.is_alive():
-                    # Connection is still alive and within max lifetime
-                    # Mark as in-use (simple counter update, already holding pool lock)
-                    pooled_conn.acquire()
-                    logger.debug(f"Reusing existing connection: {key}")
-                    return True, pooled_conn.conn, "Reused existing connection"
-                else:
-                    # Connection is dead, remove it
-                    logger.debug(f"Removing dead connection: {key}")
-                    await pooled_conn.close()
-                    del self.connections[key]
+        key_lock = self.key_locks.setdefault(key, asyncio.Lock())
+        
+        async with key_lock:
+            async with self.pool_lock:
+                # Check if we have an existing connection
+                if key in self.connections:
+                    pooled_conn = self.connections[key]
+                    
+                    # Check if connection has exceeded max lifetime
+                    # This is critical for avoiding long-running connection bugs
+                    now = time.time()
+                    connection_age = now - pooled_conn.created_at
+                    
+                    if connection_age > self.max_lifetime:
+                        # Connection is too old, proactively reconnect
+                        logger.info(
+                            f"[SSH Pool] Connection exceeded max lifetime ({connection_age:.1f}s > {self.max_lifetime}s), "
+                            f"reconnecting: {key}"
+                        )
+                        await pooled_conn.close()
+                        del self.connections[key]
+                        # Fall through to create new connection below
+                    elif pooled_conn.is_alive():
+                        # Connection is still alive and within max lifetime
+                        # Mark as in-use (simple counter update, already holding pool lock)
+                        pooled_conn.acquire()
+                        logger.debug(f"Reusing existing connection: {key}")
+                        return True, pooled_conn.conn, "Reused existing connection"
+                    else:
+                        # Connection is dead, remove it
+                        logger.debug(f"Removing dead connection: {key}")
+                        await pooled_conn.close()
+                        del self.connections[key]
             
-            # Create new connection
+            # Create new connection. The handshake runs outside pool_lock so requests for
+            # other hosts are not blocked; key_lock keeps it to one handshake per host.
             try:
                 logger.debug(f"Creating new SSH connection: {key}")
                 
-                if server.is_password_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        password=server.ssh_password,
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                elif server.is_key_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        client_keys=[server.ssh_key_path],
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                else:
+                conn = await self._open_connection(server)
+                if conn is None:
                     return False, None, f"Unsupported auth type: {server.auth_type}"
+            except asyncssh.PermissionDenied:
+                return False, None, "Authentication failed"
+            except asyncio.TimeoutError:
+                return False, None, "SSH connection timeout - server may be unreachable or too slow to respond"
+            except asyncssh.Error as e:
+                return False, None, f"SSH error: {str(e)}"
+            except Exception as e:
+                return False, None, f"Connection error: {str(e)}"
+            
+            async with self.pool_lock:
+                existing = self.connections.get(key)
+                if existing and existing.is_alive():
+                    # A reconnect stored a connection meanwhile; use it and drop ours
+                    existing.acquire()
+                    conn.close()
+                    return True, existing.conn, "Reused existing connection"
                 
                 # Store in pool
                 pooled_conn = PooledConnection(conn, key)
@@ -366,15 +407,6 @@ class SSHConnectionPool:
                 )
                 
                 return True, conn, "Connected successfully"
-                
-            except asyncssh.PermissionDenied:
-                return False, None, "Authentication failed"
-            except asyncio.TimeoutError:
-                return False, None, "SSH connection timeout - server may be unreachable or too slow to respond"
-            except asyncssh.Error as e:
-                return False, None, f"SSH error: {str(e)}"
-            except Exception as e:
-                return False, None, f"Connection error: {str(e)}"
     
     async def reconnect(self, server: Server) -> Tuple[bool, Optional[asyncssh.SSHClientConnection], str]:
         """
@@ -418,25 +450,8 @@ class SSHConnectionPool:
             try:
                 logger.info(f"[SSH Pool] Creating new SSH connection after reconnect: {key}")
                 
-                if server.is_password_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        password=server.ssh_password,
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                elif server.is_key_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        client_keys=[server.ssh_key_path],
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                else:
+                conn = await self._open_connection(server)
+                if conn is None:
                     return False, None, f"Unsupported auth type: {server.auth_type}"
                 
                 # Store in pool with preserved reconnection history
@@ -497,25 +512,8 @@ class SSHConnectionPool:
             try:
                 logger.info(f"[SSH Pool] Manual reconnection: Creating new SSH connection: {key}")
                 
-                if server.is_password_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        password=server.ssh_password,
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                elif server.is_key_auth:
-                    conn = await asyncssh.connect(
-                        host=server.host,
-                        port=server.ssh_port,
-                        username=server.ssh_user,
-                        client_keys=[server.ssh_key_path],
-                        known_hosts=None,
-                        connect_timeout=15
-                    )
-                else:
+                conn = await self._open_connection(server)
+                if conn is None:
                     return False, None, f"Unsupported auth type: {server.auth_type}"
                 
                 # Store in pool with EMPTY reconnection history (reset counter)
@@ -569,6 +567,39 @@ class SSHConnectionPool:
                 logger.info(f"[SSH Pool] No connection found for {key}, nothing to reset")
                 return True, "无活动连接，无需重置 | No active connection, nothing to reset"
     
+    async def add_connection(self, server: Server, conn: asyncssh.SSHClientConnection) -> bool:
+        """
+        Hand an already authenticated connection over to the pool
+        
+        Used when a connection was opened outside the pool (e.g. to validate credentials
+        while adding a server), so the next operation on the server reuses it instead of
+        performing a second handshake. The pool takes ownership of the connection.
+        
+        Args:
+            server: Server the connection belongs to
+            conn: Open SSH connection authenticated with the server's credentials
+        
+        Returns:
+            bool: True if the connection was pooled, False if it was closed because the
+                pool already holds a live connection for the same host/user
+        """
+        key = self._create_connection_key(server)
+        
+        async with self.pool_lock:
+            existing = self.connections.get(key)
+            if conn.is_closed() or (existing and existing.is_alive()):
+                conn.close()
+                return False
+            
+            if existing:
+                await existing.close()
+            self.connections[key] = PooledConnection(conn, key)
+            logger.info(
+                f"Added SSH connection to pool: {key}. "
+                f"Total connections: {len(self.connections)}"
+            )
+            return True
+
     async def release_connection(self, server: Server):
         """
         Release a connection back to the pool
@@ -14,7 +14,7 @@ from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime
 from modules.models import Server, AuthType
 from services.server_monitor import server_monitor
-from services.ssh_connection_pool import ssh_connection_pool
+from services.ssh_connection_pool import ssh_connection_pool, SSH_KEEPALIVE_INTERVAL
 
 logger = logging.getLogger(__name__)
 
@@ -85,14 +85,41 @@ async def update_ssh_connection_status(server_id: int, success: bool):
         logger.error(f"Failed to update SSH connection status for server {server_id}: {e}")
 
 
+def remove_panel_temp_dir(download_dir: str, panel_temp_dir: str):
+    """
+    Remove a panel proxy download directory, and its parent directory if left empty.
+    Blocking filesystem calls: run via asyncio.to_thread from async code.
+    
+    Args:
+        download_dir: Unique download directory to remove
+        panel_temp_dir: Parent per-user temp directory
+    """
+    if os.path.exists(download_dir):
+        shutil.rmtree(download_dir)
+        logger.info(f"Cleaned up panel temp directory: {download_dir}")
+        
+        # Also clean up parent directory if empty
+        try:
+            if os.path.exists(panel_temp_dir) and not os.listdir(panel_temp_dir):
+                os.rmdir(panel_temp_dir)
+                logger.info(f"Cleaned up empty parent directory: {panel_temp_dir}")
+        except OSError:
+            # Directory not empty or other OS error, ignore
+            pass
+
+
 class SSHManager:
     """Async SSH manager for remote server operations with connection pooling"""
     
     # Constants for file validation
     MIN_EXPECTED_FILE_SIZE = 1000  # Minimum file size in bytes (1KB) for downloaded packages
     
-    # Upload chunk size for SFTP transfers (32KB)
-    UPLOAD_CHUNK_SIZE = 32768
+    # Upload chunk size for SFTP transfers (1MB). asyncssh splits each write into
+    # protocol-sized blocks and keeps up to SFTP_MAX_REQUESTS of them in flight, so
+    # large writes are pipelined instead of waiting for one ack per 32KB packet.
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+    SFTP_MAX_REQUESTS = 128
+    SFTP_BLOCK_SIZE = 32 * 1024  # Per-request SFTP block size, accepted by all common servers
     
     # SteamCMD retry configuration
     STEAMCMD_MAX_RETRIES = 5  # Maximum number of retry attempts (not counting the initial attempt)
@@ -258,7 +285,8 @@ class SSHManager:
                         username=server.ssh_user,
                         password=server.ssh_password,
                         known_hosts=None,
-                        connect_timeout=15
+                        connect_timeout=15,
+                        keepalive_interval=SSH_KEEPALIVE_INTERVAL
                     )
                 elif server.is_key_auth:
                     # Key file authentication
@@ -268,7 +296,8 @@ class SSHManager:
                         username=server.ssh_user,
                         client_keys=[server.ssh_key_path],
                         known_hosts=None,
-                        connect_timeout=15
+                        connect_timeout=15,
+                        keepalive_interval=SSH_KEEPALIVE_INTERVAL
                     )
                 else:
                     return False, f"Unsupported auth type: {server.auth_type}"
@@ -290,22 +319,31 @@ class SSHManager:
                 asyncio.create_task(update_ssh_connection_status(server.id, False))
                 return False, f"Connection error: {str(e)}"
     
-    async def execute_command(self, command: str, timeout: int = 30) -> Tuple[bool, str, str]:
+    async def execute_command(self, command: str, timeout: int = 30, combine_stderr: bool = False) -> Tuple[bool, str, str]:
         """
         Execute command on remote server
+        
+        Commands never request a PTY. With combine_stderr=True, stderr is merged
+        into stdout on the remote side (a single output stream to read, useful for
+        cheap probes) and the returned stderr is always empty.
+        
         Returns: (success: bool, stdout: str, stderr: str)
         """
         if not self.conn:
             return False, "", "Not connected"
         
+        stderr_target = asyncssh.STDOUT if combine_stderr else asyncssh.PIPE
+        
         async def _do_execute():
-            result = await asyncio.wait_for(
-                self.conn.run(command, check=False),
-                timeout=timeout
+            # asyncssh enforces the timeout itself and closes the channel on expiry,
+            # so timed-out commands do not leave an open session on the connection
+            result = await self.conn.run(
+                command, check=False, timeout=timeout,
+                term_type=None, stderr=stderr_target
             )
             
             stdout_text = result.stdout
-            stderr_text = result.stderr
+            stderr_text = result.stderr or ""
             exit_status = result.exit_status
             
             return exit_status == 0, stdout_text, stderr_text
@@ -453,6 +491,29 @@ class SSHManager:
         except Exception as e:
             return False, "", str(e)
     
+    async def ensure_connected(self, server: Server) -> Tuple[bool, str]:
+        """
+        Connect to server unless this manager already holds a live connection to it
+        Returns: (success: bool, message: str)
+        """
+        if (
+            self.conn is not None
+            and not self.conn.is_closed()
+            and self.current_server is not None
+            and self.current_server.id == server.id
+        ):
+            return True, "Already connected"
+        
+        if self.conn is not None:
+            await self.disconnect()
+        return await self.connect(server)
+    
+    async def __aenter__(self) -> "SSHManager":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+    
     async def disconnect(self):
         """Release or close SSH connection"""
         if self.conn:
@@ -620,12 +681,11 @@ class SSHManager:
                 try:
                     # Create temp directory on panel server
                     panel_temp_dir = os.path.join(tempfile.gettempdir(), f"cs2_panel_proxy_steamcmd_{server.user_id}")
-                    os.makedirs(panel_temp_dir, exist_ok=True)
                     
-                    # Create unique subdirectory
+                    # Create unique subdirectory (creates the parent too) off the event loop
                     download_id = str(uuid.uuid4())
                     download_dir = os.path.join(panel_temp_dir, download_id)
-                    os.makedirs(download_dir, exist_ok=True)
+                    await asyncio.to_thread(os.makedirs, download_dir, exist_ok=True)
                     
                     steamcmd_local_path = os.path.join(download_dir, "steamcmd_linux.tar.gz")
                     
@@ -654,7 +714,7 @@ class SSHManager:
                         raise Exception(f"Failed to download SteamCMD: {error}")
                     
                     # Verify file size
-                    file_size = os.path.getsize(steamcmd_local_path)
+                    file_size = await asyncio.to_thread(os.path.getsize, steamcmd_local_path)
                     if file_size < 1000:
                         raise Exception("Downloaded SteamCMD file is too small or empty")
                     
@@ -690,18 +750,7 @@ class SSHManager:
                     # Clean up panel temp directory
                     if steamcmd_local_path:
                         try:
-                            if os.path.exists(download_dir):
-                                shutil.rmtree(download_dir)
-                                logger.info(f"Cleaned up panel temp directory: {download_dir}")
-                                
-                                # Also clean up parent directory if empty
-                                try:
-                                    if os.path.exists(panel_temp_dir) and not os.listdir(panel_temp_dir):
-                                        os.rmdir(panel_temp_dir)
-                                        logger.info(f"Cleaned up empty parent directory: {panel_temp_dir}")
-                                except OSError:
-                                    # Directory not empty or other OS error, ignore
-                                    pass
+                            await asyncio.to_thread(remove_panel_temp_dir, download_dir, panel_temp_dir)
                         except Exception as e:
                             logger.warning(f"Failed to clean up panel temp directory {download_dir}: {e}")
             else:
@@ -2221,12 +2270,11 @@ class SSHManager:
                 try:
                     # Create temp directory on panel server
                     panel_temp_dir = os.path.join(tempfile.gettempdir(), f"cs2_panel_proxy_metamod_{server.user_id}")
-                    os.makedirs(panel_temp_dir, exist_ok=True)
                     
-                    # Create unique subdirectory
+                    # Create unique subdirectory (creates the parent too) off the event loop
                     download_id = str(uuid.uuid4())
                     download_dir = os.path.join(panel_temp_dir, download_id)
-                    os.makedirs(download_dir, exist_ok=True)
+                    await asyncio.to_thread(os.makedirs, download_dir, exist_ok=True)
                     
                     panel_archive_path = os.path.join(download_dir, "metamod.tar.gz")
                     
@@ -2255,7 +2303,7 @@ class SSHManager:
                         raise Exception(f"Failed to download Metamod: {error}")
                     
                     # Verify file size
-                    file_size = os.path.getsize(panel_archive_path)
+                    file_size = await asyncio.to_thread(os.path.getsize, panel_archive_path)
                     if file_size < 1000:
                         raise Exception("Downloaded file is too small or empty")
                     
@@ -2291,17 +2339,7 @@ class SSHManager:
                     # Clean up panel temp directory
                     if panel_archive_path:
                         try:
-                            if os.path.exists(download_dir):
-                                shutil.rmtree(download_dir)
-                                logger.info(f"Cleaned up panel temp directory: {download_dir}")
-                                
-                                # Also clean up parent directory if empty
-                                try:
-                                    if os.path.exists(panel_temp_dir) and not os.listdir(panel_temp_dir):
-                                        os.rmdir(panel_temp_dir)
-                                        logger.info(f"Cleaned up empty parent directory: {panel_temp_dir}")
-                                except OSError:
-                                    pass
+                            await asyncio.to_thread(remove_panel_temp_dir, download_dir, panel_temp_dir)
                         except Exception as e:
                             logger.warning(f"Failed to clean up panel temp directory {download_dir}: {e}")
             else:
@@ -2515,12 +2553,11 @@ class SSHManager:
                 try:
                     # Create temp directory on panel server
                     panel_temp_dir = os.path.join(tempfile.gettempdir(), f"cs2_panel_proxy_css_{server.user_id}")
-                    os.makedirs(panel_temp_dir, exist_ok=True)
                     
-                    # Create unique subdirectory
+                    # Create unique subdirectory (creates the parent too) off the event loop
                     download_id = str(uuid.uuid4())
                     download_dir = os.path.join(panel_temp_dir, download_id)
-                    os.makedirs(download_dir, exist_ok=True)
+                    await asyncio.to_thread(os.makedirs, download_dir, exist_ok=True)
                     
                     panel_archive_path = os.path.join(download_dir, "counterstrikesharp.zip")
                     
@@ -2549,7 +2586,7 @@ class SSHManager:
                         raise Exception(f"Failed to download CounterStrikeSharp: {error}")
                     
                     # Verify file size
-                    file_size = os.path.getsize(panel_archive_path)
+                    file_size = await asyncio.to_thread(os.path.getsize, panel_archive_path)
                     if file_size < 10000:
                         raise Exception(f"Downloaded file is too small ({file_size} bytes)")
                     
@@ -2585,17 +2622,7 @@ class SSHManager:
                     # Clean up panel temp directory
                     if panel_archive_path:
                         try:
-                            if os.path.exists(download_dir):
-                                shutil.rmtree(download_dir)
-                                logger.info(f"Cleaned up panel temp directory: {download_dir}")
-                                
-                                # Also clean up parent directory if empty
-                                try:
-                                    if os.path.exists(panel_temp_dir) and not os.listdir(panel_temp_dir):
-                                        os.rmdir(panel_temp_dir)
-                                        logger.info(f"Cleaned up empty parent directory: {panel_temp_dir}")
-                                except OSError:
-                                    pass
+                            await asyncio.to_thread(remove_panel_temp_dir, download_dir, panel_temp_dir)
                         except Exception as e:
                             logger.warning(f"Failed to clean up panel temp directory {download_dir}: {e}")
             else:
@@ -3498,7 +3525,10 @@ class SSHManager:
                         await sftp.makedirs(parent_dir)
                 
                 # Upload file
-                await sftp.put(local_path, remote_path)
+                await sftp.put(
+                    local_path, remote_path,
+                    block_size=self.SFTP_BLOCK_SIZE, max_requests=self.SFTP_MAX_REQUESTS
+                )
                 return True, ""
         except asyncssh.SFTPError as e:
             return False, f"SFTP error: {str(e)}"
@@ -3528,7 +3558,10 @@ class SSHManager:
                 os.makedirs(os.path.dirname(local_path), exist_ok=True)
                 
                 # Download file
-                await sftp.get(remote_path, local_path)
+                await sftp.get(
+                    remote_path, local_path,
+                    block_size=self.SFTP_BLOCK_SIZE, max_requests=self.SFTP_MAX_REQUESTS
+                )
                 return True, ""
         except asyncssh.SFTPError as e:
             return False, f"SFTP error: {str(e)}"
@@ -3578,7 +3611,7 @@ class SSHManager:
                 # Read file in chunks and upload
                 chunk_size = self.UPLOAD_CHUNK_SIZE
                 
-                async with await sftp.open(remote_path, 'wb') as remote_file:
+                async with await sftp.open(remote_path, 'wb', block_size=self.SFTP_BLOCK_SIZE, max_requests=self.SFTP_MAX_REQUESTS) as remote_file:
                     with open(local_path, 'rb') as local_file:
                         while True:
                             chunk = local_file.read(chunk_size)
@@ -3600,3 +3633,75 @@ class SSHManager:
             return False, f"SFTP error: {str(e)}"
         except Exception as e:
             return False, f"Error uploading file: {str(e)}"
+    
+    async def upload_from_queue(
+        self,
+        queue: asyncio.Queue,
+        remote_path: str,
+        server: Server,
+        progress_callback=None
+    ) -> Tuple[bool, str, int]:
+        """
+        Upload data produced concurrently by another task, writing chunks to the
+        remote file in the order they are taken from the queue. A None item marks
+        the end of the data. On failure the queue is still drained to the end
+        marker so the producer never blocks on a full queue.
+        
+        Args:
+            queue: Queue of bytes chunks, terminated by None
+            remote_path: Remote file path
+            server: Server instance
+            progress_callback: Optional async callback function for progress updates
+                             Called with (bytes_uploaded,)
+        
+        Returns:
+            Tuple[bool, str, int]: (success, error_message, bytes_uploaded)
+        """
+        bytes_uploaded = 0
+        end_reached = False
+        
+        async def drain():
+            if not end_reached:
+                while await queue.get() is not None:
+                    pass
+        
+        if not self.conn:
+            success, msg = await self.connect(server)
+            if not success:
+                await drain()
+                return False, f"Connection failed: {msg}", 0
+        
+        try:
+            async with self.conn.start_sftp_client() as sftp:
+                # Ensure parent directory exists
+                parent_dir = os.path.dirname(remote_path)
+                if parent_dir:
+                    try:
+                        await sftp.stat(parent_dir)
+                    except:
+                        await sftp.makedirs(parent_dir)
+                
+                async with await sftp.open(remote_path, 'wb', block_size=self.SFTP_BLOCK_SIZE, max_requests=self.SFTP_MAX_REQUESTS) as remote_file:
+                    while True:
+                        chunk = await queue.get()
+                        if chunk is None:
+                            end_reached = True
+                            break
+                        
+                        await remote_file.write(chunk)
+                        bytes_uploaded += len(chunk)
+                        
+                        # Send progress update
+                        if progress_callback:
+                            if asyncio.iscoroutinefunction(progress_callback):
+                                await progress_callback(bytes_uploaded)
+                            else:
+                                progress_callback(bytes_uploaded)
+                
+                return True, "", bytes_uploaded
+        except asyncssh.SFTPError as e:
+            await drain()
+            return False, f"SFTP error: {str(e)}", bytes_uploaded
+        except Exception as e:
+            await drain()
+            return False, f"Error uploading file: {str(e)}", bytes_uploaded